@@ -0,0 +1,60 @@
+"""
+Benchmarks convert_to_unit_vectorized and format_number_vectorized against Series.apply of the scalar functions.
+
+Usage:
+    python -m benchmarks.bench_number_formatting --size 300000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from shining_pebbles.pseudo_database.file_control_utils import convert_to_unit, format_number
+from shining_pebbles.pseudo_database.number_formatting_utils import convert_to_unit_vectorized, format_number_vectorized
+
+
+def generate_aum_series(size, seed=0):
+    rng = np.random.default_rng(seed)
+    values = np.floor(rng.random(size) * 10.0 ** rng.integers(0, 15, size))
+    values[rng.random(size) < 0.01] = np.nan
+    return pd.Series(values)
+
+
+def time_call(func, repeat=3):
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - start_time)
+    return min(durations), result
+
+
+def run_benchmark(name, func_apply, func_vectorized, repeat=3):
+    duration_apply, result_apply = time_call(func_apply, repeat)
+    duration_vectorized, result_vectorized = time_call(func_vectorized, repeat)
+    assert result_apply.fillna('NaN').tolist() == pd.Series(result_vectorized).fillna('NaN').tolist(), f'{name}: outputs differ'
+    print(f"{name}: apply {duration_apply:.4f}s, vectorized {duration_vectorized:.4f}s, speedup x{duration_apply / duration_vectorized:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=300000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    aum = generate_aum_series(args.size)
+    aum_int = aum.fillna(0).astype(np.int64)
+    for language in ['KR', 'EN']:
+        run_benchmark(
+            f'convert_to_unit[{language}]',
+            lambda: aum.apply(convert_to_unit, language=language),
+            lambda: convert_to_unit_vectorized(aum, language=language),
+            args.repeat,
+        )
+    run_benchmark('format_number[int]', lambda: aum_int.apply(format_number), lambda: format_number_vectorized(aum_int), args.repeat)
+    run_benchmark('format_number[float]', lambda: aum.apply(format_number), lambda: format_number_vectorized(aum), args.repeat)
+    ratios = aum / 7
+    run_benchmark('format_number[fractional]', lambda: ratios.apply(format_number), lambda: format_number_vectorized(ratios), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
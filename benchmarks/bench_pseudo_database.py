@@ -0,0 +1,182 @@
+"""
+Benchmarks the pseudo-database hot paths on a synthetic database: scanning, latest-file lookup, file name parsing,
+loading, time series merging, date generation and retention planning.
+
+Results can be saved as JSON, and compared against a saved baseline: benchmarks slower than the baseline
+by more than the threshold are flagged and the exit status is 1.
+
+Usage:
+    python -m benchmarks.bench_pseudo_database --files 100000 --output results.json
+    python -m benchmarks.bench_pseudo_database --files 100000 --baseline results.json --threshold 0.2
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from shining_pebbles.date_utils.date_array_utils import get_date_range_array, get_month_end_date_array, calculate_prior_date_array
+from shining_pebbles.pseudo_database.file_scan_utils import scan_files_including_regex
+from shining_pebbles.pseudo_database.file_name_utils import parse_dataset_file_name, get_latest_snapshot_file_names
+from shining_pebbles.pseudo_database.fund_panel_utils import get_latest_file_name_by_fund_code
+from shining_pebbles.pseudo_database.save_version_utils import SaveVersionIndex
+from shining_pebbles.pseudo_database.load_utils import load_csv_in_file_folder_by_regex, load_dataset_of_subject_at
+from shining_pebbles.pseudo_database.file_control_utils import update_df_time_series
+from shining_pebbles.pseudo_database.retention_utils import RetentionPolicy, plan_retention
+from shining_pebbles.pseudo_database.log_utils import quiet_mode
+from benchmarks.synthetic_database import generate_pseudo_database
+
+
+def time_call(func, repeat=5):
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start_time)
+    return {'min': min(durations), 'median': float(np.median(durations)), 'mean': float(np.mean(durations)), 'repeat': repeat}
+
+
+def get_benchmarks(database):
+    """
+    Returns the benchmarks on a synthetic database, as (name, func) pairs.
+
+    Args:
+        database (dict): The database returned by generate_pseudo_database.
+
+    Returns:
+        list: The (name, func) pairs.
+    """
+    snapshot_folder = database['snapshot_folder']
+    menu2160_folder = database['menu2160_folder']
+    snapshot_names = scan_files_including_regex(snapshot_folder, regex='^dataset-')
+    latest_holdings = get_latest_snapshot_file_names(snapshot_folder, 'holdings')
+    dates = list(latest_holdings)
+    middle_date = dates[len(dates) // 2] if dates else None
+    prefixes = [f'dataset-holdings-at{date}' for date in dates]
+    fund_files = sorted(scan_files_including_regex(menu2160_folder, regex='^menu2160-code'))
+    df_old = pd.read_csv(os.path.join(menu2160_folder, fund_files[0]), index_col=0) if fund_files else None
+    df_new = pd.read_csv(os.path.join(menu2160_folder, fund_files[min(10, len(fund_files) - 1)]), index_col=0) if fund_files else None
+    base_dates = get_date_range_array('2000-01-01', '2024-12-31')
+
+    def resolve_versions():
+        index = SaveVersionIndex(snapshot_folder)
+        for prefix in prefixes:
+            index.resolve(prefix, as_of=f'{prefix[-8:]}18')
+
+    benchmarks = [
+        ('scan.snapshots', lambda: scan_files_including_regex(snapshot_folder, regex='^dataset-holdings-at')),
+        ('scan.menu2160', lambda: scan_files_including_regex(menu2160_folder, regex='^menu2160-code')),
+        ('latest.snapshot_file_names', lambda: get_latest_snapshot_file_names(snapshot_folder, 'holdings')),
+        ('latest.file_name_by_fund_code', lambda: get_latest_file_name_by_fund_code(menu2160_folder)),
+        ('latest.save_version_index', resolve_versions),
+        ('parse.dataset_file_names', lambda: [parse_dataset_file_name(file_name) for file_name in snapshot_names]),
+        ('date.range_array', lambda: get_date_range_array('1990-01-01', '2024-12-31', form='%Y%m%d')),
+        ('date.month_end_array', lambda: get_month_end_date_array('199001', '202412', form='%Y-%m-%d')),
+        ('date.prior_date_array', lambda: calculate_prior_date_array(base_dates, months=3)),
+        ('retention.plan', lambda: plan_retention(snapshot_folder, RetentionPolicy(keep_saves=1, gfs=(7, 4, 12)), reference_date=dates[-1] if dates else None)),
+    ]
+    if middle_date:
+        benchmarks += [
+            ('load.latest_by_regex', lambda: load_csv_in_file_folder_by_regex(snapshot_folder, '^dataset-holdings-at')),
+            ('load.subject_at_as_of', lambda: load_dataset_of_subject_at(snapshot_folder, 'holdings', middle_date, as_of=f'{middle_date}18')),
+        ]
+    if df_old is not None:
+        benchmarks.append(('merge.update_df_time_series', lambda: update_df_time_series(df_old.copy(), df_new.copy())))
+    return benchmarks
+
+
+def run_benchmarks(database, repeat=5, only=None):
+    """
+    Runs the benchmarks in quiet mode.
+
+    Args:
+        database (dict): The database returned by generate_pseudo_database.
+        repeat (int): The number of timed runs of each benchmark.
+        only (str, optional): Only benchmarks whose name contains this string are run.
+
+    Returns:
+        dict: The timings keyed by benchmark name.
+    """
+    results = {}
+    with quiet_mode():
+        for name, func in get_benchmarks(database):
+            if only and only not in name:
+                continue
+            func()
+            results[name] = time_call(func, repeat)
+            print(f"{name}: min {results[name]['min']:.4f}s, median {results[name]['median']:.4f}s")
+    return results
+
+
+def compare_results(baseline, current, threshold=0.2):
+    """
+    Compares benchmark medians against a baseline.
+
+    Args:
+        baseline (dict): The baseline results, as saved with --output.
+        current (dict): The current results.
+        threshold (float): The tolerated relative slowdown, e.g. 0.2 for 20%.
+
+    Returns:
+        list: The names of the benchmarks slower than the baseline by more than the threshold.
+    """
+    slowdowns = []
+    for name, timing in current['benchmarks'].items():
+        base_timing = baseline['benchmarks'].get(name)
+        if base_timing is None:
+            print(f"{name}: no baseline")
+            continue
+        ratio = timing['median'] / base_timing['median'] if base_timing['median'] else float('inf')
+        flag = ratio > 1 + threshold
+        if flag:
+            slowdowns.append(name)
+        print(f"{name}: {base_timing['median']:.4f}s -> {timing['median']:.4f}s (x{ratio:.2f}){' SLOWER' if flag else ''}")
+    return slowdowns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', default='/tmp/shining-pebbles-bench')
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', default=None)
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--baseline', default=None)
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    database = generate_pseudo_database(args.root, args.files, seed=args.seed)
+    print(f"database: {database['snapshot_files']} snapshots, {database['menu2160_files']} menu2160 files ({time.perf_counter() - start_time:.1f}s)")
+    results = {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'files': args.files,
+            'seed': args.seed,
+        },
+        'benchmarks': run_benchmarks(database, args.repeat, args.only),
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline['metadata'].get('files') != args.files:
+            print(f"warning: the baseline has {baseline['metadata'].get('files')} files, this run has {args.files}")
+        slowdowns = compare_results(baseline, results, args.threshold)
+        if slowdowns:
+            print(f"{len(slowdowns)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}: {', '.join(slowdowns)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
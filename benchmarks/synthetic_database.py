@@ -0,0 +1,188 @@
+"""
+Generates a synthetic pseudo-database following the real naming conventions, for benchmarks.
+
+The database has two folders:
+    dataset-snapshots/  'dataset-{subject}-at{YYYYMMDD}-save{YYYYMMDDHH}.csv' snapshots of holdings-like tables,
+                        with one or more saves per business day
+    dataset-2160/       'menu2160-code{fund_code}-to{YYYYMMDD}-save{YYYYMMDD}.csv' price and asset time series,
+                        each file covering the last `rows` business days up to its 'to' date
+
+Usage:
+    python -m benchmarks.synthetic_database --root /tmp/pseudo-db --files 100000
+"""
+import os
+import csv
+import io
+import json
+import argparse
+import numpy as np
+
+SNAPSHOT_FOLDER_NAME = 'dataset-snapshots'
+
+MENU2160_FOLDER_NAME = 'dataset-2160'
+
+SNAPSHOT_SUBJECTS = ('holdings', 'fund_info', 'trades', 'nav')
+
+MENU2160_HEADER = ['일자', '수정\n기준가', '순자산총액']
+
+MARKER_FILE_NAME = '.synthetic.json'
+
+
+def get_business_dates(start_date, count):
+    dates = np.arange(np.datetime64(start_date, 'D'), np.datetime64(start_date, 'D') + count * 2)
+    return np.busday_offset(dates[np.is_busday(dates)][:count], 0)
+
+
+def _format_dates(dates, form):
+    text = np.datetime_as_string(dates, unit='D')
+    return np.char.replace(text, '-', '') if form == 'compact' else text
+
+
+def _render_snapshot(rng, rows):
+    codes = rng.integers(100000, 999999, rows)
+    weights = rng.dirichlet(np.ones(rows))
+    prices = rng.lognormal(10, 1, rows).round(0)
+    lines = [',code,name,weight,price']
+    lines.extend(f'{i},{code},ASSET{code},{weight:.6f},{price:.0f}' for i, (code, weight, price) in enumerate(zip(codes, weights, prices)))
+    return '\n'.join(lines) + '\n'
+
+
+def _render_menu2160(dates, prices, assets):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(MENU2160_HEADER)
+    writer.writerows(zip(dates, (f'{price:,.2f}' for price in prices), (f'{asset:,.0f}' for asset in assets)))
+    return buffer.getvalue()
+
+
+def _write(file_path, text):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.write(text)
+
+
+def generate_snapshots(file_folder, n_files, rows=20, saves_per_date=2, seed=0):
+    """
+    Writes about n_files 'dataset-{subject}-at{YYYYMMDD}-save{YYYYMMDDHH}.csv' snapshots into a folder.
+
+    Args:
+        file_folder (str): The folder.
+        n_files (int): The number of files.
+        rows (int): The rows of each snapshot.
+        saves_per_date (int): The saves of each (subject, date).
+        seed (int): The random seed.
+
+    Returns:
+        int: The number of written files.
+    """
+    os.makedirs(file_folder, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    n_dates = max(1, -(-n_files // (len(SNAPSHOT_SUBJECTS) * saves_per_date)))
+    dates = _format_dates(get_business_dates('2015-01-01', n_dates), 'compact')
+    templates = [_render_snapshot(rng, rows) for _ in range(16)]
+    written = 0
+    for date in dates:
+        for subject in SNAPSHOT_SUBJECTS:
+            for save in range(saves_per_date):
+                if written == n_files:
+                    return written
+                _write(os.path.join(file_folder, f'dataset-{subject}-at{date}-save{date}{18 + save:02d}.csv'), templates[written % len(templates)])
+                written += 1
+    return written
+
+
+def generate_menu2160(file_folder, n_files, rows=250, files_per_fund=20, seed=0):
+    """
+    Writes about n_files 'menu2160-code{fund_code}-to{YYYYMMDD}-save{YYYYMMDD}.csv' time series into a folder.
+
+    Each fund gets files_per_fund files with consecutive 'to' dates, each holding the last `rows` business days
+    of one random-walk price and asset series, so consecutive files overlap like real downloads.
+
+    Args:
+        file_folder (str): The folder.
+        n_files (int): The number of files.
+        rows (int): The rows of each file.
+        files_per_fund (int): The files of each fund.
+        seed (int): The random seed.
+
+    Returns:
+        int: The number of written files.
+    """
+    os.makedirs(file_folder, exist_ok=True)
+    rng = np.random.default_rng(seed + 1)
+    n_funds = max(1, -(-n_files // files_per_fund))
+    dates = get_business_dates('2020-01-01', rows + files_per_fund)
+    date_texts = _format_dates(dates, 'iso')
+    compact_texts = _format_dates(dates, 'compact')
+    written = 0
+    for fund in range(n_funds):
+        fund_code = f'{100001 + fund:06d}'
+        prices = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+        assets = 1e10 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+        for i in range(files_per_fund):
+            if written == n_files:
+                return written
+            end = rows + i
+            file_name = f'menu2160-code{fund_code}-to{compact_texts[end - 1]}-save{compact_texts[end - 1]}.csv'
+            _write(os.path.join(file_folder, file_name), _render_menu2160(date_texts[end - rows:end], prices[end - rows:end], assets[end - rows:end]))
+            written += 1
+    return written
+
+
+def generate_pseudo_database(root, n_files, snapshot_share=0.5, snapshot_rows=20, menu2160_rows=250, seed=0, force=False):
+    """
+    Generates (or reuses) a synthetic pseudo-database under root.
+
+    The parameters are recorded in a marker file, so an existing database with the same parameters is reused.
+
+    Args:
+        root (str): The root folder.
+        n_files (int): The total number of files, e.g. 1_000 to 500_000.
+        snapshot_share (float): The share of snapshot files; the rest are menu2160 files.
+        snapshot_rows (int): The rows of each snapshot.
+        menu2160_rows (int): The rows of each menu2160 file.
+        seed (int): The random seed.
+        force (bool): Whether to regenerate even if a matching database exists.
+
+    Returns:
+        dict: The folders and the numbers of files.
+    """
+    params = {'n_files': n_files, 'snapshot_share': snapshot_share, 'snapshot_rows': snapshot_rows, 'menu2160_rows': menu2160_rows, 'seed': seed}
+    marker_path = os.path.join(root, MARKER_FILE_NAME)
+    snapshot_folder = os.path.join(root, SNAPSHOT_FOLDER_NAME)
+    menu2160_folder = os.path.join(root, MENU2160_FOLDER_NAME)
+    if not force and os.path.exists(marker_path):
+        with open(marker_path, 'r', encoding='utf-8') as file:
+            marker = json.load(file)
+        if marker['params'] == params:
+            return marker['database']
+    for file_folder in (snapshot_folder, menu2160_folder):
+        if os.path.isdir(file_folder):
+            with os.scandir(file_folder) as files:
+                for file in files:
+                    if file.is_file():
+                        os.remove(file.path)
+    n_snapshots = int(n_files * snapshot_share)
+    database = {
+        'snapshot_folder': snapshot_folder,
+        'menu2160_folder': menu2160_folder,
+        'snapshot_files': generate_snapshots(snapshot_folder, n_snapshots, rows=snapshot_rows, seed=seed),
+        'menu2160_files': generate_menu2160(menu2160_folder, n_files - n_snapshots, rows=menu2160_rows, seed=seed),
+    }
+    with open(marker_path, 'w', encoding='utf-8') as file:
+        json.dump({'params': params, 'database': database}, file, indent=2)
+    return database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', default='/tmp/shining-pebbles-bench')
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--force', action='store_true')
+    args = parser.parse_args()
+    database = generate_pseudo_database(args.root, args.files, seed=args.seed, force=args.force)
+    print(json.dumps(database, indent=2))
+
+
+if __name__ == '__main__':
+    main()
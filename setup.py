@@ -4,6 +4,7 @@ setup(
     name='shining_pebbles',
     version='0.5.3',
     packages=find_packages(),
+    package_data={'shining_pebbles': ['date_utils/holidays/*.csv']},
      install_requires=[
         'numpy>=1.21.0',  # NumPy 1.x와 2.x 모두 지원
         'pandas',
@@ -12,6 +13,10 @@ setup(
         'aws-s3-controller>=0.7.3',
         'openpyxl>=3.1.5',
     ],
+    extras_require={
+        's3': ['boto3'],
+        'test': ['pytest', 'boto3', 'moto[s3]>=5'],
+    },
 
     author='June Young Park',
     author_email='juneyoungpaak@gmail.com',
@@ -27,5 +32,5 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.8',
 )
@@ -1,3 +1,7 @@
 from .date_general_utils import *
 from .date_converter_utils import *
-from .date_extracting_utils import *
\ No newline at end of file
+from .date_extracting_utils import *
+from .date_array_utils import *
+from .date_parsing_utils import *
+from .business_calendar_utils import *
+from .calendar_table_utils import *
\ No newline at end of file
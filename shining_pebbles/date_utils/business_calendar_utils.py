@@ -0,0 +1,318 @@
+import os
+import re
+import warnings
+from functools import lru_cache
+import numpy as np
+from .date_array_utils import to_datetime64_array, format_date_array
+from .date_parsing_utils import detect_date_format
+
+HOLIDAY_FILE_ENV = 'SHINING_PEBBLES_HOLIDAY_FILE'
+
+DEFAULT_HOLIDAY_FILE = os.path.join(os.path.dirname(__file__), 'holidays', 'holidays-krx.csv')
+
+
+def load_holidays(file_path=None):
+    """
+    Loads holiday dates from a local file with one 'YYYY-MM-DD' or 'YYYYMMDD' date at the start of each line.
+
+    Lines starting with '#' and lines not starting with a digit (e.g. a header) are ignored.
+
+    Args:
+        file_path (str, optional): The holiday file. Defaults to the file in SHINING_PEBBLES_HOLIDAY_FILE,
+                                   or the bundled KRX holiday file.
+
+    Returns:
+        np.ndarray: The sorted, unique holiday dates as datetime64[D].
+    """
+    file_path = file_path or os.environ.get(HOLIDAY_FILE_ENV) or DEFAULT_HOLIDAY_FILE
+    with open(file_path, 'r', encoding='utf-8') as file:
+        dates = [line.split(',')[0].strip() for line in file if line[:1].isdigit()]
+    return np.unique(to_datetime64_array(np.array(dates, dtype=str)))
+
+
+def load_holiday_coverage(file_path=None):
+    """
+    Loads the date range a holiday file is complete for.
+
+    The range is read from a '# coverage: YYYY-MM-DD ~ YYYY-MM-DD' comment line, or else spans the whole years
+    of the first and last listed holidays.
+
+    Args:
+        file_path (str, optional): The holiday file. Defaults like load_holidays.
+
+    Returns:
+        tuple: The first and last covered dates as datetime64[D].
+    """
+    file_path = file_path or os.environ.get(HOLIDAY_FILE_ENV) or DEFAULT_HOLIDAY_FILE
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            match = re.match(r'#\s*coverage:\s*(\S+)\s*~\s*(\S+)', line)
+            if match:
+                start_date, end_date = to_datetime64_array(np.array(match.groups(), dtype=str))
+                return start_date, end_date
+    holidays = load_holidays(file_path)
+    if not len(holidays):
+        return None
+    years = holidays[[0, -1]].astype('datetime64[Y]')
+    return years[0].astype('datetime64[D]'), (years[1] + 1).astype('datetime64[D]') - np.timedelta64(1, 'D')
+
+
+class HolidayCoverageWarning(UserWarning):
+    """
+    Warns that dates outside the range covered by the holiday list were used, so their holidays count as business days.
+    """
+
+
+class BusinessDayCalendar:
+    """
+    A business-day calendar backed by a precomputed business-day bitmap and cumulative counts.
+
+    Every offset, count and snap is a constant-time array lookup, so whole arrays of dates are handled in one pass.
+
+    Args:
+        start_year (int, optional): The first year covered by the calendar. Defaults to the first year of the holiday
+                                    coverage for a holiday file, or 1990 for holiday dates.
+        end_year (int, optional): The last year covered by the calendar. Defaults to the last year of the holiday
+                                  coverage for a holiday file, or 2050 for holiday dates.
+        holidays (array-like or str, optional): Holiday dates, or a holiday file path. Defaults to KRX holidays.
+        weekmask (tuple): The weekday indices (Monday=0) that are business days.
+        holiday_coverage (tuple, optional): The first and last dates the holidays are complete for. Defaults to
+                                            the coverage of the holiday file, or to the whole calendar for holiday dates.
+                                            Dates outside it raise a HolidayCoverageWarning.
+    """
+
+    def __init__(self, start_year=None, end_year=None, holidays=None, weekmask=(0, 1, 2, 3, 4), holiday_coverage=None):
+        if holidays is None or isinstance(holidays, str):
+            holiday_coverage = holiday_coverage or load_holiday_coverage(holidays)
+            holidays = load_holidays(holidays)
+        default_years = (1990, 2050) if holiday_coverage is None else [int(str(date)[:4]) for date in holiday_coverage]
+        start_year = default_years[0] if start_year is None else start_year
+        end_year = default_years[1] if end_year is None else end_year
+        self.start_date = np.datetime64(f'{start_year:04d}-01-01', 'D')
+        self.end_date = np.datetime64(f'{end_year:04d}-12-31', 'D')
+        self.dates = np.arange(self.start_date, self.end_date + np.timedelta64(1, 'D'))
+        weekdays = (self.dates.astype(np.int64) + 3) % 7
+        self.is_business = np.isin(weekdays, weekmask)
+        holidays = to_datetime64_array(holidays)
+        holidays = holidays[(holidays >= self.start_date) & (holidays <= self.end_date)]
+        self.is_business[(holidays - self.start_date).astype(np.int64)] = False
+        self.business_counts = np.cumsum(self.is_business)
+        self.business_dates = self.dates[self.is_business]
+        if holiday_coverage is None:
+            holiday_coverage = (self.start_date, self.end_date)
+        self.holiday_coverage = tuple(to_datetime64_array(holiday_coverage))
+
+    def __repr__(self):
+        return f"BusinessDayCalendar({self.start_date} ~ {self.end_date}, {len(self.business_dates)} business days)"
+
+    def _get_positions(self, dates):
+        positions = (to_datetime64_array(dates) - self.start_date).astype(np.int64)
+        if positions.size and (positions.min() < 0 or positions.max() >= len(self.dates)):
+            raise ValueError(f"Dates must be between {self.start_date} and {self.end_date}; pass start_year and end_year, "
+                             f"or extend the holiday file, for a wider calendar")
+        self._check_coverage(positions)
+        return positions
+
+    def _check_coverage(self, positions):
+        if positions.size:
+            first, last = self.dates[positions.min()], self.dates[positions.max()]
+            if first < self.holiday_coverage[0] or last > self.holiday_coverage[1]:
+                warnings.warn(f"Dates {first} ~ {last} leave the holiday coverage {self.holiday_coverage[0]} ~ {self.holiday_coverage[1]}; "
+                              f"holidays outside it count as business days", HolidayCoverageWarning, stacklevel=4)
+
+    def _get_business_indices(self, positions, roll):
+        if roll == 'backward':
+            return self.business_counts[positions] - 1
+        elif roll == 'forward':
+            return self.business_counts[positions] - self.is_business[positions]
+        raise ValueError("Invalid option. Please choose 'backward' or 'forward'.")
+
+    def _take_business_dates(self, indices):
+        if indices.size and (indices.min() < 0 or indices.max() >= len(self.business_dates)):
+            raise ValueError(f"Business-day offsets must stay between {self.start_date} and {self.end_date}")
+        result = self.business_dates[indices]
+        self._check_coverage((result - self.start_date).astype(np.int64))
+        return result
+
+    def is_business_day(self, dates):
+        """
+        Checks whether dates are business days.
+
+        Args:
+            dates (array-like): The dates.
+
+        Returns:
+            np.ndarray: A boolean array.
+        """
+        return self.is_business[self._get_positions(np.atleast_1d(dates))]
+
+    def snap(self, dates, roll='backward', form=None):
+        """
+        Snaps dates to business days, keeping dates that already are business days.
+
+        Args:
+            dates (array-like): The dates.
+            roll (str): 'backward' to the previous business day or 'forward' to the next one.
+            form (str, optional): The date format of the output strings. If None, returns datetime64[D] values.
+
+        Returns:
+            np.ndarray: The snapped dates.
+        """
+        return self.offset(dates, 0, roll=roll, form=form)
+
+    def offset(self, dates, n, roll='backward', form=None):
+        """
+        Moves dates by n business days, like numpy.busday_offset.
+
+        Dates that are not business days are first rolled to a business day.
+
+        Args:
+            dates (array-like): The dates.
+            n (int or array-like): The number of business days to move; negative values move backwards.
+            roll (str): 'backward' or 'forward', how to roll dates that are not business days.
+            form (str, optional): The date format of the output strings. If None, returns datetime64[D] values.
+
+        Returns:
+            np.ndarray: The offset dates.
+        """
+        indices = self._get_business_indices(self._get_positions(np.atleast_1d(dates)), roll) + np.asarray(n)
+        result = self._take_business_dates(indices)
+        return result if form is None else format_date_array(result, form)
+
+    def count(self, start_dates, end_dates):
+        """
+        Counts business days in [start_date, end_date).
+
+        Args:
+            start_dates (array-like): The start dates.
+            end_dates (array-like): The end dates.
+
+        Returns:
+            np.ndarray: The number of business days. If an end date is before its start date,
+                        the count of [end_date, start_date) is returned negated.
+        """
+        starts = self._get_positions(np.atleast_1d(start_dates))
+        ends = self._get_positions(np.atleast_1d(end_dates))
+        counts_before_starts = self.business_counts[starts] - self.is_business[starts]
+        counts_before_ends = self.business_counts[ends] - self.is_business[ends]
+        return counts_before_ends - counts_before_starts
+
+    def get_previous_month_ends(self, dates, form=None):
+        """
+        Returns the last business day of the month before each date.
+
+        Args:
+            dates (array-like): The dates.
+            form (str, optional): The date format of the output strings. If None, returns datetime64[D] values.
+
+        Returns:
+            np.ndarray: The previous business month-end dates.
+        """
+        dates = to_datetime64_array(np.atleast_1d(dates))
+        month_starts = dates.astype('datetime64[M]').astype('datetime64[D]')
+        return self.snap(month_starts - np.timedelta64(1, 'D'), roll='backward', form=form)
+
+    def get_month_ends(self, start_date, end_date, form=None):
+        """
+        Returns the last business day of every month between two dates, inclusive.
+
+        Args:
+            start_date (str or date): The start date.
+            end_date (str or date): The end date.
+            form (str, optional): The date format of the output strings. If None, returns datetime64[D] values.
+
+        Returns:
+            np.ndarray: The business month-end dates.
+        """
+        start_position, end_position = self._get_positions([start_date, end_date])
+        dates = self.dates[start_position:end_position + 1]
+        is_business = self.is_business[start_position:end_position + 1]
+        business_dates = dates[is_business]
+        months = business_dates.astype('datetime64[M]')
+        is_month_end = np.append(months[1:] != months[:-1], False) if len(months) else np.array([], dtype=bool)
+        if len(months):
+            next_index = self.business_counts[end_position]
+            is_month_end[-1] = next_index >= len(self.business_dates) or self.business_dates[next_index].astype('datetime64[M]') != months[-1]
+        result = business_dates[is_month_end]
+        return result if form is None else format_date_array(result, form)
+
+
+@lru_cache(maxsize=8)
+def get_business_day_calendar(start_year=None, end_year=None, holiday_file=None):
+    """
+    Returns a cached business-day calendar.
+
+    By default the calendar spans the years the holiday file covers, so dates whose holidays are unknown raise
+    a ValueError instead of being treated as business days.
+
+    Args:
+        start_year (int, optional): The first year covered by the calendar. Defaults to the holiday coverage.
+        end_year (int, optional): The last year covered by the calendar. Defaults to the holiday coverage.
+        holiday_file (str, optional): The holiday file. Defaults to the KRX holiday file.
+
+    Returns:
+        BusinessDayCalendar: The calendar.
+    """
+    return BusinessDayCalendar(start_year=start_year, end_year=end_year, holidays=holiday_file)
+
+
+def get_business_date_n_days_ago(date, n, form=None):
+    """
+    Returns the date n business days before the given date, using the default KRX calendar.
+
+    Args:
+        date (str or datetime): The reference date. Non-business days are rolled back first.
+        n (int): The number of business days before the reference date.
+        form (str, optional): The output date format. If None, the input string format is used.
+
+    Returns:
+        str or date: The business date, as a string if the input is a string or form is given.
+    """
+    if form is None and isinstance(date, str):
+        form = detect_date_format(date)
+    return get_business_day_calendar().offset(date, -n, roll='backward', form=form)[0].item()
+
+
+def get_previous_business_month_end(date, form=None):
+    """
+    Returns the last business day of the previous month, using the default KRX calendar.
+
+    Args:
+        date (str or datetime): The reference date.
+        form (str, optional): The output date format. If None, the input string format is used.
+
+    Returns:
+        str or date: The previous business month-end date, as a string if the input is a string or form is given.
+    """
+    if form is None and isinstance(date, str):
+        form = detect_date_format(date)
+    return get_business_day_calendar().get_previous_month_ends(date, form=form)[0].item()
+
+
+def count_business_days(start_date, end_date):
+    """
+    Counts business days in [start_date, end_date), using the default KRX calendar.
+
+    Args:
+        start_date (str or datetime): The start date.
+        end_date (str or datetime): The end date.
+
+    Returns:
+        int: The number of business days.
+    """
+    return int(get_business_day_calendar().count(start_date, end_date)[0])
+
+
+def snap_to_business_days(dates, roll='backward', form=None):
+    """
+    Snaps an array of dates to business days, using the default KRX calendar.
+
+    Args:
+        dates (array-like): The dates.
+        roll (str): 'backward' to the previous business day or 'forward' to the next one.
+        form (str, optional): The date format of the output strings. If None, returns datetime64[D] values.
+
+    Returns:
+        np.ndarray: The snapped dates.
+    """
+    return get_business_day_calendar().snap(dates, roll=roll, form=form)
@@ -0,0 +1,151 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from .date_array_utils import to_datetime64_array, split_date_array
+
+CALENDAR_TABLE_START_YEAR = 1990
+
+CALENDAR_TABLE_END_YEAR = 2050
+
+WEEKDAY_NAMES = {
+    'EN-full': ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"],
+    'EN': ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+    'KR-full': ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"],
+    'KR': ["월", "화", "수", "목", "금", "토", "일"],
+}
+
+
+@lru_cache(maxsize=4)
+def _get_calendar_columns(start_year=CALENDAR_TABLE_START_YEAR, end_year=CALENDAR_TABLE_END_YEAR):
+    dates = np.arange(np.datetime64(f'{start_year:04d}-01-01', 'D'), np.datetime64(f'{end_year + 1:04d}-01-01', 'D'))
+    years, months, days = split_date_array(dates)
+    weekdays = (dates.astype(np.int64) + 3) % 7
+    quarters = (months - 1) // 3 + 1
+    columns = {
+        'date': dates,
+        'year': years,
+        'month': months,
+        'day': days,
+        'weekday': weekdays,
+        'is_month_end': (dates + np.timedelta64(1, 'D')).astype('datetime64[M]') != dates.astype('datetime64[M]'),
+        'quarter': quarters,
+        'quarter_label': np.char.add(years.astype(str), np.array([' 1Q', ' 2Q', ' 3Q', ' 4Q'])[quarters - 1]).astype(object),
+    }
+    for language, names in WEEKDAY_NAMES.items():
+        columns[f"weekday_{language.lower().replace('-', '_')}"] = np.array(names, dtype=object)[weekdays]
+    for col in columns.values():
+        col.flags.writeable = False
+    return columns
+
+
+def get_calendar_table(start_year=CALENDAR_TABLE_START_YEAR, end_year=CALENDAR_TABLE_END_YEAR):
+    """
+    Returns the calendar dimension table with one row per day.
+
+    The underlying columns are computed once and cached, so repeated calls are cheap.
+
+    Args:
+        start_year (int): The first year of the table.
+        end_year (int): The last year of the table.
+
+    Returns:
+        pd.DataFrame: The table with date, year, month, day, weekday index, EN/KR weekday names,
+                      month-end flag, quarter and quarter label ('YYYY QQ', e.g. '2024 1Q') columns.
+    """
+    return pd.DataFrame(_get_calendar_columns(start_year, end_year))
+
+
+def _get_positions(dates):
+    columns = _get_calendar_columns()
+    positions = (to_datetime64_array(dates) - columns['date'][0]).astype(np.int64)
+    if positions.size and (positions.min() < 0 or positions.max() >= len(columns['date'])):
+        raise ValueError(f"Dates must be between {CALENDAR_TABLE_START_YEAR}-01-01 and {CALENDAR_TABLE_END_YEAR}-12-31")
+    return positions
+
+
+def lookup_calendar_table(dates, column):
+    """
+    Looks up a column of the calendar table for an array of dates with a single take.
+
+    Args:
+        dates (array-like): The dates.
+        column (str): The column of the calendar table, e.g. 'weekday_kr' or 'quarter_label'.
+
+    Returns:
+        np.ndarray: The looked-up values.
+    """
+    return _get_calendar_columns()[column][_get_positions(dates)]
+
+
+def get_weekdays(dates, language='EN'):
+    """
+    Returns the weekday names of an array of dates.
+
+    Args:
+        dates (array-like): The dates.
+        language (str): The language of the weekday ('EN', 'EN-full', 'KR', 'KR-full').
+
+    Returns:
+        np.ndarray: The weekday names in the specified language.
+    """
+    if language not in WEEKDAY_NAMES:
+        raise KeyError(language)
+    return lookup_calendar_table(dates, f"weekday_{language.lower().replace('-', '_')}")
+
+
+def get_quarter_labels(start_year, end_year):
+    """
+    Returns the quarter labels from a start year down to an end year, latest first.
+
+    Args:
+        start_year (int): The start (latest) year.
+        end_year (int): The end (earliest) year.
+
+    Returns:
+        list of str: The quarter labels, e.g. ['2024 4Q', '2024 3Q', ...].
+    """
+    return list(_get_quarter_labels(start_year, end_year))
+
+
+@lru_cache(maxsize=64)
+def _get_quarter_labels(start_year, end_year):
+    years = np.arange(start_year, end_year - 1, -1).astype(str)
+    return tuple(np.char.add(years[:, None], np.array([' 4Q', ' 3Q', ' 2Q', ' 1Q'])).ravel().tolist())
+
+
+@lru_cache(maxsize=1)
+def _get_quarter_start_dates():
+    columns = _get_calendar_columns()
+    is_quarter_start = (columns['day'] == 1) & (columns['month'] % 3 == 1)
+    mapping = {}
+    for year, quarter, date in zip(columns['year'][is_quarter_start], columns['quarter'][is_quarter_start], columns['date'][is_quarter_start]):
+        timestamp = pd.Timestamp(date)
+        mapping[f'{year} {quarter}Q'] = timestamp
+        mapping[f'{year} Q{quarter}'] = timestamp
+    return mapping
+
+
+def quarter_strings_to_dates(quarter_strings):
+    """
+    Converts quarter strings to the first day of each quarter with a single dictionary lookup per distinct string.
+
+    Args:
+        quarter_strings (array-like): The quarter strings, formatted as 'YYYY QX' or 'YYYY XQ'.
+
+    Returns:
+        pd.Series: The first days of the quarters; NaT for strings outside the calendar table.
+    """
+    return pd.Series(quarter_strings).map(_get_quarter_start_dates())
+
+
+def lookup_quarter_start_date(quarter_string):
+    """
+    Looks up the first day of a quarter in the calendar table.
+
+    Args:
+        quarter_string (str): The quarter string, formatted as 'YYYY QX' or 'YYYY XQ'.
+
+    Returns:
+        pd.Timestamp or None: The first day of the quarter, or None if it is outside the calendar table.
+    """
+    return _get_quarter_start_dates().get(quarter_string)
@@ -0,0 +1,272 @@
+import numpy as np
+from datetime import date, datetime
+
+_DAY = np.timedelta64(1, 'D')
+
+_MONTH = np.timedelta64(1, 'M')
+
+
+def to_datetime64(date_input):
+    """
+    Converts a single date input to a numpy datetime64 day.
+
+    Args:
+        date_input (str, date, datetime or np.datetime64): The date in 'YYYY-MM-DD' or 'YYYYMMDD' format,
+                                                           or a date-like object.
+
+    Returns:
+        np.datetime64: The date as datetime64[D].
+    """
+    if isinstance(date_input, str):
+        if len(date_input) == 8 and date_input.isdigit():
+            date_input = f'{date_input[:4]}-{date_input[4:6]}-{date_input[6:8]}'
+        return np.datetime64(date_input, 'D')
+    if isinstance(date_input, datetime):
+        return np.datetime64(date_input.date(), 'D')
+    if isinstance(date_input, (date, np.datetime64)):
+        return np.datetime64(date_input, 'D')
+    raise TypeError("Input date must be a string, date, datetime or numpy datetime64 object")
+
+
+def to_datetime64_array(dates):
+    """
+    Converts an array-like of dates to a datetime64[D] array without per-element Python calls.
+
+    Args:
+        dates (array-like): Dates as 'YYYY-MM-DD' or 'YYYYMMDD' strings, datetime64 values or date objects.
+
+    Returns:
+        np.ndarray: The dates as a datetime64[D] array.
+
+    Raises:
+        ValueError: If a 'YYYYMMDD' string is not a valid date, e.g. '20240231'.
+    """
+    arr = np.asarray(dates)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype('datetime64[D]')
+    if arr.dtype == object and arr.size and isinstance(arr.flat[0], str):
+        arr = arr.astype(str)
+    if arr.dtype.kind == 'U' and arr.size and not np.char.count(arr, '-').any():
+        numbers = arr.astype(np.int64)
+        month_numbers, days = numbers // 100 % 100, numbers % 100
+        months = ((numbers // 10000 - 1970) * 12 + (month_numbers - 1)).astype('datetime64[M]')
+        result = months.astype('datetime64[D]') + (days - 1)
+        invalid = (np.char.str_len(arr) != 8) | (month_numbers < 1) | (month_numbers > 12) | (days < 1) | (result.astype('datetime64[M]') != months)
+        if invalid.any():
+            raise ValueError(f"Invalid YYYYMMDD dates: {arr[invalid][:5].tolist()}")
+        return result
+    return arr.astype('datetime64[D]')
+
+
+def format_date_array(dates, form="%Y-%m-%d"):
+    """
+    Formats a datetime64 array to date strings in bulk.
+
+    Args:
+        dates (np.ndarray): The datetime64 array.
+        form (str): The date format. '%Y-%m-%d' and '%Y%m%d' are formatted without per-element Python calls.
+
+    Returns:
+        np.ndarray: The formatted date strings.
+    """
+    dates = np.asarray(dates).astype('datetime64[D]')
+    if form in ("%Y-%m-%d", "yyyy-mm-dd"):
+        return np.datetime_as_string(dates, unit='D')
+    if form in ("%Y%m%d", "yyyymmdd"):
+        years, months, days = split_date_array(dates)
+        return (years * 10000 + months * 100 + days).astype(str)
+    return np.array([date_obj.strftime(form) for date_obj in dates.astype(object)])
+
+
+def split_date_array(dates):
+    """
+    Splits a datetime64 array into year, month and day integer arrays.
+
+    Args:
+        dates (np.ndarray): The datetime64 array.
+
+    Returns:
+        tuple: The year, month and day arrays.
+    """
+    dates = np.asarray(dates).astype('datetime64[D]')
+    months = dates.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]').astype(np.int64) + 1970
+    month_numbers = months.astype(np.int64) % 12 + 1
+    days = (dates - months.astype('datetime64[D]')).astype(np.int64) + 1
+    return years, month_numbers, days
+
+
+def _to_datetime64_month(year_month):
+    if isinstance(year_month, str):
+        return np.datetime64(f'{year_month[:4]}-{year_month[4:6]}', 'M')
+    return to_datetime64(year_month).astype('datetime64[M]')
+
+
+def _format_or_keep(dates, form):
+    return dates if form is None else format_date_array(dates, form)
+
+
+def get_date_range_array(start_date, end_date, form=None):
+    """
+    Returns an array of all dates between a start date and an end date, inclusive.
+
+    Args:
+        start_date (str, date or np.datetime64): The start date.
+        end_date (str, date or np.datetime64): The end date.
+        form (str, optional): The date format of the output strings. If None, returns datetime64[D] values.
+
+    Returns:
+        np.ndarray: The dates between the start and end dates.
+    """
+    dates = np.arange(to_datetime64(start_date), to_datetime64(end_date) + _DAY, _DAY)
+    return _format_or_keep(dates, form)
+
+
+def generate_date_array(start_date, form=None):
+    """
+    Returns an array of all dates from a start date to today, inclusive.
+
+    Args:
+        start_date (str, date or np.datetime64): The start date.
+        form (str, optional): The date format of the output strings. If None, returns datetime64[D] values.
+
+    Returns:
+        np.ndarray: The dates from the start date to today.
+    """
+    return get_date_range_array(start_date, datetime.today(), form)
+
+
+def get_past_date_array(date_input, n, form=None):
+    """
+    Returns an array of n dates going backwards from a given date, starting with the date itself.
+
+    Args:
+        date_input (str, date or np.datetime64): The reference date.
+        n (int): The number of past dates to return.
+        form (str, optional): The date format of the output strings. If None, returns datetime64[D] values.
+
+    Returns:
+        np.ndarray: The past dates in descending order.
+    """
+    dates = to_datetime64(date_input) - np.arange(n).astype('timedelta64[D]')
+    return _format_or_keep(dates, form)
+
+
+def get_month_end_date_array(start_year_month, end_year_month, form=None):
+    """
+    Returns an array of month-end dates between two year-months, inclusive.
+
+    Args:
+        start_year_month (str or datetime): The start year-month in the format 'YYYYMM'.
+        end_year_month (str or datetime): The end year-month in the format 'YYYYMM'.
+        form (str, optional): The date format of the output strings. If None, returns datetime64[D] values.
+
+    Returns:
+        np.ndarray: The month-end dates.
+    """
+    start_month = _to_datetime64_month(start_year_month)
+    end_month = _to_datetime64_month(end_year_month)
+    months = np.arange(start_month, end_month + _MONTH, _MONTH)
+    dates = (months + _MONTH).astype('datetime64[D]') - _DAY
+    return _format_or_keep(dates, form)
+
+
+def get_first_date_of_month_array(start_date, end_date, form=None):
+    """
+    Returns an array of the first day of each month between a start date and an end date, inclusive.
+
+    Args:
+        start_date (str, date or np.datetime64): The start date.
+        end_date (str, date or np.datetime64): The end date.
+        form (str, optional): The date format of the output strings. If None, returns datetime64[D] values.
+
+    Returns:
+        np.ndarray: The first days of the months.
+    """
+    start_date = to_datetime64(start_date)
+    end_date = to_datetime64(end_date)
+    start_month = (start_date - _DAY).astype('datetime64[M]') + _MONTH
+    months = np.arange(start_month, end_date.astype('datetime64[M]') + _MONTH, _MONTH)
+    dates = months.astype('datetime64[D]')
+    return _format_or_keep(dates[dates <= end_date], form)
+
+
+def _get_month_lengths(months):
+    return ((months + _MONTH).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(np.int64)
+
+
+def is_month_end_array(dates):
+    """
+    Checks whether each date of an array is the last day of its month.
+
+    Args:
+        dates (array-like): The dates.
+
+    Returns:
+        np.ndarray: A boolean array.
+    """
+    dates = to_datetime64_array(dates)
+    return (dates + _DAY).astype('datetime64[M]') != dates.astype('datetime64[M]')
+
+
+def shift_month_array(dates, n_months, keep_month_end=False):
+    """
+    Shifts dates by a number of months with integer month arithmetic, clipping the day to the target month length.
+
+    Args:
+        dates (array-like): The dates.
+        n_months (int or array-like): The number of months to shift; negative values shift backwards.
+        keep_month_end (bool): If True, month-end dates are mapped to the month end of the target month.
+
+    Returns:
+        np.ndarray: The shifted dates as datetime64[D].
+    """
+    dates = to_datetime64_array(dates)
+    months = dates.astype('datetime64[M]')
+    days = (dates - months.astype('datetime64[D]')).astype(np.int64)
+    target_months = months + np.asarray(n_months, dtype=np.int64).astype('timedelta64[M]')
+    last_days = _get_month_lengths(target_months) - 1
+    if keep_month_end:
+        days = np.where(days == _get_month_lengths(months) - 1, last_days, np.minimum(days, last_days))
+    else:
+        days = np.minimum(days, last_days)
+    return target_months.astype('datetime64[D]') + days.astype('timedelta64[D]')
+
+
+def get_date_n_month_ago_array(dates, n, form=None):
+    """
+    Returns the dates n months before each given date; the array version of get_date_n_month_ago.
+
+    Month-end dates map to the month end of the target month, other days are clipped to the target month length.
+
+    Args:
+        dates (array-like): The reference dates.
+        n (int or array-like): The number of months before the reference dates.
+        form (str, optional): The date format of the output strings. If None, returns datetime64[D] values.
+
+    Returns:
+        np.ndarray: The dates n months before the reference dates.
+    """
+    return _format_or_keep(shift_month_array(dates, -np.asarray(n), keep_month_end=True), form)
+
+
+def calculate_prior_date_array(base_dates, days=0, months=0, years=0, form=None):
+    """
+    Calculates prior dates by a number of days, months and years; the array version of calculate_prior_date_extended.
+
+    Like relativedelta, the years and months are subtracted first, clipping the day to the month length,
+    and the days afterwards.
+
+    Args:
+        base_dates (array-like): The base dates.
+        days (int or array-like): The number of days to subtract.
+        months (int or array-like): The number of months to subtract.
+        years (int or array-like): The number of years to subtract.
+        form (str, optional): The date format of the output strings. If None, returns datetime64[D] values.
+
+    Returns:
+        np.ndarray: The prior dates.
+    """
+    n_months = np.asarray(years, dtype=np.int64) * 12 + np.asarray(months, dtype=np.int64)
+    dates = shift_month_array(base_dates, -n_months) - np.asarray(days, dtype=np.int64).astype('timedelta64[D]')
+    return _format_or_keep(dates, form)
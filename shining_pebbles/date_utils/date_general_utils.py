@@ -3,6 +3,9 @@ from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import calendar
 from typing import List, Tuple
+from .date_parsing_utils import detect_date_format, parse_date_string
+from .calendar_table_utils import WEEKDAY_NAMES, get_weekdays
+from .date_array_utils import format_date_array, get_date_range_array, generate_date_array, get_past_date_array, get_month_end_date_array
 
 
 def get_today(form="%Y-%m-%d"):
@@ -52,7 +55,7 @@ def get_date_n_days_ago(date, n, form=None):
         else:
             raise ValueError("Unsupported date format")
         
-        date_dt = datetime.strptime(date, input_format)
+        date_dt = parse_date_string(date, input_format)
         date_before_n_dt = date_dt - timedelta(days=n)
         output_format = form if form else input_format
         return date_before_n_dt.strftime(output_format)
@@ -91,7 +94,7 @@ def get_date_n_weeks_ago(date, n, form="%Y-%m-%d"):
         str: The date n weeks before the reference date in the specified format.
     """
     date = date.replace("-", "")
-    date_dt = datetime.strptime(date, "%Y%m%d")
+    date_dt = parse_date_string(date, "%Y%m%d")
     date_before_n_dt = date_dt - timedelta(weeks=n)
     date_before_n_str = date_before_n_dt.strftime(form)
     return date_before_n_str
@@ -107,16 +110,13 @@ def is_the_last_date_of_month(date):
         bool: True if the date is the last day of the month, False otherwise.
     """
     if isinstance(date, str):
-        date_obj = datetime.strptime(date, "%Y-%m-%d")
+        date_obj = parse_date_string(date, "%Y-%m-%d")
     elif isinstance(date, datetime):
         date_obj = date
     else:
         raise ValueError("Input must be a string in 'YYYY-MM-DD' format or a datetime object")
     
-    next_month = date_obj + relativedelta(months=1)
-    last_day_of_month = next_month.replace(day=1) - relativedelta(days=1)
-    
-    return date_obj.day == last_day_of_month.day
+    return date_obj.day == calendar.monthrange(date_obj.year, date_obj.month)[1]
 
 def get_date_n_month_ago(date, n, form="%Y-%m-%d"):
     """
@@ -131,7 +131,7 @@ def get_date_n_month_ago(date, n, form="%Y-%m-%d"):
         str: The date n months before the reference date in the specified format.
     """
     if isinstance(date, str):
-        date_obj = datetime.strptime(date, form)
+        date_obj = parse_date_string(date, form)
     elif isinstance(date, datetime):
         date_obj = date
     else:
@@ -147,22 +147,6 @@ def get_date_n_month_ago(date, n, form="%Y-%m-%d"):
     
     return result_date.strftime(form)
 
-def detect_date_format(date_str):
-    """
-    Detects the date format of a given date string.
-
-    Args:
-        date_str (str): The date string to detect the format of. Expected formats are 'YYYY-MM-DD' or 'YYYYMMDD'.
-
-    Returns:
-        str: The detected date format ('%Y-%m-%d' or '%Y%m%d').
-    """
-    if '-' in date_str:
-        return "%Y-%m-%d"
-    else:
-        return "%Y%m%d"
-
-
 def get_month_end_dates(start_year_month: str, end_year_month: str, date_format: str = "%Y%m%d") -> List[str]:
     """
     Generates a list of month-end dates between two given year-months.
@@ -179,23 +163,12 @@ def get_month_end_dates(start_year_month: str, end_year_month: str, date_format:
         ValueError: If the input date strings are not in the 'YYYYMM' format.
     """
     try:
-        start_date = datetime.strptime(start_year_month, "%Y%m")
-        end_date = datetime.strptime(end_year_month, "%Y%m")
+        start_date = parse_date_string(start_year_month, "%Y%m")
+        end_date = parse_date_string(end_year_month, "%Y%m")
     except ValueError:
         raise ValueError("The date strings must be in 'YYYYMM' format")
 
-    month_end_dates = []
-    current_date = start_date
-    while current_date <= end_date:
-        last_day = calendar.monthrange(current_date.year, current_date.month)[1]
-        month_end_date = current_date.replace(day=last_day)
-        month_end_dates.append(month_end_date.strftime(date_format))
-        if current_date.month == 12:
-            current_date = current_date.replace(year=current_date.year + 1, month=1, day=1)
-        else:
-            current_date = current_date.replace(month=current_date.month + 1, day=1)
-    
-    return month_end_dates
+    return get_month_end_date_array(start_date, end_date, form=date_format).tolist()
 
 
 def get_end_date_pairs(start_year_month: str, end_year_month: str, date_format: str = '%Y-%m-%d') -> List[Tuple[str, str]]:
@@ -238,16 +211,8 @@ def generate_date_list(start_date_str):
         list of str: A list of date strings from the start date to today in the same format as the input.
     """
     date_format = detect_date_format(start_date_str)
-    start_date = datetime.strptime(start_date_str, date_format)
-    today = datetime.today()
-
-    date_list = []
-    current_date = start_date
-    while current_date <= today:
-        date_list.append(current_date.strftime(date_format))
-        current_date += timedelta(days=1)
-
-    return date_list
+    start_date = parse_date_string(start_date_str, date_format)
+    return generate_date_array(start_date, form=date_format).tolist()
 
 def get_last_day_of_month(year, month):
     """
@@ -276,18 +241,8 @@ def get_weekday(date, language='EN'):
     Returns:
         str: The weekday name in the specified language.
     """
-    year = int(date.split('-')[0])
-    month = int(date.split('-')[1])
-    day = int(date.split('-')[2])
-    day_index = calendar.weekday(year, month, day)
-    mapping = {
-        'EN-full': ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"],
-        'EN': ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
-        'KR-full': ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"],
-        'KR': ["월", "화", "수", "목", "금", "토", "일"],
-    }
-    weekday = mapping[language][day_index]
-    return weekday
+    date_obj = parse_date_string(date, "%Y-%m-%d")
+    return WEEKDAY_NAMES[language][date_obj.weekday()]
 
 def get_dates_by_day_of_week(year):
     """
@@ -299,16 +254,10 @@ def get_dates_by_day_of_week(year):
     Returns:
         dict: A dictionary with days of the week as keys and lists of date strings as values.
     """
-    days_of_week = ['월', '화', '수', '목', '금', '토', '일']
-    dates_by_day = {day: [] for day in days_of_week}
-    date = datetime.date(year, 1, 1)
-    while date.year == year:
-        day_index = date.weekday()
-        day_name = days_of_week[day_index]
-        dates_by_day[day_name].append(date.isoformat())
-        date += datetime.timedelta(days=1)
-    
-    return dates_by_day
+    dates = get_date_range_array(f'{year:04d}-01-01', f'{year:04d}-12-31')
+    day_names = get_weekdays(dates, language='KR')
+    date_strs = format_date_array(dates, "%Y-%m-%d")
+    return {day: date_strs[day_names == day].tolist() for day in WEEKDAY_NAMES['KR']}
 
 def get_past_dates(date_str, n, form="%Y-%m-%d"):
     """
@@ -322,9 +271,8 @@ def get_past_dates(date_str, n, form="%Y-%m-%d"):
     Returns:
         list of str: A list of past date strings.
     """
-    start_date = datetime.strptime(date_str, form)
-    past_dates = [(start_date - timedelta(days=i)).strftime(form) for i in range(n)]
-    return past_dates
+    start_date = parse_date_string(date_str, form)
+    return get_past_date_array(start_date, n, form=form).tolist()
 
 def get_date_range(start_date_str, end_date_str, form="%Y-%m-%d"):
     """
@@ -338,14 +286,9 @@ def get_date_range(start_date_str, end_date_str, form="%Y-%m-%d"):
     Returns:
         list of str: A list of date strings between the start and end dates.
     """
-    start_date = datetime.strptime(start_date_str, form)
-    end_date = datetime.strptime(end_date_str, form)
-    date_list = []
-    current_date = start_date
-    while current_date <= end_date:
-        date_list.append(current_date.strftime(form))
-        current_date += timedelta(days=1)
-    return date_list
+    start_date = parse_date_string(start_date_str, form)
+    end_date = parse_date_string(end_date_str, form)
+    return get_date_range_array(start_date, end_date, form=form).tolist()
 
 def calculate_prior_date_extended(base_date, days=0, months=0, years=0):
     """
@@ -361,7 +304,7 @@ def calculate_prior_date_extended(base_date, days=0, months=0, years=0):
         str: The calculated prior date in 'YYYY-MM-DD' format.
     """
     date_format = "%Y-%m-%d"
-    base_date_obj = datetime.strptime(base_date, date_format)
+    base_date_obj = parse_date_string(base_date, date_format)
     prior_date_obj = base_date_obj - relativedelta(days=days, months=months, years=years)
     return prior_date_obj.strftime(date_format)
 
@@ -0,0 +1,87 @@
+from functools import lru_cache
+from datetime import datetime
+
+DATE_PARSER_CACHE_SIZE = 65536
+
+
+def detect_date_format(date_str, year_month=False):
+    """
+    Detects the date format of a given date string with a character check.
+
+    Args:
+        date_str (str): The date string to detect the format of. Expected formats are 'YYYY-MM-DD' or 'YYYYMMDD'.
+        year_month (bool): Whether 6-digit strings are detected as 'YYYYMM'. Off by default, so they keep being
+                           parsed as '%Y%m%d' like before.
+
+    Returns:
+        str: The detected date format ('%Y-%m-%d', '%Y%m%d', or '%Y%m' with year_month=True).
+    """
+    if '-' in date_str:
+        return "%Y-%m-%d"
+    elif year_month and len(date_str) == 6 and date_str.isdigit():
+        return "%Y%m"
+    else:
+        return "%Y%m%d"
+
+
+@lru_cache(maxsize=DATE_PARSER_CACHE_SIZE)
+def _parse_date_string(date_str, form):
+    if form == "%Y-%m-%d" and len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        year, month, day = date_str[:4], date_str[5:7], date_str[8:]
+        if year.isdigit() and month.isdigit() and day.isdigit():
+            return datetime(int(year), int(month), int(day))
+    elif form == "%Y%m%d" and len(date_str) == 8 and date_str.isdigit():
+        return datetime(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:]))
+    elif form == "%Y%m" and len(date_str) == 6 and date_str.isdigit():
+        return datetime(int(date_str[:4]), int(date_str[4:]), 1)
+    return datetime.strptime(date_str, form)
+
+
+def parse_date_string(date_str, form=None):
+    """
+    Parses a date string into a datetime object, memoizing the result.
+
+    Each distinct (date_str, form) pair is parsed once; repeated calls return the cached, immutable datetime object.
+
+    Args:
+        date_str (str): The date string.
+        form (str, optional): The date format. If None, it is detected with detect_date_format.
+
+    Returns:
+        datetime: The parsed date.
+
+    Raises:
+        ValueError: If the date string does not match the format.
+    """
+    if form is None:
+        form = detect_date_format(date_str)
+    return _parse_date_string(date_str, form)
+
+
+def get_date_parser_cache_info():
+    """
+    Returns the hit-rate statistics of the memoized date parser.
+
+    Returns:
+        dict: The hits, misses, maximum size, current size and hit rate of the cache.
+    """
+    info = _parse_date_string.cache_info()
+    calls = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'maxsize': info.maxsize,
+        'currsize': info.currsize,
+        'hit_rate': info.hits / calls if calls else 0.0,
+    }
+
+
+def clear_date_parser_cache():
+    """
+    Clears the cache and the statistics of the memoized date parser.
+
+    Returns:
+        None
+    """
+    _parse_date_string.cache_clear()
+    return None
@@ -2,4 +2,25 @@ from .file_control_utils import *
 from .file_managing_utils import *
 from .file_scan_utils import *
 from .load_utils import *
-from .delete_utils import *
\ No newline at end of file
+from .delete_utils import *
+from .hotfix_utils import *
+from .number_parsing_utils import *
+from .preprocess_utils import *
+from .number_formatting_utils import *
+from .period_return_utils import *
+from .columnar_utils import *
+from .fund_panel_utils import *
+from .file_name_utils import *
+from .save_version_utils import *
+from .snapshot_utils import *
+from .delta_utils import *
+from .retention_utils import *
+from .transfer_utils import *
+from .bundle_utils import *
+from .lock_utils import *
+from .storage_utils import *
+from .shared_memory_utils import *
+from .memoize_utils import *
+from .metrics_utils import *
+from .io_accounting_utils import *
+from .log_utils import *
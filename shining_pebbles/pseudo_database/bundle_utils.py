@@ -0,0 +1,280 @@
+import os
+import logging
+import re
+import json
+import time
+import zipfile
+from contextlib import ExitStack
+from datetime import date, datetime
+from functools import lru_cache
+from .lock_utils import get_temp_file_path, dataset_lock
+from .storage_utils import get_storage_backend, list_folder_names, get_folder_version
+from .io_accounting_utils import record_io
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_INDEX_NAME = '__index__.json'
+
+BUNDLE_FILE_PATTERN = re.compile(r'^bundle-(?P<subject>.+)-(?P<year_month>\d{6})\.zip$')
+
+_BUNDLE_MEMBER_INDEXES = {}
+
+
+def is_bundle_file(file_name):
+    """
+    Checks whether a file name is a 'bundle-{subject}-{YYYYMM}.zip' archive bundle.
+
+    Args:
+        file_name (str): The file name.
+
+    Returns:
+        bool: True if the file name is a bundle name.
+    """
+    return BUNDLE_FILE_PATTERN.match(file_name) is not None
+
+
+def get_bundle_key(file_name):
+    """
+    Returns the subject and date a saved file is bundled by.
+
+    The subject is the '{subject}' of 'dataset-{subject}-...' files and the first name part otherwise
+    (e.g. 'menu2160'); the date is the 'at' or 'to' date, or the save date if there is none.
+
+    Args:
+        file_name (str): The file name.
+
+    Returns:
+        tuple or None: The subject and the date (YYYYMMDD), or None for files without a save{timestamp} part.
+    """
+    save = re.search(r'-save(\d{8,14})', file_name)
+    if save is None or is_bundle_file(file_name):
+        return None
+    snapshot_date = re.search(r'-(?:at|to)(\d{8})-save', file_name)
+    dataset = re.match(r'^dataset-(.+?)-(?:at\d{8}|from\d{8}|save\d)', file_name)
+    subject = dataset.group(1) if dataset else file_name.split('-')[0]
+    return subject, snapshot_date.group(1) if snapshot_date else save.group(1)[:8]
+
+
+def _get_lock_subject(file_name):
+    dataset = re.match(r'^dataset-(.+?)-(?:at\d{8}|from\d{8}|save\d)', file_name)
+    if dataset:
+        return dataset.group(1)
+    series = re.match(r'^(menu\d+-code.{6})', file_name)
+    return series.group(1) if series else file_name.split('-')[0]
+
+
+@lru_cache(maxsize=256)
+def _read_bundle_index(bundle_path, mtime_ns):
+    with zipfile.ZipFile(bundle_path) as bundle:
+        return json.loads(bundle.read(BUNDLE_INDEX_NAME))
+
+
+def get_bundle_index(bundle_path):
+    """
+    Returns the internal index of a bundle, cached until the bundle changes.
+
+    Args:
+        bundle_path (str): The path of the bundle.
+
+    Returns:
+        dict: The size and modification time of each member, keyed by member name.
+    """
+    backend = get_storage_backend(bundle_path)
+    return _read_bundle_index(backend.get_local_path(bundle_path), backend.stat(bundle_path)['mtime_ns'])
+
+
+def get_bundle_members(file_folder, bundle_names=None):
+    """
+    Lists the members of the bundles in a folder.
+
+    The member index is built once per folder and reused until the folder changes (see get_folder_version), since
+    bundles are only written by renaming them into place. The returned dict is shared and must not be modified.
+
+    Args:
+        file_folder (str): The folder.
+        bundle_names (list, optional): The bundle file names, if already known from a scan of the folder.
+
+    Returns:
+        dict: The bundle path keyed by member name.
+    """
+    version = get_folder_version(file_folder)
+    bundle_names = None if bundle_names is None else tuple(sorted(bundle_names))
+    cached = _BUNDLE_MEMBER_INDEXES.get(file_folder)
+    if cached is not None and cached[0] == version and bundle_names in (None, cached[1]):
+        return cached[2]
+    if bundle_names is None:
+        bundle_names = tuple(sorted(file_name for file_name in list_folder_names(file_folder) if is_bundle_file(file_name)))
+    members = {}
+    for bundle_name in bundle_names:
+        bundle_path = os.path.join(file_folder, bundle_name)
+        for member_name in get_bundle_index(bundle_path):
+            members[member_name] = bundle_path
+    _BUNDLE_MEMBER_INDEXES[file_folder] = (version, bundle_names, members)
+    return members
+
+
+def find_bundle_of_file(file_path):
+    """
+    Finds the bundle that holds a file that is no longer a loose file.
+
+    Args:
+        file_path (str): The path the file had as a loose file.
+
+    Returns:
+        str or None: The path of the bundle, or None if no bundle of the folder holds the file.
+    """
+    file_folder, file_name = os.path.split(file_path)
+    key = get_bundle_key(file_name)
+    if key is not None:
+        bundle_path = os.path.join(file_folder, f'bundle-{key[0]}-{key[1][:6]}.zip')
+        if get_storage_backend(bundle_path).exists(bundle_path) and file_name in get_bundle_index(bundle_path):
+            return bundle_path
+    return get_bundle_members(file_folder or '.').get(file_name)
+
+
+def read_file_bytes(file_path):
+    """
+    Reads a file, from its bundle if it has been compacted.
+
+    Args:
+        file_path (str): The path of the file.
+
+    Returns:
+        bytes: The file contents.
+
+    Raises:
+        FileNotFoundError: If the file is neither a loose file nor a bundle member.
+    """
+    try:
+        return get_storage_backend(file_path).read_bytes(file_path)
+    except FileNotFoundError:
+        bundle_path = find_bundle_of_file(file_path)
+        if bundle_path is None:
+            raise
+    with zipfile.ZipFile(get_storage_backend(bundle_path).get_local_path(bundle_path)) as bundle:
+        data = bundle.read(os.path.basename(file_path))
+    record_io(bundle_path, files_opened=1, bytes_read=len(data))
+    return data
+
+
+def get_file_stat(file_path):
+    """
+    Returns the size and modification time of a file, from its bundle index if it has been compacted.
+
+    Args:
+        file_path (str): The path of the file.
+
+    Returns:
+        dict: The size in bytes and the modification time in nanoseconds.
+    """
+    try:
+        return get_storage_backend(file_path).stat(file_path)
+    except FileNotFoundError:
+        bundle_path = find_bundle_of_file(file_path)
+        if bundle_path is None:
+            raise
+        return dict(get_bundle_index(bundle_path)[os.path.basename(file_path)])
+
+
+def _write_bundle(bundle_path, file_folder, file_names):
+    temp_path = get_temp_file_path(bundle_path)
+    index = dict(get_bundle_index(bundle_path)) if os.path.exists(bundle_path) else {}
+    with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+        if index:
+            with zipfile.ZipFile(bundle_path) as old_bundle:
+                for member_name in index:
+                    if member_name not in file_names:
+                        bundle.writestr(old_bundle.getinfo(member_name), old_bundle.read(member_name), compress_type=zipfile.ZIP_DEFLATED)
+        for file_name in file_names:
+            file_path = os.path.join(file_folder, file_name)
+            stat = os.stat(file_path)
+            bundle.write(file_path, arcname=file_name)
+            index[file_name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            record_io(file_path, files_opened=1, bytes_read=stat.st_size)
+        bundle.writestr(BUNDLE_INDEX_NAME, json.dumps(index, ensure_ascii=False, sort_keys=True))
+    with zipfile.ZipFile(temp_path) as bundle:
+        bad_member = bundle.testzip()
+    if bad_member is not None:
+        os.remove(temp_path)
+        raise OSError(f"Bundle verification failed at {bad_member}: {bundle_path}")
+    record_io(bundle_path, files_opened=1, bytes_written=os.path.getsize(temp_path))
+    os.replace(temp_path, bundle_path)
+
+
+def compact_files_into_bundles(file_folder, cutoff_date, regex=None):
+    """
+    Packs saved files dated before a cutoff into 'bundle-{subject}-{YYYYMM}.zip' bundles and removes the loose files.
+
+    Files are grouped by subject and month (see get_bundle_key). Each bundle carries an '__index__.json' member,
+    and files added to an existing bundle are merged into it. The loaders and scan_files_including_regex
+    keep listing and reading the bundled files as if they were loose files. The dataset locks of the bundled
+    subjects are held while a bundle is written and its loose files are removed.
+
+    Args:
+        file_folder (str): The folder to compact.
+        cutoff_date (str, date or datetime): Files dated before this date ('YYYY-MM-DD' or 'YYYYMMDD') are bundled.
+        regex (str, optional): Only files matching this regex are bundled.
+
+    Returns:
+        dict: The numbers of bundled files and written bundles, the bundled bytes and the elapsed seconds.
+    """
+    start_time = time.perf_counter()
+    if isinstance(cutoff_date, (date, datetime)):
+        cutoff_date = cutoff_date.strftime('%Y%m%d')
+    cutoff_date = cutoff_date.replace('-', '')
+    pattern = re.compile(regex) if regex else None
+    groups = {}
+    dir_entries = 0
+    with os.scandir(file_folder) as files:
+        for file in files:
+            dir_entries += 1
+            if not file.is_file() or (pattern and not pattern.search(file.name)):
+                continue
+            key = get_bundle_key(file.name)
+            if key is not None and key[1] < cutoff_date:
+                groups.setdefault((key[0], key[1][:6]), []).append(file.name)
+    record_io(file_folder=file_folder, dir_entries=dir_entries)
+
+    bundled_bytes = 0
+    for (subject, year_month), file_names in sorted(groups.items()):
+        file_names = sorted(file_names)
+        with ExitStack() as locks:
+            for lock_subject in sorted({_get_lock_subject(file_name) for file_name in file_names}):
+                locks.enter_context(dataset_lock(file_folder, lock_subject))
+            bundled_bytes += sum(os.path.getsize(os.path.join(file_folder, file_name)) for file_name in file_names)
+            _write_bundle(os.path.join(file_folder, f'bundle-{subject}-{year_month}.zip'), file_folder, file_names)
+            for file_name in file_names:
+                os.remove(os.path.join(file_folder, file_name))
+            record_io(file_folder=file_folder, files_deleted=len(file_names))
+    summary = {
+        'files': sum(map(len, groups.values())),
+        'bundles': len(groups),
+        'bytes': bundled_bytes,
+        'seconds': time.perf_counter() - start_time,
+    }
+    logger.info("- compaction: %d files into %d bundles in %s", summary['files'], summary['bundles'], file_folder)
+    return summary
+
+
+def unpack_bundle(bundle_path, remove=True):
+    """
+    Restores the members of a bundle as loose files, keeping their original modification times.
+
+    Args:
+        bundle_path (str): The path of the bundle.
+        remove (bool): Whether to remove the bundle afterwards.
+
+    Returns:
+        list: The restored file names.
+    """
+    file_folder = os.path.dirname(bundle_path)
+    index = get_bundle_index(bundle_path)
+    with zipfile.ZipFile(bundle_path) as bundle:
+        for member_name, member in index.items():
+            file_path = os.path.join(file_folder, member_name)
+            with open(file_path, 'wb') as file:
+                file.write(bundle.read(member_name))
+            os.utime(file_path, ns=(member['mtime_ns'], member['mtime_ns']))
+    if remove:
+        os.remove(bundle_path)
+    return list(index)
@@ -0,0 +1,129 @@
+import os
+import json
+import importlib.util
+import pandas as pd
+from .lock_utils import atomic_write_path
+from .storage_utils import get_storage_backend
+from .io_accounting_utils import record_io
+
+PARQUET_ENGINES = ('pyarrow', 'fastparquet')
+
+COLUMNAR_EXTENSIONS = ('.parquet', '.pkl')
+
+
+def get_parquet_engine():
+    """
+    Returns the first installed parquet engine.
+
+    Returns:
+        str or None: 'pyarrow' or 'fastparquet', or None if neither is installed.
+    """
+    for engine in PARQUET_ENGINES:
+        if importlib.util.find_spec(engine) is not None:
+            return engine
+    return None
+
+
+def get_columnar_extension():
+    """
+    Returns the extension of columnar files: '.parquet' if a parquet engine is installed, otherwise '.pkl'.
+
+    Returns:
+        str: The file extension.
+    """
+    return '.parquet' if get_parquet_engine() else '.pkl'
+
+
+def save_columnar(df, file_path_base):
+    """
+    Saves a DataFrame to a columnar file, as parquet if a parquet engine is installed or as a pickle otherwise.
+
+    The file is written to a temporary path first and then renamed, so readers never see a partial file.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to save.
+        file_path_base (str): The file path without extension.
+
+    Returns:
+        str: The path of the saved file.
+    """
+    file_path = file_path_base + get_columnar_extension()
+    with atomic_write_path(file_path) as temp_path:
+        if file_path.endswith('.parquet'):
+            df.to_parquet(temp_path, engine=get_parquet_engine())
+        else:
+            df.to_pickle(temp_path)
+    return file_path
+
+
+def find_columnar_file(file_path_base):
+    """
+    Finds the columnar file saved under a base path, whichever format it was written in. 's3://' paths are looked up
+    through the storage backend.
+
+    Args:
+        file_path_base (str): The file path without extension.
+
+    Returns:
+        str or None: The path of the file, or None if no columnar file exists.
+    """
+    backend = get_storage_backend(file_path_base)
+    for extension in COLUMNAR_EXTENSIONS:
+        if backend.exists(file_path_base + extension):
+            return file_path_base + extension
+    return None
+
+
+def load_manifest(manifest_path):
+    """
+    Loads the JSON manifest kept next to a columnar file, from a local or 's3://' path.
+
+    Args:
+        manifest_path (str): The manifest path.
+
+    Returns:
+        dict: The manifest, or an empty dict if it does not exist.
+    """
+    backend = get_storage_backend(manifest_path)
+    if not backend.exists(manifest_path):
+        return {}
+    return json.loads(backend.read_bytes(manifest_path).decode('utf-8'))
+
+
+def save_manifest(manifest, manifest_path):
+    """
+    Saves the JSON manifest kept next to a columnar file, through a temporary file and an atomic rename (or upload).
+
+    Args:
+        manifest (dict): The manifest.
+        manifest_path (str): The manifest path.
+
+    Returns:
+        str: The manifest path.
+    """
+    with atomic_write_path(manifest_path) as temp_path:
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+    return manifest_path
+
+
+def load_columnar(file_path, columns=None, filters=None):
+    """
+    Loads a columnar file, reading only the requested columns. 's3://' files are read through the read-through cache.
+
+    Args:
+        file_path (str): The path of a '.parquet' or '.pkl' file.
+        columns (list, optional): The columns to read. Defaults to all columns.
+        filters (list, optional): Parquet row filters, e.g. [('fund_code', 'in', ['100001'])].
+                                  Only pushed down to parquet files; pickles are read in full.
+
+    Returns:
+        pd.DataFrame: The loaded DataFrame.
+    """
+    backend = get_storage_backend(file_path)
+    local_path = backend.get_local_path(file_path)
+    record_io(file_path, files_opened=1, bytes_read=os.path.getsize(local_path))
+    if file_path.endswith('.parquet'):
+        return pd.read_parquet(local_path, columns=columns, filters=filters)
+    df = pd.read_pickle(local_path)
+    return df if columns is None else df[list(columns)]
@@ -1,32 +1,42 @@
 import os
+import logging
 from .file_scan_utils import scan_files_including_regex
+from .io_accounting_utils import record_io
+from .delta_utils import get_delta_base_paths
+from .log_utils import log_item, log_summary
+
+logger = logging.getLogger(__name__)
 
 def delete_file(file_path):
     try:
         os.remove(file_path)
-        print(f"deleted: {file_path}")
+        record_io(file_path, files_deleted=1)
+        log_item(logger, "deleted: %s", file_path)
+        return True
     except FileNotFoundError:
-        print(f"file not found: {file_path}")
+        logger.warning("file not found: %s", file_path)
     except Exception as e:
-        print(f"deletion failed: {file_path}, reason: {e}")
+        logger.exception("deletion failed: %s, reason: %s", file_path, e)
+    return False
 
 def get_file_names_to_delete(file_paths, keep=10):
     if len(file_paths) <= keep:
         return []    
     sorted_files = sorted(file_paths)
-    return sorted_files[:-keep]
+    protected = get_delta_base_paths(sorted_files[-keep:])
+    return [file_path for file_path in sorted_files[:-keep] if file_path not in protected]
 
 def delete_old_files(file_paths, keep=10):
     files_to_delete = get_file_names_to_delete(file_paths, keep)
     if not files_to_delete:
-        print("No files to delete.")
+        log_item(logger, "No files to delete.")
         return None
-    print(f"files to delete: {len(files_to_delete)} files")
-    for file_path in files_to_delete:
-        delete_file(file_path)
+    log_item(logger, "files to delete: %d files", len(files_to_delete))
+    deleted = sum(delete_file(file_path) for file_path in files_to_delete)
+    log_summary(logger, "- deleted %d of %d files", deleted, len(files_to_delete))
     return None
 
 def delete_old_files_in_file_folder_by_regex(file_folder, regex, keep=10):
-    file_paths = scan_files_including_regex(file_folder, regex, option="path")
+    file_paths = scan_files_including_regex(file_folder, regex, option="path", include_bundles=False)
     delete_old_files(file_paths=file_paths, keep=keep)
     return None
@@ -0,0 +1,235 @@
+import io
+import logging
+import os
+import csv
+from functools import lru_cache
+import pandas as pd
+from shining_pebbles.date_utils import get_today
+from .file_name_utils import get_latest_snapshot_file_names
+from .bundle_utils import read_file_bytes, get_file_stat
+from .lock_utils import dataset_lock, atomic_write_path
+from .storage_utils import get_storage_backend
+from .io_accounting_utils import record_io
+from .metrics_utils import instrument
+from .log_utils import log_item
+
+logger = logging.getLogger(__name__)
+
+DELTA_FILE_SUFFIX = '-delta.csv'
+
+DELTA_CHECKPOINT_INTERVAL = 20
+
+DELTA_OPS = {
+    'base': '@',
+    'header': 'h',
+    'keep': '=',
+    'update': '~',
+    'insert': '+',
+    'delete': '-',
+}
+
+
+def is_delta_file(file_path):
+    """
+    Checks whether a file is a delta-encoded snapshot.
+
+    Args:
+        file_path (str): The file name or path.
+
+    Returns:
+        bool: True if the file name ends with '-delta.csv'.
+    """
+    return file_path.endswith(DELTA_FILE_SUFFIX)
+
+
+def read_delta_base_file_name(file_path):
+    """
+    Reads the name of the file a delta-encoded snapshot is based on, from the first line of the delta.
+
+    Args:
+        file_path (str): The path of the delta-encoded CSV file.
+
+    Returns:
+        str: The file name of the base, in the same folder.
+    """
+    if os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as file:
+            line = file.readline()
+        record_io(file_path, files_opened=1, bytes_read=len(line.encode('utf-8')))
+    else:
+        line = read_file_bytes(file_path).decode('utf-8-sig').split('\n', 1)[0]
+    return next(csv.reader([line]))[1]
+
+
+def get_delta_base_paths(file_paths):
+    """
+    Returns the files that delta-encoded snapshots depend on, following each chain of bases down to a full file.
+
+    Deleting or moving a file in this set without the deltas that depend on it leaves those deltas unreadable.
+
+    Args:
+        file_paths (list): The paths of the files, full or delta-encoded, that must stay readable.
+
+    Returns:
+        set: The paths of the base files.
+    """
+    base_paths = set()
+    pending = [file_path for file_path in file_paths if is_delta_file(file_path)]
+    while pending:
+        file_path = pending.pop()
+        try:
+            base_path = os.path.join(os.path.dirname(file_path), read_delta_base_file_name(file_path))
+        except FileNotFoundError:
+            continue
+        if base_path not in base_paths:
+            base_paths.add(base_path)
+            if is_delta_file(base_path):
+                pending.append(base_path)
+    return base_paths
+
+
+def _parse_csv_text(text):
+    rows = list(csv.reader(io.StringIO(text)))
+    return rows[0], rows[1:]
+
+
+@lru_cache(maxsize=8)
+def _read_rows(file_path, mtime_ns):
+    text = read_file_bytes(file_path).decode('utf-8-sig')
+    if not is_delta_file(file_path):
+        header, rows = _parse_csv_text(text)
+        return header, rows, 0
+    ops = list(csv.reader(io.StringIO(text)))
+    (_, base_file_name, _), (_, *header) = ops[0], ops[1]
+    base_path = os.path.join(os.path.dirname(file_path), base_file_name)
+    _, base_rows, base_depth = read_dataset_rows(base_path)
+    rows = []
+    for op, *fields in ops[2:]:
+        if op == DELTA_OPS['keep']:
+            start, length = int(fields[0]), int(fields[1])
+            rows.extend(base_rows[start:start + length])
+        elif op in (DELTA_OPS['update'], DELTA_OPS['insert']):
+            rows.append(fields)
+    return header, rows, base_depth + 1
+
+
+def read_dataset_rows(file_path):
+    """
+    Reads the raw CSV rows of a dataset file, reconstructing delta-encoded snapshots from their base files.
+
+    Args:
+        file_path (str): The path of a full or delta-encoded CSV file.
+
+    Returns:
+        tuple: The header, the list of rows (lists of strings) and the delta depth (0 for a full file).
+    """
+    return _read_rows(file_path, get_file_stat(file_path)['mtime_ns'])
+
+
+def read_dataset_csv(file_path, index_col=0, **kwargs):
+    """
+    Reads a dataset CSV file into a DataFrame, transparently reconstructing delta-encoded snapshots.
+
+    A reconstructed snapshot is parsed from the same text a full save would have written,
+    so it has the same values and dtypes as if it had been saved in full. Files that have been
+    compacted into an archive bundle are read from the bundle.
+
+    Args:
+        file_path (str): The path of a full or delta-encoded CSV file.
+        index_col (int, optional): The column to use as the row labels of the DataFrame.
+        **kwargs: Further arguments passed to pd.read_csv.
+
+    Returns:
+        pd.DataFrame: The loaded DataFrame.
+    """
+    if not is_delta_file(file_path):
+        if os.path.exists(file_path):
+            record_io(file_path, files_opened=1, bytes_read=os.path.getsize(file_path))
+            return pd.read_csv(file_path, index_col=index_col, **kwargs)
+        return pd.read_csv(io.BytesIO(read_file_bytes(file_path)), index_col=index_col, **kwargs)
+    header, rows, _ = read_dataset_rows(file_path)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(header)
+    writer.writerows(rows)
+    buffer.seek(0)
+    return pd.read_csv(buffer, index_col=index_col, **kwargs)
+
+
+def _encode_delta(base_header, base_rows, header, rows):
+    if header != base_header:
+        return None
+    base_positions = {}
+    for position, row in enumerate(base_rows):
+        if row[0] in base_positions:
+            return None
+        base_positions[row[0]] = position
+    ops = []
+    keys = set()
+    for row in rows:
+        key = row[0]
+        if key in keys:
+            return None
+        keys.add(key)
+        position = base_positions.get(key)
+        if position is None:
+            ops.append([DELTA_OPS['insert'], *row])
+        elif base_rows[position] != row:
+            ops.append([DELTA_OPS['update'], *row])
+        elif ops and ops[-1][0] == DELTA_OPS['keep'] and ops[-1][1] + ops[-1][2] == position:
+            ops[-1][2] += 1
+        else:
+            ops.append([DELTA_OPS['keep'], position, 1])
+    ops.extend([DELTA_OPS['delete'], key] for key in base_positions if key not in keys)
+    return ops
+
+
+@instrument(tag='save')
+def save_dataset_of_subject_at_as_delta(df, file_folder, subject, input_date, checkpoint_interval=DELTA_CHECKPOINT_INTERVAL):
+    """
+    Saves a dataset snapshot as a row-level delta against the previous snapshot of the subject.
+
+    The delta keeps runs of unchanged rows by position and stores inserted, updated and deleted rows by key
+    (the first CSV column, i.e. the index). A full snapshot is saved instead when there is no previous snapshot,
+    the columns changed, the keys are not unique, or the previous snapshot is already checkpoint_interval - 1
+    deltas away from a full file. Delta files are named 'dataset-{subject}-at{YYYYMMDD}-save{YYYYMMDDHH}-delta.csv'
+    and are reconstructed transparently by read_dataset_csv. The save holds the subject's dataset_lock, so
+    concurrent writers never delta against a snapshot that is still being written.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to save.
+        file_folder (str): The folder where the file should be saved.
+        subject (str): The subject of the dataset.
+        input_date (str): The date of the dataset.
+        checkpoint_interval (int): Save a full snapshot at least every checkpoint_interval snapshots.
+
+    Returns:
+        str: The path of the saved file.
+    """
+    get_storage_backend(file_folder).make_folder(file_folder)
+    with dataset_lock(file_folder, subject):
+        date_ref = input_date.replace("-", "")
+        file_name_base = f'dataset-{subject}-at{date_ref}-save{get_today("%Y%m%d%H")}'
+        text = df.to_csv()
+        header, rows = _parse_csv_text(text)
+
+        ops = None
+        previous = [file_name for previous_date, file_name in get_latest_snapshot_file_names(file_folder, subject).items() if previous_date <= date_ref]
+        if previous and previous[-1] not in (f'{file_name_base}.csv', file_name_base + DELTA_FILE_SUFFIX):
+            base_header, base_rows, base_depth = read_dataset_rows(os.path.join(file_folder, previous[-1]))
+            if base_depth + 1 < checkpoint_interval:
+                ops = _encode_delta(base_header, base_rows, header, rows)
+
+        if ops is None:
+            file_path = os.path.join(file_folder, f'{file_name_base}.csv')
+            with atomic_write_path(file_path) as temp_path, open(temp_path, 'w', encoding='utf-8-sig', newline='') as file:
+                file.write(text)
+        else:
+            file_path = os.path.join(file_folder, file_name_base + DELTA_FILE_SUFFIX)
+            with atomic_write_path(file_path) as temp_path, open(temp_path, 'w', encoding='utf-8-sig', newline='') as file:
+                writer = csv.writer(file, lineterminator='\n')
+                writer.writerow([DELTA_OPS['base'], previous[-1], base_depth + 1])
+                writer.writerow([DELTA_OPS['header'], *header])
+                writer.writerows(ops)
+    log_item(logger, '- save complete: %s', file_path)
+    return file_path
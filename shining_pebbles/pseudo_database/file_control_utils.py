@@ -1,29 +1,52 @@
+import numpy as np
 import pandas as pd
 import json
 import os
 import re
 import time
 import shutil
+import logging
 import datetime
+from functools import partial, wraps
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from shining_pebbles.date_utils import get_today
+from shining_pebbles.date_utils.date_array_utils import get_first_date_of_month_array
+from shining_pebbles.date_utils.date_parsing_utils import parse_date_string
+from shining_pebbles.date_utils.calendar_table_utils import get_quarter_labels, lookup_quarter_start_date
+from .file_scan_utils import scan_files_including_regex
+from .hotfix_utils import HotfixOverlay
+from .save_version_utils import resolve_file_name_as_of
+from .transfer_utils import transfer_files, TRANSFER_OPTIONS
+from .lock_utils import dataset_lock, write_csv_atomically
+from .bundle_utils import read_file_bytes
+from .metrics_utils import instrument, METRICS
+from .log_utils import log_item, log_summary
+from .delta_utils import read_dataset_csv, save_dataset_of_subject_at_as_delta, DELTA_CHECKPOINT_INTERVAL
+from .preprocess_utils import PreprocessPipeline, MENU2160_PRICE_PIPELINE, MENU2160_ASSET_PIPELINE, MENU2160_PRICE_AND_ASSET_PIPELINE
+
+logger = logging.getLogger(__name__)
 
 def measure_time(func):
     """
     A decorator that measures the execution time of a given function.
 
+    The duration is printed and recorded in the metrics registry (see metrics_utils), whether or not
+    metrics are enabled, so it can be exported with export_metrics.
+
     Args:
         func (callable): The function to be measured.
 
     Returns:
         callable: The wrapped function with execution time measurement.
     """
+    @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.time()
-        duration = end_time - start_time
-        print(f"Function '{func.__name__}' execution took {duration:.9f} seconds.")
+        duration_ns = time.perf_counter_ns() - start_ns
+        METRICS.record(func.__qualname__, duration_ns, tag='measure_time')
+        logger.info("Function '%s' execution took %.9f seconds.", func.__name__, duration_ns / 1e9)
         return result
     return wrapper
 
@@ -56,34 +79,14 @@ def rename_key(dct, old_key, new_key):
     if old_key in dct:
         dct[new_key] = dct.pop(old_key)
     else:
-        print(f"Key '{old_key}' not found in the dictionary.")
+        logger.warning("Key '%s' not found in the dictionary.", old_key)
     
     return dct
 
-def scan_files_including_regex(file_folder, regex, option="name"):
-    """
-    Scans a folder for files matching a given regex pattern.
-
-    Args:
-        file_folder (str): The folder to scan.
-        regex (str): The regex pattern to match.
-        option (str): Whether to return file names ('name') or file paths ('path').
-
-    Returns:
-        list: A sorted list of matching file names or paths.
-    """
-    with os.scandir(file_folder) as files:
-        lst = [file.name for file in files if re.findall(regex, file.name)]
-    mapping = {
-        "name": lst,
-        "path": [os.path.join(file_folder, file_name) for file_name in lst],
-    }
-    lst_ordered = sorted(mapping[option])
-    return lst_ordered
-
 import pandas as pd
 
-def open_df_in_file_folder_by_regex(file_folder, regex, option="path", index_col=0):
+@instrument(tag='load')
+def open_df_in_file_folder_by_regex(file_folder, regex, option="path", index_col=0, as_of=None):
     """
     Opens a DataFrame from the latest file in a folder matching a regex pattern.
 
@@ -92,12 +95,16 @@ def open_df_in_file_folder_by_regex(file_folder, regex, option="path", index_col
         regex (str): The regex pattern to match.
         option (str): Whether to match file names ('name') or file paths ('path').
         index_col (int): The column to use as the row labels of the DataFrame.
+        as_of (str or datetime, optional): If given, opens the newest file saved at or before this timestamp instead.
 
     Returns:
         pd.DataFrame or None: The DataFrame loaded from the file, or None if no file is found.
     """
-    latest_file_path = scan_files_including_regex(file_folder, regex, option)[-1]
-    df = pd.read_csv(latest_file_path, index_col=index_col)
+    if as_of is not None:
+        latest_file_path = os.path.join(file_folder, resolve_file_name_as_of(file_folder, regex, as_of))
+    else:
+        latest_file_path = scan_files_including_regex(file_folder, regex, option)[-1]
+    df = read_dataset_csv(latest_file_path, index_col=index_col)
     return df
 
 def open_json_in_file_folder_by_regex(file_folder, regex, option="path", index=-1):
@@ -114,17 +121,16 @@ def open_json_in_file_folder_by_regex(file_folder, regex, option="path", index=-
         dict: The JSON object loaded from the file.
     """
     latest_file_path = scan_files_including_regex(file_folder, regex, option)[index]
-    with open(latest_file_path, 'r', encoding='utf-8') as file:
-        dct = json.load(file)
+    dct = json.loads(read_file_bytes(latest_file_path).decode('utf-8'))
     return dct
 
 def open_df_in_file_folder_by_regex_with_exception(file_folder, regex, option="path", index_col=0):
     try:
         latest_file_path = scan_files_including_regex(file_folder, regex, option)[-1]
-        df = pd.read_csv(latest_file_path, index_col=index_col)
+        df = read_dataset_csv(latest_file_path, index_col=index_col)
         return df
     except IndexError as e:
-        print(f"Error: {e}")
+        logger.error("Error: %s", e)
         return None
 
 def get_last_key_and_value_in_json_file(dct):
@@ -182,7 +188,7 @@ def convert_type_of_date_input(date, form):
         ValueError: If the input date is not a string or datetime object.
     """
     if isinstance(date, str):
-        date = datetime.strptime(date, form)
+        date = parse_date_string(date, form)
     elif isinstance(date, datetime):
         date = date.strftime(form)
     else:
@@ -191,6 +197,7 @@ def convert_type_of_date_input(date, form):
     return date
 
 
+@instrument(tag='save')
 def save_dataset_of_subject_at(df, file_folder, subject, input_date):
     """
     Saves the dataset of a specific subject at a given date.
@@ -209,11 +216,13 @@ def save_dataset_of_subject_at(df, file_folder, subject, input_date):
     file_name = f'dataset-{subject}-at{input_date.replace("-","")}-save{get_today("%Y%m%d%H")}.csv'
     file_path = os.path.join(file_folder, file_name)
     # Save DataFrame to CSV
-    df.to_csv(file_path, encoding='utf-8-sig')
-    print(f'- save complete: {file_path}')
+    with dataset_lock(file_folder, subject):
+        write_csv_atomically(df, file_path, encoding='utf-8-sig')
+    log_item(logger, '- save complete: %s', file_path)
     return df
 
 
+@instrument(tag='save')
 def save_dataset_of_subject_from_to(df, file_folder, subject, start_date=None, end_date=None):
     """
     Saves the dataset of a specific subject from a start date to an end date.
@@ -237,11 +246,13 @@ def save_dataset_of_subject_from_to(df, file_folder, subject, start_date=None, e
     file_name = f'dataset-{subject}-from{start_date.replace("-","")}-to{end_date.replace("-","")}-save{get_today("%Y%m%d%H")}.csv'
     file_path = os.path.join(file_folder, file_name)
     # Save DataFrame to CSV
-    df.to_csv(file_path, encoding='utf-8-sig')
-    print(f'- save complete: {file_path}')
+    with dataset_lock(file_folder, subject):
+        write_csv_atomically(df, file_path, encoding='utf-8-sig')
+    log_item(logger, '- save complete: %s', file_path)
     return df
 
 
+@instrument(tag='save')
 def save_df_to_file(df, file_folder, file_name_var, file_extension=".csv", archive=False, file_folder_archive="./archive"):
     """
     Saves a DataFrame to a file, optionally archiving the previous file.
@@ -263,17 +274,18 @@ def save_df_to_file(df, file_folder, file_name_var, file_extension=".csv", archi
         save_time = get_today()
         file_name = f"dataset-{file_name_var}-save{save_time}{file_extension}"
         file_path = os.path.join(file_folder, file_name)
-        if os.path.exists(file_path) and archive:
-            df_archive = pd.read_csv(file_path)
-            os.makedirs(file_folder_archive, exist_ok=True)
-            archive_file_name = "archive-" + file_name
-            archive_file_path = os.path.join(file_folder_archive, archive_file_name)
-            df_archive.to_csv(archive_file_path, index=False)
-            print(f"Archived: {archive_file_path}")
-        df.to_csv(file_path, index=False)
-        print(f"Saved: {file_path}")
+        with dataset_lock(file_folder, file_name_var):
+            if os.path.exists(file_path) and archive:
+                df_archive = read_dataset_csv(file_path, index_col=None)
+                os.makedirs(file_folder_archive, exist_ok=True)
+                archive_file_name = "archive-" + file_name
+                archive_file_path = os.path.join(file_folder_archive, archive_file_name)
+                write_csv_atomically(df_archive, archive_file_path, index=False)
+                log_item(logger, "Archived: %s", archive_file_path)
+            write_csv_atomically(df, file_path, index=False)
+        log_item(logger, "Saved: %s", file_path)
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception("Error: %s", e)
 
 def check_folder_and_create_folder(folder_name):
     """
@@ -287,9 +299,9 @@ def check_folder_and_create_folder(folder_name):
     """
     if not os.path.exists(folder_name):
         os.makedirs(folder_name)
-        print(f"Created: {folder_name}")
+        log_item(logger, "Created: %s", folder_name)
     else:
-        print(f"Already exists: {folder_name}")
+        log_item(logger, "Already exists: %s", folder_name)
     return folder_name
 
 
@@ -303,6 +315,9 @@ def quarter_string_to_date(quarter_string):
     Returns:
         datetime: The datetime object representing the first day of the quarter.
     """
+    quarter_start_date = lookup_quarter_start_date(quarter_string)
+    if quarter_start_date is not None:
+        return quarter_start_date
     year, q = quarter_string.split(' ')
     year = int(year)
     quarter = int(q.replace('Q', '').strip())
@@ -348,9 +363,9 @@ def fill_all_first_days_of_months(start_date, end_date):
     Returns:
         list of str: A list of the first day of each month between the start and end dates.
     """
-    date_range = pd.date_range(start=start_date, end=end_date)
-    first_days = [date for date in date_range if date.day == 1]
-    return [date.strftime("%Y-%m-%d") for date in first_days]
+    start_date = pd.Timestamp(start_date).to_pydatetime()
+    end_date = pd.Timestamp(end_date).to_pydatetime()
+    return get_first_date_of_month_array(start_date, end_date, form="%Y-%m-%d").tolist()
 
 def get_last_day_of_previous_month(input_date_str):
     """
@@ -362,7 +377,7 @@ def get_last_day_of_previous_month(input_date_str):
     Returns:
         str: The last day of the previous month in 'YYYY-MM-DD' format.
     """
-    input_date = datetime.strptime(input_date_str, '%Y-%m-%d')
+    input_date = parse_date_string(input_date_str, '%Y-%m-%d')
     first_day_of_current_month = input_date.replace(day=1)
     last_day_of_previous_month = first_day_of_current_month - timedelta(days=1)
     return last_day_of_previous_month.strftime('%Y-%m-%d')
@@ -378,11 +393,7 @@ def get_quarters(start_year, end_year):
     Returns:
         list of str: A list of quarter strings.
     """
-    quarters = []
-    for year in range(start_year, end_year - 1, -1):
-        for quarter in ['4Q', '3Q', '2Q', '1Q']:
-            quarters.append(f'{year} {quarter}')
-    return quarters
+    return get_quarter_labels(start_year, end_year)
 
 def pick_something_in_string(string, something):
     """
@@ -543,33 +554,28 @@ def pick_latest_date_in_file_folder(file_folder, regex, form="%Y%m%d"):
     return latest_date
 
 
-def move_files(regex, folder_from, folder_to, option='copy'):
+def move_files(regex, folder_from, folder_to, option='copy', max_workers=8):
     """
     Moves or copies files matching a regex pattern from one folder to another.
 
+    Existing destination files are always overwritten, and copies get a new modification time.
+
     Args:
         regex (str): The regex pattern to match.
         folder_from (str): The source folder.
         folder_to (str): The destination folder.
-        option (str): The operation to perform ('copy' or 'move').
+        option (str): The operation to perform ('copy', 'move' or 'link').
+        max_workers (int): The number of threads transferring files.
 
     Returns:
-        None
+        dict or None: The transfer summary (see transfer_files), or None if the option is invalid.
     """
+    if option not in TRANSFER_OPTIONS:
+        logger.error("Invalid option. Please choose 'copy', 'move' or 'link'.")
+        return None
     check_folder_and_create_folder(folder_to)
-    filenames = scan_files_including_regex(file_folder=folder_from, regex=regex)
-    for filename in filenames:
-        file_path_from = os.path.join(folder_from, filename)
-        file_path_to = os.path.join(folder_to, filename)
-        if option == 'copy':
-            shutil.copy(file_path_from, file_path_to)
-            print(f"Copied: [{file_path_from}] -> [{file_path_to}]")
-        elif option == 'move':
-            shutil.move(file_path_from, file_path_to)
-            print(f"Moved: [{file_path_from}] -> [{file_path_to}]")
-        else:
-            print("Invalid option. Please choose 'copy' or 'move'.")
-            return
+    return transfer_files(folder_from, folder_to, regex=regex, option=option, max_workers=max_workers,
+                          preserve_mtime=False, skip_identical=False)
 
 
 def change_to_numeric(x):
@@ -607,6 +613,7 @@ def compare_dataframes(df1, df2, key):
 
 
 
+@instrument(tag='merge')
 def update_df_time_series(df_old, df_new):
     """
     Merges two time series DataFrames.
@@ -624,11 +631,11 @@ def update_df_time_series(df_old, df_new):
     unique_to_old = df_old.index.difference(df_new.index)
     unique_to_new = df_new.index.difference(df_old.index)
     if not unique_to_old.empty and not pd.isna(unique_to_old).any():
-        print(f"Unique dates in df_old not in df_new: {unique_to_old[0].strftime('%Y-%m-%d')} ~ {unique_to_old[-1].strftime('%Y-%m-%d')} (Total: {len(unique_to_old)} days)")
+        log_item(logger, "Unique dates in df_old not in df_new: %s ~ %s (Total: %d days)", unique_to_old[0].strftime('%Y-%m-%d'), unique_to_old[-1].strftime('%Y-%m-%d'), len(unique_to_old))
     if not unique_to_new.empty and not pd.isna(unique_to_new).any():
-        print(f"Unique dates in df_new not in df_old: {unique_to_new[0].strftime('%Y-%m-%d')} ~ {unique_to_new[-1].strftime('%Y-%m-%d')} (Total: {len(unique_to_new)} days)")
+        log_item(logger, "Unique dates in df_new not in df_old: %s ~ %s (Total: %d days)", unique_to_new[0].strftime('%Y-%m-%d'), unique_to_new[-1].strftime('%Y-%m-%d'), len(unique_to_new))
     if set(common_index) == set(df_new.index):
-        print("No update is needed. The new data is already included in the old data.")
+        log_item(logger, "No update is needed. The new data is already included in the old data.")
         return df_new
     elif not common_index.empty:
         split_date = common_index.min()
@@ -640,6 +647,7 @@ def update_df_time_series(df_old, df_new):
         df_merge = df_merge.sort_index()
     return df_merge
 
+@instrument(tag='merge')
 def update_timeseries_dataset_from_old_and_new_in_file_folder(file_folder, fund_code, menu_code=None, save=True):
     """
     Updates a time series dataset in a file folder by merging old and new data.
@@ -654,40 +662,51 @@ def update_timeseries_dataset_from_old_and_new_in_file_folder(file_folder, fund_
         pd.DataFrame: The updated dataset.
     """
     menu_code = pick_something_in_string(file_folder, something=r"\d{4}") if menu_code is None else menu_code
-    file_paths = scan_files_including_regex(file_folder=f'dataset-{menu_code}', regex=fr'menu2160-code{fund_code}-to\d{{8}}', option='path')
-    if len(file_paths) < 2:
-        print("There is no old dataset to update.")
-        return
-    file_name_old = file_paths[-2]
-    file_name_new = file_paths[-1]
-    df_old = pd.read_csv(file_name_old, index_col=0)
-    df_new = pd.read_csv(file_name_new, index_col=0)
-    print(f"Compare two datasets:")
-    print(f"old dataset: {file_name_old}")
-    print(f"new dataset: {file_name_new}")
-    df_update = update_df_time_series(df_old, df_new)
-    if save:
-        end_date = df_update.index[-1].strftime("%Y%m%d")
-        file_folder = f'dataset-{menu_code}'
-        file_name = f'menu{menu_code}-code{fund_code}-to{end_date}-save{get_today("%Y%m%d")}-updated.csv'
-        file_path = os.path.join(file_folder, file_name)
-        df_update.to_csv(file_path)
-        print(f"Updated dataset saved: {file_name}")
+    file_folder = f'dataset-{menu_code}'
+    with dataset_lock(file_folder, f'menu{menu_code}-code{fund_code}'):
+        file_paths = scan_files_including_regex(file_folder=file_folder, regex=fr'menu2160-code{fund_code}-to\d{{8}}', option='path')
+        if len(file_paths) < 2:
+            log_item(logger, "There is no old dataset to update.")
+            return
+        file_name_old = file_paths[-2]
+        file_name_new = file_paths[-1]
+        df_old = read_dataset_csv(file_name_old, index_col=0)
+        df_new = read_dataset_csv(file_name_new, index_col=0)
+        log_item(logger, "Compare two datasets:\nold dataset: %s\nnew dataset: %s", file_name_old, file_name_new)
+        df_update = update_df_time_series(df_old, df_new)
+        if save:
+            end_date = df_update.index[-1].strftime("%Y%m%d")
+            file_name = f'menu{menu_code}-code{fund_code}-to{end_date}-save{get_today("%Y%m%d")}-updated.csv'
+            write_csv_atomically(df_update, os.path.join(file_folder, file_name))
+            log_item(logger, "Updated dataset saved: %s", file_name)
     return df_update
     
 
-def update_all_timeseries_datasets_in_file_folder(dataset_file_folder):
+def _update_timeseries_dataset_in_file_folder(file_folder, fund_code):
+    return update_timeseries_dataset_from_old_and_new_in_file_folder(file_folder=file_folder, fund_code=fund_code) is not None
+
+
+def update_all_timeseries_datasets_in_file_folder(dataset_file_folder, max_workers=1):
     """
     Updates all time series datasets in a file folder.
 
+    Each fund reads and writes its own files, so the funds can be updated on a process pool;
+    the workers only send back whether their fund was updated.
+
     Args:
         dataset_file_folder (str): The dataset file folder.
+        max_workers (int): The number of worker processes updating funds in parallel.
 
     Returns:
         None
     """
-    for code in get_fund_codes_in_file_folder(dataset_file_folder):
-        update_timeseries_dataset_from_old_and_new_in_file_folder(file_folder=dataset_file_folder, fund_code=code)
+    fund_codes = list(dict.fromkeys(get_fund_codes_in_file_folder(dataset_file_folder)))
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(partial(_update_timeseries_dataset_in_file_folder, dataset_file_folder), fund_codes))
+    else:
+        results = [_update_timeseries_dataset_in_file_folder(dataset_file_folder, code) for code in fund_codes]
+    log_summary(logger, "- timeseries update: %d of %d funds updated in %s", sum(results), len(fund_codes), dataset_file_folder)
     return None
 
 def find_new_elements(data_old, data_new):
@@ -756,19 +775,11 @@ def preprocess_timeseries(df, time_col_from, value_col_from, time_col_to, value_
     Returns:
         pd.DataFrame: The preprocessed DataFrame.
     """
-    print('step 1: drop NaN')
-    df = df[[time_col_from, value_col_from]].dropna()
-    print('step 2: rename columns to date and price')
-    df = df.rename(columns={time_col_from: time_col_to, value_col_from: value_col_to})
-    print('step 3: reset index')
-    df = df.reset_index(drop=True)
-    df = df.copy()
-    try:
-        print('step 4: convert value to float type')
-        df[value_col_to] = df[value_col_to].str.replace(',', '').astype(float)
-    except Exception as e:
-        print(e)
-    return df
+    pipeline = PreprocessPipeline(
+        columns={time_col_from: time_col_to, value_col_from: value_col_to},
+        numeric_cols=[value_col_to],
+    )
+    return pipeline.run(df)
 
 def preprocess_timeseries_for_single_column(df, date_col_name, price_col_name):
     """
@@ -799,20 +810,11 @@ def preprocess_timeseries_for_multi_columns(df, time_col_from, value_cols_from,
     Returns:
         pd.DataFrame: The preprocessed DataFrame.
     """
-    print('step 1: drop NaN')
-    df = df[[time_col_from, *value_cols_from]].dropna()
-    print('step 2: rename columns to date and price')
-    df.columns = [time_col_to, *value_cols_to]
-    print('step 3: reset index')
-    df = df.reset_index(drop=True)
-    df = df.copy()
-    try:
-        print('step 4: convert value to float type')
-        for col in value_cols_to:
-            df[col] = df[col].str.replace(',', '').astype(float)
-    except Exception as e:
-        print(e)
-    return df
+    pipeline = PreprocessPipeline(
+        columns=dict(zip([time_col_from, *value_cols_from], [time_col_to, *value_cols_to])),
+        numeric_cols=value_cols_to,
+    )
+    return pipeline.run(df)
 
 def preprocess_to_extract_timeseries_price_in_menu2160(df_menu2160):
     """
@@ -824,10 +826,9 @@ def preprocess_to_extract_timeseries_price_in_menu2160(df_menu2160):
     Returns:
         pd.DataFrame: The preprocessed DataFrame with date and price columns.
     """
-    df = preprocess_timeseries_for_single_column(df=df_menu2160, date_col_name='일자', price_col_name='수정\n기준가')
-    return df
+    return MENU2160_PRICE_PIPELINE.run(df_menu2160)
 
-def preprocess_to_extract_timeseries_price_in_menu2160(df_menu2160):
+def preprocess_to_extract_timeseries_asset_in_menu2160(df_menu2160):
     """
     Preprocesses a DataFrame to extract time series asset data from menu 2160.
 
@@ -837,8 +838,7 @@ def preprocess_to_extract_timeseries_price_in_menu2160(df_menu2160):
     Returns:
         pd.DataFrame: The preprocessed DataFrame with date and asset columns.
     """
-    df = preprocess_timeseries(df_menu2160, time_col_from='일자', value_col_from='순자산총액', time_col_to='date', value_col_to='asset')
-    return df
+    return MENU2160_ASSET_PIPELINE.run(df_menu2160)
 
 def preprocess_timeseries_of_menu2160_for_multi_columns(df_menu2160):
     """
@@ -850,8 +850,7 @@ def preprocess_timeseries_of_menu2160_for_multi_columns(df_menu2160):
     Returns:
         pd.DataFrame: The preprocessed DataFrame with date, price, and asset columns.
     """
-    df = preprocess_timeseries_for_multi_columns(df_menu2160, time_col_from='일자', value_cols_from=['수정\n기준가', '순자산총액'], time_col_to='date', value_cols_to=['price', 'asset'])
-    return df
+    return MENU2160_PRICE_AND_ASSET_PIPELINE.run(df_menu2160)
 
 
 def print_directory_structure(root_dir, ignore_dirs=None):
@@ -927,7 +926,8 @@ def print_directory_structure(root_dir, ignore_dirs=None):
     return None
 
 
-def save_dataset_of_subject_at(df, file_folder, subject, input_date):
+@instrument(tag='save')
+def save_dataset_of_subject_at(df, file_folder, subject, input_date, delta=False, checkpoint_interval=DELTA_CHECKPOINT_INTERVAL):
     """
     Saves a DataFrame as a CSV file with a specific naming convention.
 
@@ -936,10 +936,13 @@ def save_dataset_of_subject_at(df, file_folder, subject, input_date):
         file_folder (str): The folder path where the CSV file will be saved.
         subject (str): The subject or name to be included in the file name.
         input_date (str): The date associated with the dataset, formatted as 'YYYY-MM-DD'.
+        delta (bool): Whether to save the snapshot as a row-level delta against the previous snapshot
+                      (see save_dataset_of_subject_at_as_delta).
+        checkpoint_interval (int): With delta=True, save a full snapshot at least every checkpoint_interval snapshots.
 
     The function generates a CSV file name based on the provided subject and input date, 
     along with the current timestamp (YYYYMMDDHH format). The file is saved in the 
-    specified folder, and a confirmation message is printed with the full file path.
+    specified folder, and a confirmation message is logged with the full file path.
 
     Example:
         - save complete: dataset-analysis/dataset-example-at20230824-save2023082412.csv
@@ -947,13 +950,18 @@ def save_dataset_of_subject_at(df, file_folder, subject, input_date):
     Returns:
         pd.DataFrame: The original DataFrame.
     """
+    if delta:
+        save_dataset_of_subject_at_as_delta(df, file_folder, subject, input_date, checkpoint_interval=checkpoint_interval)
+        return df
     file_name = f'dataset-{subject}-at{input_date.replace("-","")}-save{get_today("%Y%m%d%H")}.csv'
     file_path = os.path.join(file_folder, file_name)
-    df.to_csv(file_path)
-    print(f'- save complete: {file_path}')
+    with dataset_lock(file_folder, subject):
+        write_csv_atomically(df, file_path)
+    log_item(logger, '- save complete: %s', file_path)
     return df
 
 
+@instrument(tag='save')
 def save_dataset_of_subject_from_to(df, file_folder, subject, start_date, end_date):
     """
     Saves a DataFrame as a CSV file with a specific naming convention including date range.
@@ -967,7 +975,7 @@ def save_dataset_of_subject_from_to(df, file_folder, subject, start_date, end_da
 
     The function generates a CSV file name based on the provided subject and date range, 
     along with the current timestamp (YYYYMMDDHH format). The file is saved in the 
-    specified folder, and a confirmation message is printed with the full file path.
+    specified folder, and a confirmation message is logged with the full file path.
 
     Example:
         - save complete: dataset-analysis/dataset-example-from20230801-to20230824-save2023082412.csv
@@ -977,17 +985,14 @@ def save_dataset_of_subject_from_to(df, file_folder, subject, start_date, end_da
     """
     file_name = f'dataset-{subject}-from{start_date.replace("-","")}-to{end_date.replace("-","")}-save{get_today("%Y%m%d%H")}.csv'
     file_path = os.path.join(file_folder, file_name)
-    df.to_csv(file_path)
-    print(f'- save complete: {file_path}')
+    with dataset_lock(file_folder, subject):
+        write_csv_atomically(df, file_path)
+    log_item(logger, '- save complete: %s', file_path)
     return df
 
 
 def inject_hotfix_data_in_df(df, data, ref_col):
-    df_hotfix = pd.DataFrame(data)
-    df = pd.concat([df, df_hotfix], ignore_index=True)
-    df = df.drop_duplicates(subset=ref_col, keep='last')
-    df = df.sort_values(by=ref_col).reset_index(drop=True)
-    return df
+    return HotfixOverlay(ref_col=ref_col).add(data).apply(df)
 
 
 def convert_to_unit(number, language='KR', level=None):
@@ -1,5 +1,10 @@
 import os
 import shutil
+import logging
+from .io_accounting_utils import record_io
+from .log_utils import log_item
+
+logger = logging.getLogger(__name__)
 
 def archive_a_file(file_path, file_folder_archive):
     """
@@ -18,13 +23,14 @@ def archive_a_file(file_path, file_folder_archive):
 
         # Move the file
         shutil.move(file_path, file_folder_archive)
-        print(f"File moved to {file_folder_archive}")
+        record_io(file_folder=file_folder_archive, files_moved=1)
+        log_item(logger, "File moved to %s", file_folder_archive)
         return True
     except FileNotFoundError:
-        print("Error: The file does not exist.")
+        logger.error("Error: The file does not exist.")
         return False
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception("Error: %s", e)
         return False
 
 def delete_a_file(file_path):
@@ -39,11 +45,12 @@ def delete_a_file(file_path):
     """
     try:
         os.remove(file_path)
-        print(f"File {file_path} deleted.")
+        record_io(file_path, files_deleted=1)
+        log_item(logger, "File %s deleted.", file_path)
         return True
     except FileNotFoundError:
-        print("Error: The file does not exist.")
+        logger.error("Error: The file does not exist.")
         return False
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception("Error: %s", e)
         return False
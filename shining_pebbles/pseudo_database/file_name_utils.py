@@ -0,0 +1,57 @@
+import re
+from .file_scan_utils import scan_files_including_regex
+
+DATASET_FILE_NAME_PATTERN = re.compile(
+    r'^dataset-(?P<subject>.+?)-(?:at(?P<date_ref>\d{8})|from(?P<start_date>\d{8})-to(?P<end_date>\d{8}))'
+    r'-save(?P<save>\d+)(?P<delta>-delta)?\.(?P<extension>\w+)$'
+)
+
+
+def parse_dataset_file_name(file_name):
+    """
+    Parses a 'dataset-{subject}-at{YYYYMMDD}-save{...}' or 'dataset-{subject}-from{YYYYMMDD}-to{YYYYMMDD}-save{...}' file name.
+
+    Args:
+        file_name (str): The file name.
+
+    Returns:
+        dict or None: The subject, date_ref, start_date, end_date, save, delta ('-delta' for delta-encoded files)
+                      and extension parts (None for the parts that are absent), or None if the file name does not match.
+    """
+    match = DATASET_FILE_NAME_PATTERN.match(file_name)
+    return match.groupdict() if match else None
+
+
+def normalize_save_timestamp(save):
+    """
+    Pads a save timestamp ('YYYYMMDD', 'YYYYMMDDHH', ...) to 14 digits so that timestamps of different precision compare correctly.
+
+    Args:
+        save (str): The save timestamp.
+
+    Returns:
+        str: The timestamp padded with zeros to 'YYYYMMDDHHMMSS'.
+    """
+    return save.ljust(14, '0')
+
+
+def get_latest_snapshot_file_names(file_folder, subject):
+    """
+    Maps each 'at' date of a subject to its newest saved 'dataset-{subject}-at{YYYYMMDD}-save{...}' file.
+
+    Args:
+        file_folder (str): The folder to scan.
+        subject (str): The subject of the dataset.
+
+    Returns:
+        dict: The latest file name keyed by 'at' date (YYYYMMDD), in date order.
+    """
+    latest = {}
+    for file_name in scan_files_including_regex(file_folder, regex=f'^dataset-{re.escape(subject)}-at\\d{{8}}-save'):
+        parts = parse_dataset_file_name(file_name)
+        if parts is None or parts['subject'] != subject:
+            continue
+        save = normalize_save_timestamp(parts['save'])
+        if parts['date_ref'] not in latest or save >= latest[parts['date_ref']][0]:
+            latest[parts['date_ref']] = (save, file_name)
+    return {date_ref: latest[date_ref][1] for date_ref in sorted(latest)}
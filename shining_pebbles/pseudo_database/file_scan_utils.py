@@ -1,20 +1,40 @@
 import os
 import re
+from .bundle_utils import is_bundle_file, get_bundle_members
+from .lock_utils import LOCK_FOLDER_NAME, TEMP_FOLDER_NAME
+from .storage_utils import list_folder_names
+from .metrics_utils import instrument
 
-def scan_files_including_regex(file_folder, regex, option="name"):
+@instrument(tag='scan')
+def scan_files_including_regex(file_folder, regex, option="name", include_bundles=True):
     """
     Scans a folder for files matching a given regex pattern.
 
+    The folder may be a local folder or an 's3://bucket/prefix' folder (see storage_utils).
+
     Args:
         file_folder (str): The folder to scan.
         regex (str): The regex pattern to match.
         option (str): Whether to return file names ('name') or file paths ('path').
+        include_bundles (bool): Whether to list the members of archive bundles in the folder
+                                as if they were still loose files (instead of the bundle files themselves).
+                                The '.locks' and '.tmp' folders of the writers are never listed.
 
     Returns:
         list: A sorted list of matching file names or paths.
     """
-    with os.scandir(file_folder) as files:
-        lst = [file.name for file in files if re.findall(regex, file.name)]
+    bundle_names = []
+    lst = []
+    for file_name in list_folder_names(file_folder):
+        if file_name in (LOCK_FOLDER_NAME, TEMP_FOLDER_NAME):
+            continue
+        if include_bundles and is_bundle_file(file_name):
+            bundle_names.append(file_name)
+        elif re.findall(regex, file_name):
+            lst.append(file_name)
+    if bundle_names:
+        loose_names = set(lst)
+        lst.extend(name for name in get_bundle_members(file_folder, bundle_names) if name not in loose_names and re.findall(regex, name))
     mapping = {
         "name": lst,
         "path": [os.path.join(file_folder, file_name) for file_name in lst],
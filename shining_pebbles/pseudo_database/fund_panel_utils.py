@@ -0,0 +1,167 @@
+import os
+import logging
+import re
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from .file_scan_utils import scan_files_including_regex
+from .preprocess_utils import MENU2160_PRICE_AND_ASSET_PIPELINE
+from .bundle_utils import get_file_stat
+from .metrics_utils import instrument
+from .delta_utils import read_dataset_csv
+from .columnar_utils import save_columnar, find_columnar_file, load_columnar, load_manifest, save_manifest
+
+logger = logging.getLogger(__name__)
+
+FUND_PANEL_COLUMNS = ['fund_code', 'date', 'price', 'asset']
+
+
+def get_fund_panel_file_path_base(panel_folder, menu_code='2160', form='long'):
+    """
+    Returns the file path (without extension) of a consolidated fund panel.
+
+    Args:
+        panel_folder (str): The folder of the panel files.
+        menu_code (str): The menu code of the source files.
+        form (str): 'long', 'wide-price' or 'wide-asset'.
+
+    Returns:
+        str: The file path without extension, e.g. '{panel_folder}/panel-menu2160-long'.
+    """
+    return os.path.join(panel_folder, f'panel-menu{menu_code}-{form}')
+
+
+def get_latest_file_name_by_fund_code(file_folder, menu_code='2160'):
+    """
+    Maps each fund code in a file folder to the name of its latest 'menu{menu_code}-code{fund_code}-...' file.
+
+    Args:
+        file_folder (str): The dataset file folder.
+        menu_code (str): The menu code of the files.
+
+    Returns:
+        dict: The latest file name keyed by fund code.
+    """
+    pattern = re.compile(f'^menu{menu_code}-code(.{{6}})')
+    latest_file_names = {}
+    for file_name in scan_files_including_regex(file_folder, regex=f'^menu{menu_code}-code.{{6}}.*\\.csv$'):
+        latest_file_names[pattern.match(file_name).group(1)] = file_name
+    return latest_file_names
+
+
+def _get_file_signature(file_folder, file_name):
+    return {'file_name': file_name, **get_file_stat(os.path.join(file_folder, file_name))}
+
+
+def _load_fund_frames(file_folder, file_names_by_code, max_workers):
+    fund_codes = list(file_names_by_code)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        dfs = list(executor.map(lambda fund_code: read_dataset_csv(os.path.join(file_folder, file_names_by_code[fund_code]), index_col=None), fund_codes))
+    dfs = MENU2160_PRICE_AND_ASSET_PIPELINE.run_many(dict(zip(fund_codes, dfs)))
+    frames = []
+    for fund_code, df in dfs.items():
+        frame = df.assign(fund_code=fund_code, date=pd.to_datetime(df['date']))
+        frames.append(frame[FUND_PANEL_COLUMNS])
+    return frames
+
+
+@instrument(tag='merge')
+def consolidate_menu2160_panel(file_folder, panel_folder=None, menu_code='2160', wide=False, max_workers=8):
+    """
+    Consolidates the per-fund 'menu2160-code{fund_code}-to{date}' files into one columnar long panel.
+
+    Only the latest file of each fund code is used, and only funds whose source file changed since the last
+    consolidation (by name, size or modification time) are re-read; the others are kept from the existing panel.
+
+    Args:
+        file_folder (str): The folder of the per-fund files.
+        panel_folder (str, optional): The folder of the panel files. Defaults to file_folder.
+        menu_code (str): The menu code of the source files.
+        wide (bool): Whether to also write wide pivots (dates x funds) of price and asset.
+        max_workers (int): The number of threads reading changed source files.
+
+    Returns:
+        dict: The panel file path and the lists of rebuilt, kept and removed fund codes.
+    """
+    panel_folder = panel_folder or file_folder
+    long_path_base = get_fund_panel_file_path_base(panel_folder, menu_code, 'long')
+    manifest_path = f'{long_path_base}-manifest.json'
+
+    signatures = {fund_code: _get_file_signature(file_folder, file_name)
+                  for fund_code, file_name in get_latest_file_name_by_fund_code(file_folder, menu_code).items()}
+    existing_path = find_columnar_file(long_path_base)
+    manifest = load_manifest(manifest_path) if existing_path else {}
+    changed_codes = [fund_code for fund_code, signature in signatures.items() if manifest.get(fund_code) != signature]
+    removed_codes = [fund_code for fund_code in manifest if fund_code not in signatures]
+    kept_codes = [fund_code for fund_code in signatures if fund_code not in changed_codes]
+
+    frames = []
+    if existing_path and kept_codes:
+        panel = load_columnar(existing_path)
+        frames.append(panel[panel['fund_code'].isin(kept_codes)])
+    if changed_codes:
+        file_names_by_code = {fund_code: signatures[fund_code]['file_name'] for fund_code in changed_codes}
+        frames.extend(_load_fund_frames(file_folder, file_names_by_code, max_workers))
+    if frames:
+        panel = pd.concat(frames, ignore_index=True)
+    else:
+        panel = pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in zip(FUND_PANEL_COLUMNS, [str, 'datetime64[ns]', float, float])})
+    panel = panel.sort_values(['fund_code', 'date'], kind='stable', ignore_index=True)
+
+    if changed_codes or removed_codes or not existing_path:
+        file_path = save_columnar(panel, long_path_base)
+        if wide:
+            for value_col in ['price', 'asset']:
+                wide_panel = panel.pivot_table(index='date', columns='fund_code', values=value_col, aggfunc='last')
+                save_columnar(wide_panel, get_fund_panel_file_path_base(panel_folder, menu_code, f'wide-{value_col}'))
+        save_manifest(signatures, manifest_path)
+    else:
+        file_path = existing_path
+    logger.info('- fund panel: %d rebuilt, %d kept, %d removed -> %s', len(changed_codes), len(kept_codes), len(removed_codes), file_path)
+    return {'file_path': file_path, 'rebuilt': changed_codes, 'kept': kept_codes, 'removed': removed_codes}
+
+
+def load_fund_panel(panel_folder, fund_codes=None, start_date=None, end_date=None, columns=None, menu_code='2160', wide=False, value_col='price'):
+    """
+    Loads selected funds and dates from a consolidated fund panel without touching the per-fund files.
+
+    Args:
+        panel_folder (str): The folder of the panel files.
+        fund_codes (list, optional): The fund codes to load. Defaults to all funds.
+        start_date (str or datetime, optional): The first date to load, inclusive.
+        end_date (str or datetime, optional): The last date to load, inclusive.
+        columns (list, optional): The value columns to load ('price', 'asset'). Defaults to both.
+        menu_code (str): The menu code of the source files.
+        wide (bool): Whether to return a wide panel (dates x funds) of value_col instead of the long table.
+        value_col (str): The value column of the wide panel.
+
+    Returns:
+        pd.DataFrame: The long table (fund_code, date, values) or the wide panel.
+
+    Raises:
+        FileNotFoundError: If the panel has not been consolidated yet.
+    """
+    long_path = find_columnar_file(get_fund_panel_file_path_base(panel_folder, menu_code, 'long'))
+    if long_path is None:
+        raise FileNotFoundError(f"No fund panel in {panel_folder}; run consolidate_menu2160_panel first.")
+    value_cols = [value_col] if wide else list(columns or ['price', 'asset'])
+    filters = []
+    if fund_codes is not None:
+        filters.append(('fund_code', 'in', list(fund_codes)))
+    if start_date is not None:
+        filters.append(('date', '>=', pd.Timestamp(start_date)))
+    if end_date is not None:
+        filters.append(('date', '<=', pd.Timestamp(end_date)))
+    panel = load_columnar(long_path, columns=['fund_code', 'date'] + value_cols, filters=filters or None)
+
+    mask = np.ones(len(panel), dtype=bool)
+    if fund_codes is not None:
+        mask &= panel['fund_code'].isin(list(fund_codes)).to_numpy()
+    if start_date is not None:
+        mask &= (panel['date'] >= pd.Timestamp(start_date)).to_numpy()
+    if end_date is not None:
+        mask &= (panel['date'] <= pd.Timestamp(end_date)).to_numpy()
+    panel = panel[mask].reset_index(drop=True) if not mask.all() else panel.reset_index(drop=True)
+    if wide:
+        return panel.pivot_table(index='date', columns='fund_code', values=value_col, aggfunc='last')
+    return panel
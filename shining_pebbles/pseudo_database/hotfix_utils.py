@@ -0,0 +1,146 @@
+import os
+import logging
+import json
+import pandas as pd
+from shining_pebbles.date_utils import get_today
+from .file_scan_utils import scan_files_including_regex
+from .bundle_utils import read_file_bytes
+from .delta_utils import read_dataset_csv
+from .log_utils import log_item
+
+logger = logging.getLogger(__name__)
+
+
+class HotfixOverlay:
+    """
+    Collects hotfix rows keyed by a reference column and applies them to a DataFrame in one pass.
+
+    Rows added later replace rows added earlier with the same key, so adding corrections is O(1) per row
+    and the base DataFrame is only touched once, when the overlay is applied.
+
+    Args:
+        ref_col (str or list): The column, or columns, whose values identify the rows to correct.
+    """
+
+    def __init__(self, ref_col):
+        self.ref_col = ref_col
+        self.ref_cols = list(ref_col) if isinstance(ref_col, (list, tuple)) else [ref_col]
+        self.records = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, data):
+        """
+        Adds hotfix rows to the overlay.
+
+        Args:
+            data (list of dict, dict or pd.DataFrame): The hotfix rows. Each row must contain the ref_col columns.
+
+        Returns:
+            HotfixOverlay: The overlay itself, so that calls can be chained.
+        """
+        if isinstance(data, pd.DataFrame):
+            data = data.to_dict(orient='records')
+        elif isinstance(data, dict):
+            data = [data]
+        for datum in data:
+            self.records[tuple(datum[col] for col in self.ref_cols)] = dict(datum)
+        return self
+
+    def to_df(self):
+        """
+        Returns the collected hotfix rows as a DataFrame.
+
+        Returns:
+            pd.DataFrame: The hotfix rows, one row per key.
+        """
+        return pd.DataFrame(list(self.records.values()))
+
+    def apply(self, df, how='replace'):
+        """
+        Applies the collected hotfix rows to a DataFrame.
+
+        Args:
+            df (pd.DataFrame): The base DataFrame containing ref_col as a column.
+            how (str): 'replace' swaps whole rows like inject_hotfix_data_in_df,
+                       'update' only overwrites the cells given in the hotfix rows.
+
+        Returns:
+            pd.DataFrame: The corrected DataFrame, deduplicated and sorted by ref_col with a fresh index.
+        """
+        df_base = df.drop_duplicates(subset=self.ref_cols, keep='last')
+        if not self.records:
+            return df_base.sort_values(by=self.ref_cols).reset_index(drop=True)
+        df_hotfix = self.to_df()
+        columns = df.columns.union(df_hotfix.columns, sort=False)
+        df_base = df_base.set_index(self.ref_cols)
+        df_hotfix = df_hotfix.set_index(self.ref_cols)
+        if how == 'replace':
+            is_fixed = df_base.index.isin(df_hotfix.index)
+            df_fixed = pd.concat([df_base[~is_fixed], df_hotfix])
+        elif how == 'update':
+            df_fixed = df_hotfix.combine_first(df_base)
+        else:
+            raise ValueError("Invalid option. Please choose 'replace' or 'update'.")
+        df_fixed = df_fixed.sort_index().reset_index()
+        return df_fixed[columns]
+
+    def save(self, file_folder, subject):
+        """
+        Saves the overlay as a JSON file next to the dataset of the subject.
+
+        Args:
+            file_folder (str): The folder where the dataset is saved.
+            subject (str): The subject of the dataset.
+
+        Returns:
+            str: The path of the saved overlay file.
+        """
+        file_name = f'hotfix-{subject}-save{get_today("%Y%m%d%H")}.json'
+        file_path = os.path.join(file_folder, file_name)
+        dct = {'ref_col': self.ref_col, 'records': list(self.records.values())}
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump(dct, file, ensure_ascii=False, default=str)
+        log_item(logger, '- save complete: %s', file_path)
+        return file_path
+
+
+def load_hotfix_overlay(file_folder, subject):
+    """
+    Loads the latest hotfix overlay saved for a subject.
+
+    Args:
+        file_folder (str): The folder where the dataset is saved.
+        subject (str): The subject of the dataset.
+
+    Returns:
+        HotfixOverlay or None: The overlay, or None if no overlay file is found.
+    """
+    file_names = scan_files_including_regex(file_folder, regex=f'^hotfix-{subject}-save')
+    if not file_names:
+        return None
+    dct = json.loads(read_file_bytes(os.path.join(file_folder, file_names[-1])).decode('utf-8'))
+    return HotfixOverlay(ref_col=dct['ref_col']).add(dct['records'])
+
+
+def load_csv_with_hotfix_in_file_folder_by_regex(file_folder, regex, subject, index_col=None, how='replace'):
+    """
+    Loads the latest CSV file matching a regex pattern and applies the saved hotfix overlay of the subject.
+
+    Args:
+        file_folder (str): The folder to scan.
+        regex (str): The regex pattern to match.
+        subject (str): The subject whose hotfix overlay should be applied.
+        index_col (int, optional): The column to use as the row labels of the DataFrame.
+        how (str): How to apply the overlay ('replace' or 'update').
+
+    Returns:
+        pd.DataFrame: The loaded DataFrame with the corrections applied.
+    """
+    file_name = scan_files_including_regex(file_folder, regex)[-1]
+    df = read_dataset_csv(os.path.join(file_folder, file_name), index_col=index_col)
+    overlay = load_hotfix_overlay(file_folder, subject)
+    if overlay is None:
+        return df
+    return overlay.apply(df, how=how)
@@ -0,0 +1,124 @@
+import os
+import logging
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+IO_COUNTERS = ('dir_entries', 'files_opened', 'bytes_read', 'bytes_written', 'files_deleted', 'files_moved')
+
+
+class IOAccount:
+    """
+    The I/O of a job: directory entries read, files opened, bytes read and written, files deleted and moved,
+    in total and per folder.
+
+    Args:
+        label (str, optional): The job label used in reports.
+    """
+
+    def __init__(self, label=None):
+        self.label = label
+        self.totals = dict.fromkeys(IO_COUNTERS, 0)
+        self.folders = {}
+        self.start_time = time.perf_counter()
+        self.seconds = None
+
+    def __repr__(self):
+        return f"IOAccount({self.label!r}, {self.totals})"
+
+    def add(self, file_folder, counts):
+        folder_counts = self.folders.get(file_folder)
+        if folder_counts is None:
+            folder_counts = self.folders[file_folder] = dict.fromkeys(IO_COUNTERS, 0)
+        for counter, value in counts.items():
+            self.totals[counter] += value
+            folder_counts[counter] += value
+
+    def summary(self):
+        """
+        Returns the totals and the per-folder breakdown, busiest folder first.
+
+        Returns:
+            dict: The label, elapsed seconds, totals and per-folder counters.
+        """
+        folders = sorted(self.folders.items(), key=lambda item: -(item[1]['bytes_read'] + item[1]['bytes_written'] + item[1]['dir_entries']))
+        seconds = self.seconds if self.seconds is not None else time.perf_counter() - self.start_time
+        return {'label': self.label, 'seconds': seconds, 'totals': dict(self.totals), 'folders': dict(folders)}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.summary(), ensure_ascii=False, indent=indent)
+
+    def report(self):
+        """
+        Returns a human-readable report of the totals and of each folder.
+
+        Returns:
+            str: The report.
+        """
+        def describe(counts):
+            return ', '.join(f'{counter}={value}' for counter, value in counts.items() if value)
+
+        summary = self.summary()
+        lines = [f"- io accounting{f' [{self.label}]' if self.label else ''}: {describe(summary['totals']) or 'no io'} in {summary['seconds']:.3f}s"]
+        lines.extend(f"  {file_folder}: {describe(counts)}" for file_folder, counts in summary['folders'].items())
+        return '\n'.join(lines)
+
+
+_ACTIVE_ACCOUNTS = []
+
+_ACCOUNTS_LOCK = threading.Lock()
+
+
+def record_io(file_path=None, file_folder=None, **counts):
+    """
+    Adds I/O counts to every active IOAccount. Does nothing (one list check) when no account is active.
+
+    Args:
+        file_path (str, optional): The file the I/O is about; its folder is used.
+        file_folder (str, optional): The folder the I/O is about, instead of file_path.
+        **counts: The counters to add, among IO_COUNTERS.
+    """
+    if not _ACTIVE_ACCOUNTS:
+        return
+    if file_folder is None:
+        file_folder = os.path.dirname(file_path) if file_path is not None else ''
+    file_folder = file_folder.rstrip('/') or '.'
+    with _ACCOUNTS_LOCK:
+        for account in _ACTIVE_ACCOUNTS:
+            account.add(file_folder, counts)
+
+
+@contextmanager
+def io_accounting(label=None, report=True):
+    """
+    Accounts the I/O of the scanners, loaders, savers, movers and deleters of this package inside a `with` block.
+
+    Accounts can be nested; the I/O of every thread of the process is counted. At exit the totals and the
+    per-folder breakdown are logged (unless report is False) and stay available on the yielded account.
+
+    Example:
+        with io_accounting('nightly-menu2160') as account:
+            ...
+        account.summary()
+
+    Args:
+        label (str, optional): The job label.
+        report (bool): Whether to log the report at exit.
+
+    Yields:
+        IOAccount: The account.
+    """
+    account = IOAccount(label)
+    with _ACCOUNTS_LOCK:
+        _ACTIVE_ACCOUNTS.append(account)
+    try:
+        yield account
+    finally:
+        with _ACCOUNTS_LOCK:
+            _ACTIVE_ACCOUNTS.remove(account)
+        account.seconds = time.perf_counter() - account.start_time
+        if report:
+            logger.info('%s', account.report())
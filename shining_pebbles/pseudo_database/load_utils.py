@@ -1,27 +1,46 @@
 from .file_scan_utils import scan_files_including_regex
+from .delta_utils import read_dataset_csv
+from .bundle_utils import read_file_bytes
+from .storage_utils import get_local_path
+from .io_accounting_utils import record_io
+from .save_version_utils import get_save_version_index, resolve_file_name_as_of
+from .metrics_utils import instrument
 import os
 import json
 import pandas as pd
 from pathlib import Path
 from typing import List, Optional
 
-def load_csv_in_file_folder_by_regex(file_folder, regex, index_col=0):
-    file_name = scan_files_including_regex(file_folder, regex)[-1]
+@instrument(tag='load')
+def load_csv_in_file_folder_by_regex(file_folder, regex, index_col=0, as_of=None):
+    if as_of is None:
+        file_name = scan_files_including_regex(file_folder, regex)[-1]
+    else:
+        file_name = resolve_file_name_as_of(file_folder, regex, as_of)
     file_path = os.path.join(file_folder, file_name)
-    df = pd.read_csv(file_path, index_col=index_col)
+    df = read_dataset_csv(file_path, index_col=index_col)
     return df
 
-def load_json_in_file_folder_by_regex(file_folder, regex, index=-1):
-    file_name = scan_files_including_regex(file_folder, regex)[index]
+@instrument(tag='load')
+def load_json_in_file_folder_by_regex(file_folder, regex, index=-1, as_of=None):
+    if as_of is None:
+        file_name = scan_files_including_regex(file_folder, regex)[index]
+    else:
+        file_name = resolve_file_name_as_of(file_folder, regex, as_of)
     file_path = os.path.join(file_folder, file_name)
-    with open(file_path, 'r', encoding='utf-8') as file:
-        dct = json.load(file)
+    dct = json.loads(read_file_bytes(file_path).decode('utf-8'))
     return dct
 
-def load_xlsx_in_file_folder_by_regex(file_folder, regex):
-    file_name = scan_files_including_regex(file_folder, regex)[-1]
+@instrument(tag='load')
+def load_xlsx_in_file_folder_by_regex(file_folder, regex, as_of=None):
+    if as_of is None:
+        file_name = scan_files_including_regex(file_folder, regex)[-1]
+    else:
+        file_name = resolve_file_name_as_of(file_folder, regex, as_of)
     file_path = os.path.join(file_folder, file_name)
-    df = pd.read_excel(file_path)
+    local_path = get_local_path(file_path)
+    record_io(file_path, files_opened=1, bytes_read=os.path.getsize(local_path))
+    df = pd.read_excel(local_path)
     return df
 
 def load_single_file(file_path: str, file_type: Optional[str] = None) -> pd.DataFrame:
@@ -59,3 +78,27 @@ def load_file_to_dataframe(
     file_type: Optional[str] = None
 ) -> pd.DataFrame:
     return load_single_file(file_path, file_type)
+
+@instrument(tag='load')
+def load_dataset_of_subject_at(file_folder, subject, input_date, as_of=None, index_col=0):
+    """
+    Loads the 'dataset-{subject}-at{YYYYMMDD}' file, optionally as it was saved at or before a timestamp.
+
+    Args:
+        file_folder (str): The folder where the dataset is saved.
+        subject (str): The subject of the dataset.
+        input_date (str): The date of the dataset, as 'YYYY-MM-DD' or 'YYYYMMDD'.
+        as_of (str or datetime, optional): The as-of timestamp, e.g. '2024010309'. Defaults to the newest save.
+        index_col (int, optional): The column to use as the row labels of the DataFrame.
+
+    Returns:
+        pd.DataFrame: The loaded DataFrame.
+
+    Raises:
+        FileNotFoundError: If no version was saved at or before as_of.
+    """
+    prefix = f'dataset-{subject}-at{input_date.replace("-", "")}'
+    file_name = get_save_version_index(file_folder).resolve(prefix, '.csv', as_of)
+    if file_name is None:
+        raise FileNotFoundError(f"No {prefix} file saved at or before {as_of} in {file_folder}")
+    return read_dataset_csv(os.path.join(file_folder, file_name), index_col=index_col)
@@ -0,0 +1,179 @@
+import os
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+from .storage_utils import is_remote_path, get_storage_backend
+from .io_accounting_utils import record_io
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+LOCK_FOLDER_NAME = '.locks'
+
+TEMP_FOLDER_NAME = '.tmp'
+
+LOCK_POLL_INTERVAL = 0.05
+
+_UMASK_LOCK = threading.Lock()
+
+
+def _read_umask_from_proc():
+    try:
+        with open('/proc/self/status', 'r', encoding='ascii') as file:
+            for line in file:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _probe_umask():
+    with _UMASK_LOCK:
+        umask = os.umask(0)
+        os.umask(umask)
+    return umask
+
+
+_UMASK = _probe_umask() if _read_umask_from_proc() is None else None
+
+
+def _get_default_file_mode():
+    umask = _read_umask_from_proc()
+    return 0o666 & ~(_UMASK if umask is None else umask)
+
+
+def get_lock_file_path(file_folder, subject):
+    """
+    Returns the path of the advisory lock file of a subject in a folder.
+
+    Args:
+        file_folder (str): The dataset folder.
+        subject (str): The subject of the dataset.
+
+    Returns:
+        str: The lock file path, '{file_folder}/.locks/{subject}.lock'.
+    """
+    return os.path.join(file_folder, LOCK_FOLDER_NAME, f'{subject}.lock')
+
+
+@contextmanager
+def dataset_lock(file_folder, subject, shared=False, timeout=None):
+    """
+    Holds a cross-process advisory lock on a (folder, subject) pair.
+
+    Writers of different subjects never block each other. The lock uses fcntl.flock, so it is released
+    when the process dies. On platforms without fcntl and for 's3://' folders it is a no-op and only
+    the atomic writes apply (object puts are atomic).
+
+    Args:
+        file_folder (str): The dataset folder.
+        subject (str): The subject of the dataset.
+        shared (bool): Whether to take a shared (reader) lock instead of an exclusive (writer) lock.
+        timeout (float, optional): The seconds to wait for the lock. Defaults to waiting indefinitely.
+
+    Yields:
+        str: The lock file path.
+
+    Raises:
+        TimeoutError: If the lock could not be acquired within timeout seconds.
+    """
+    lock_file_path = get_lock_file_path(file_folder, subject)
+    if fcntl is None or is_remote_path(file_folder):
+        yield lock_file_path
+        return
+    os.makedirs(os.path.dirname(lock_file_path), exist_ok=True)
+    operation = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+    with open(lock_file_path, 'a') as lock_file:
+        if timeout is None:
+            fcntl.flock(lock_file.fileno(), operation)
+        else:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(lock_file.fileno(), operation | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"Could not lock {subject} in {file_folder} within {timeout} seconds")
+                    time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield lock_file_path
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def get_temp_file_path(file_path):
+    """
+    Returns a unique temporary path for writing a file before renaming it into place.
+
+    The temporary file lives in a '.tmp' subfolder of the destination folder, so it is on the same file system
+    (the rename is atomic) and never matches the scans of the folder itself. It gets the mode of the file it
+    replaces, or the mode open() would give a new file under the umask, instead of the private mode of mkstemp.
+
+    Args:
+        file_path (str): The destination file path.
+
+    Returns:
+        str: The temporary file path.
+    """
+    temp_folder = os.path.join(os.path.dirname(file_path) or '.', TEMP_FOLDER_NAME)
+    os.makedirs(temp_folder, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(prefix=f'{os.path.basename(file_path)}.', dir=temp_folder)
+    os.close(file_descriptor)
+    try:
+        mode = os.stat(file_path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = _get_default_file_mode()
+    os.chmod(temp_path, mode)
+    return temp_path
+
+
+@contextmanager
+def atomic_write_path(file_path):
+    """
+    Yields a temporary path to write to, and renames it over file_path only if the block succeeds.
+
+    Readers see either the old file or the complete new file, never a partial one.
+    For 's3://' paths the temporary file is local and is uploaded on success.
+
+    Args:
+        file_path (str): The destination file path.
+
+    Yields:
+        str: The temporary path to write to.
+    """
+    if is_remote_path(file_path):
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=os.path.splitext(file_path)[1])
+        os.close(file_descriptor)
+    else:
+        temp_path = get_temp_file_path(file_path)
+    try:
+        yield temp_path
+        bytes_written = os.path.getsize(temp_path)
+        get_storage_backend(file_path).upload_file(temp_path, file_path)
+        record_io(file_path, files_opened=1, bytes_written=bytes_written)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def write_csv_atomically(df, file_path, **kwargs):
+    """
+    Writes a DataFrame to a CSV file through a temporary file and an atomic rename.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to write.
+        file_path (str): The destination file path.
+        **kwargs: Further arguments passed to DataFrame.to_csv.
+
+    Returns:
+        str: The destination file path.
+    """
+    with atomic_write_path(file_path) as temp_path:
+        df.to_csv(temp_path, **kwargs)
+    return file_path
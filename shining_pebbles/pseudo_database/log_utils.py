@@ -0,0 +1,176 @@
+import os
+import sys
+import json
+import logging
+from contextlib import contextmanager
+
+LOGGER_NAME = 'shining_pebbles'
+
+LOG_LEVEL_ENV = 'SHINING_PEBBLES_LOG_LEVEL'
+
+LOG_JSON_ENV = 'SHINING_PEBBLES_LOG_JSON'
+
+QUIET_ENV = 'SHINING_PEBBLES_QUIET'
+
+_STANDARD_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats log records as one JSON object per line, including the fields passed with `extra=`.
+    """
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        payload.update({key: value for key, value in vars(record).items() if key not in _STANDARD_RECORD_FIELDS})
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """
+    Writes to the current sys.stdout, so redirections made after import are followed.
+    """
+
+    def emit(self, record):
+        self.stream = sys.stdout
+        super().emit(record)
+
+
+def _is_application_configured():
+    return bool(logging.getLogger().handlers)
+
+
+logger = logging.getLogger(LOGGER_NAME)
+
+_FALLBACK_HANDLER = _StdoutHandler()
+
+_FALLBACK_HANDLER.setFormatter(logging.Formatter('%(message)s'))
+
+_FALLBACK_HANDLER.addFilter(lambda record: not _is_application_configured())
+
+logger.addHandler(_FALLBACK_HANDLER)
+
+if logger.level == logging.NOTSET:
+    logger.setLevel(logging.INFO)
+
+_DEFAULT_HANDLER = None
+
+_QUIET = os.environ.get(QUIET_ENV, '').lower() in ('1', 'true', 'on')
+
+
+def configure_logging(level=None, json_format=None, stream=None, propagate=False):
+    """
+    Configures the package logger 'shining_pebbles'. Until this is called (or SHINING_PEBBLES_LOG_LEVEL or
+    SHINING_PEBBLES_LOG_JSON is set), messages, warnings, errors and timings are printed to stdout as long as the
+    application has not configured logging. Once the root logger has handlers, the records only propagate to them;
+    the package logger stays at INFO unless its level is set, e.g. logging.getLogger('shining_pebbles').setLevel(
+    logging.WARNING). Calling this replaces that fallback.
+
+    By default this logs the messages at INFO level to stdout, without decoration, the way they used to be printed.
+
+    Args:
+        level (str or int, optional): The level. Defaults to $SHINING_PEBBLES_LOG_LEVEL or 'INFO'.
+        json_format (bool, optional): Whether to log JSON records. Defaults to $SHINING_PEBBLES_LOG_JSON.
+        stream (optional): The stream of the handler. Defaults to stdout.
+        propagate (bool): Whether to pass records on to the root logger. With True and stream=None, no handler
+                          of the package is installed and the application's logging configuration applies.
+
+    Returns:
+        logging.Logger: The package logger.
+    """
+    global _DEFAULT_HANDLER
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV, 'INFO')
+    if json_format is None:
+        json_format = os.environ.get(LOG_JSON_ENV, '').lower() in ('1', 'true', 'on')
+    logger.removeHandler(_FALLBACK_HANDLER)
+    if _DEFAULT_HANDLER is not None:
+        logger.removeHandler(_DEFAULT_HANDLER)
+        _DEFAULT_HANDLER = None
+    if not propagate or stream is not None:
+        _DEFAULT_HANDLER = logging.StreamHandler(stream or sys.stdout)
+        _DEFAULT_HANDLER.setFormatter(JsonFormatter() if json_format else logging.Formatter('%(message)s'))
+        logger.addHandler(_DEFAULT_HANDLER)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = propagate
+    return logger
+
+
+def is_quiet():
+    """
+    Checks whether quiet (batch) mode is on.
+
+    Returns:
+        bool: True in quiet mode.
+    """
+    return _QUIET
+
+
+def set_quiet(quiet=True):
+    """
+    Switches quiet (batch) mode on or off. It can also be switched on with SHINING_PEBBLES_QUIET=1.
+
+    In quiet mode, the per-file messages of the savers, movers, deleters and folder helpers are logged at DEBUG
+    instead of INFO, and bulk operations log one summary instead.
+
+    Args:
+        quiet (bool): Whether quiet mode is on.
+    """
+    global _QUIET
+    _QUIET = quiet
+
+
+@contextmanager
+def quiet_mode(quiet=True):
+    """
+    Switches quiet (batch) mode on (or off) inside a `with` block.
+
+    Args:
+        quiet (bool): Whether quiet mode is on inside the block.
+    """
+    previous = _QUIET
+    set_quiet(quiet)
+    try:
+        yield
+    finally:
+        set_quiet(previous)
+
+
+def log_item(item_logger, message, *args, **kwargs):
+    """
+    Logs a per-file message: at INFO level, or at DEBUG level in quiet mode. Formatting is lazy.
+
+    Args:
+        item_logger (logging.Logger): The module logger.
+        message (str): The %-style message.
+        *args: The message arguments.
+        **kwargs: Further arguments of Logger.log, e.g. extra.
+    """
+    level = logging.DEBUG if _QUIET else logging.INFO
+    if item_logger.isEnabledFor(level):
+        item_logger.log(level, message, *args, **kwargs)
+
+
+def log_summary(item_logger, message, *args, **kwargs):
+    """
+    Logs the summary of a bulk operation, only in quiet mode (otherwise its per-file messages were logged).
+
+    Args:
+        item_logger (logging.Logger): The module logger.
+        message (str): The %-style message.
+        *args: The message arguments.
+        **kwargs: Further arguments of Logger.log, e.g. extra.
+    """
+    if _QUIET:
+        item_logger.info(message, *args, **kwargs)
+
+
+if os.environ.get(LOG_LEVEL_ENV) or os.environ.get(LOG_JSON_ENV):
+    configure_logging()
@@ -0,0 +1,155 @@
+import os
+import re
+import pickle
+import hashlib
+import inspect
+import functools
+import pandas as pd
+from .file_scan_utils import scan_files_including_regex
+from .bundle_utils import get_file_stat, read_file_bytes
+from .columnar_utils import save_columnar, find_columnar_file, load_columnar
+from .lock_utils import atomic_write_path
+from .storage_utils import ReadThroughCache, STORAGE_CACHE_FOLDER
+
+MEMO_CACHE_FOLDER = os.environ.get('SHINING_PEBBLES_MEMO_FOLDER', os.path.join(STORAGE_CACHE_FOLDER, 'memo'))
+
+MEMO_CACHE_MAX_BYTES = int(os.environ.get('SHINING_PEBBLES_MEMO_MAX_BYTES', 1024 ** 3))
+
+
+def get_file_fingerprint(file_path, hash_contents=False):
+    """
+    Returns the fingerprint of a file: its size and modification time, and optionally a hash of its contents.
+
+    Args:
+        file_path (str): The file path.
+        hash_contents (bool): Whether to add the SHA-256 of the contents, for files rewritten with the same size and mtime.
+
+    Returns:
+        tuple: The file path, size, modification time and hash (or None).
+    """
+    stat = get_file_stat(file_path)
+    digest = hashlib.sha256(read_file_bytes(file_path)).hexdigest() if hash_contents else None
+    return file_path, stat['size'], stat['mtime_ns'], digest
+
+
+def _resolve(value, arguments):
+    if isinstance(value, str) and value in arguments:
+        return arguments[value]
+    if callable(value):
+        return value(arguments)
+    return value
+
+
+def _get_input_file_paths(files, folder, regex, arguments):
+    file_paths = _resolve(files, arguments) or []
+    if isinstance(file_paths, (str, os.PathLike)):
+        file_paths = [file_paths]
+    file_paths = [str(file_path) for file_path in file_paths]
+    if folder is not None:
+        file_folder = _resolve(folder, arguments)
+        file_paths.extend(scan_files_including_regex(file_folder, _resolve(regex, arguments) or '', option='path'))
+    return file_paths
+
+
+def _canonicalize(value):
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted(((_canonicalize(key), _canonicalize(item)) for key, item in value.items()), key=repr)))
+    if isinstance(value, (set, frozenset)):
+        return ('set', tuple(sorted((_canonicalize(item) for item in value), key=repr)))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_canonicalize(item) for item in value))
+    return value
+
+
+def _hash_arguments(arguments):
+    arguments = _canonicalize(arguments)
+    try:
+        return hashlib.sha256(pickle.dumps(arguments, protocol=4)).hexdigest()
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return hashlib.sha256(repr(arguments).encode('utf-8')).hexdigest()
+
+
+def cached_by_files(files=None, folder=None, regex=None, hash_contents=False, cache_folder=None, max_bytes=None, version=None):
+    """
+    A decorator that persists the result of a function and reuses it while its input files and arguments are unchanged.
+
+    The cache key combines the function, the call arguments (with sets and dicts in sorted order, so equal arguments
+    give the same key in every process) and the fingerprint (see get_file_fingerprint) of every
+    input file. Input files are given by files and/or folder and regex; each of these may be a literal value, the name
+    of a parameter of the decorated function (its argument is used), or a callable taking the dict of bound arguments.
+    DataFrame results are stored as columnar files and other results as pickles, in a cache folder kept under a size
+    budget by evicting the least recently used entries. Entries are named after the module and qualified name of the
+    function. If an input file cannot be fingerprinted (e.g. it is missing), the function is called uncached, so the
+    caller sees the function's own error.
+
+    Example:
+        @cached_by_files(folder='file_folder', regex='regex')
+        def load_preprocessed(file_folder, regex):
+            ...
+
+    Args:
+        files (str, list or callable, optional): The input file paths.
+        folder (str or callable, optional): A folder whose files matching regex are inputs.
+        regex (str or callable, optional): The regex of the input files in folder. Defaults to every file.
+        hash_contents (bool): Whether to fingerprint input files by content hash as well as size and mtime.
+        cache_folder (str, optional): The cache folder. Defaults to $SHINING_PEBBLES_MEMO_FOLDER or ~/.cache/shining_pebbles/memo.
+        max_bytes (int, optional): The size budget. Defaults to $SHINING_PEBBLES_MEMO_MAX_BYTES or 1 GiB.
+        version (str, optional): A version to bump when the function logic changes, invalidating its old entries.
+
+    Returns:
+        callable: The decorator. Decorated functions also get cache_key(*args, **kwargs) and cache_clear().
+    """
+    cache_folder = cache_folder or MEMO_CACHE_FOLDER
+    cache = ReadThroughCache(cache_folder, MEMO_CACHE_MAX_BYTES if max_bytes is None else max_bytes)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        name = f'{func.__module__}.{func.__qualname__}'
+        file_prefix = re.sub(r'[^\w.]', '_', name) + '-'
+
+        def cache_key(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            fingerprints = [get_file_fingerprint(file_path, hash_contents) for file_path in _get_input_file_paths(files, folder, regex, arguments)]
+            return _hash_arguments((name, version, arguments, fingerprints))[:40]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                key = cache_key(*args, **kwargs)
+            except OSError:
+                return func(*args, **kwargs)
+            file_path_base = os.path.join(cache_folder, f'{file_prefix}{key}')
+            file_path = find_columnar_file(file_path_base)
+            if file_path is not None:
+                try:
+                    os.utime(file_path)
+                    return load_columnar(file_path)
+                except (OSError, EOFError, pickle.UnpicklingError):
+                    pass
+            result = func(*args, **kwargs)
+            os.makedirs(cache_folder, exist_ok=True)
+            saved = False
+            if isinstance(result, pd.DataFrame):
+                try:
+                    save_columnar(result, file_path_base)
+                    saved = True
+                except (ValueError, TypeError):
+                    pass
+            if not saved:
+                with atomic_write_path(f'{file_path_base}.pkl') as temp_path:
+                    pd.to_pickle(result, temp_path)
+            cache.evict()
+            return result
+
+        def cache_clear():
+            if os.path.isdir(cache_folder):
+                for file_name in os.listdir(cache_folder):
+                    if file_name.startswith(file_prefix):
+                        os.remove(os.path.join(cache_folder, file_name))
+
+        wrapper.cache_key = cache_key
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
@@ -0,0 +1,274 @@
+import os
+import json
+import time
+import threading
+import functools
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+
+METRICS_ENV = 'SHINING_PEBBLES_METRICS'
+
+HISTOGRAM_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+_HISTOGRAM_BUCKETS_NS = [int(bucket * 1e9) for bucket in HISTOGRAM_BUCKETS]
+
+
+class FunctionMetrics:
+    """
+    The aggregated calls of one function (or block) under one tag: count, latency total, extremes and histogram.
+
+    Args:
+        name (str): The function or block name.
+        tag (str, optional): The tag, e.g. 'scan', 'load', 'save' or 'merge'.
+    """
+
+    def __init__(self, name, tag=None):
+        self.name = name
+        self.tag = tag
+        self.count = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self.memory_bytes = 0
+
+    def __repr__(self):
+        return f"FunctionMetrics({self.name!r}, tag={self.tag!r}, count={self.count}, total={self.total_ns / 1e9:.6f}s)"
+
+    def add(self, duration_ns, error=False, memory_bytes=None):
+        self.count += 1
+        self.errors += error
+        self.total_ns += duration_ns
+        self.min_ns = duration_ns if self.min_ns is None else min(self.min_ns, duration_ns)
+        self.max_ns = max(self.max_ns, duration_ns)
+        self.buckets[bisect_left(_HISTOGRAM_BUCKETS_NS, duration_ns)] += 1
+        if memory_bytes is not None:
+            self.memory_bytes += memory_bytes
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'tag': self.tag,
+            'count': self.count,
+            'errors': self.errors,
+            'total_seconds': self.total_ns / 1e9,
+            'mean_seconds': self.total_ns / self.count / 1e9 if self.count else 0.0,
+            'min_seconds': (self.min_ns or 0) / 1e9,
+            'max_seconds': self.max_ns / 1e9,
+            'histogram': dict(zip([str(bucket) for bucket in HISTOGRAM_BUCKETS] + ['+Inf'], self.buckets)),
+            'memory_bytes': self.memory_bytes,
+        }
+
+
+class MetricsRegistry:
+    """
+    A thread-safe registry of FunctionMetrics keyed by (name, tag), exportable to JSON and Prometheus text.
+
+    Recording is switched off unless the registry is enabled, by enable_metrics() or by setting the
+    SHINING_PEBBLES_METRICS environment variable to '1' (or 'memory' to also record tracemalloc memory deltas).
+    """
+
+    def __init__(self):
+        setting = os.environ.get(METRICS_ENV, '').lower()
+        self.enabled = setting in ('1', 'true', 'on', 'memory')
+        self.track_memory = setting == 'memory'
+        self.metrics = {}
+        self._lock = threading.Lock()
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def __repr__(self):
+        return f"MetricsRegistry(enabled={self.enabled}, {len(self.metrics)} metrics)"
+
+    def record(self, name, duration_ns, tag=None, error=False, memory_bytes=None):
+        """
+        Records one call.
+
+        Args:
+            name (str): The function or block name.
+            duration_ns (int): The duration in nanoseconds.
+            tag (str, optional): The tag.
+            error (bool): Whether the call raised.
+            memory_bytes (int, optional): The traced memory delta of the call.
+        """
+        with self._lock:
+            metrics = self.metrics.get((name, tag))
+            if metrics is None:
+                metrics = self.metrics[(name, tag)] = FunctionMetrics(name, tag)
+            metrics.add(duration_ns, error, memory_bytes)
+
+    def reset(self):
+        with self._lock:
+            self.metrics.clear()
+
+    def summary(self, by='function'):
+        """
+        Returns the recorded metrics, per function (and tag) or aggregated per tag.
+
+        Args:
+            by (str): 'function' or 'tag'.
+
+        Returns:
+            list: One dict per function or tag, slowest total first.
+        """
+        with self._lock:
+            metrics = list(self.metrics.values())
+        if by == 'tag':
+            by_tag = {}
+            for function_metrics in metrics:
+                aggregate = by_tag.setdefault(function_metrics.tag, FunctionMetrics(function_metrics.tag, function_metrics.tag))
+                aggregate.count += function_metrics.count
+                aggregate.errors += function_metrics.errors
+                aggregate.total_ns += function_metrics.total_ns
+                aggregate.min_ns = function_metrics.min_ns if aggregate.min_ns is None else min(aggregate.min_ns, function_metrics.min_ns)
+                aggregate.max_ns = max(aggregate.max_ns, function_metrics.max_ns)
+                aggregate.buckets = [a + b for a, b in zip(aggregate.buckets, function_metrics.buckets)]
+                aggregate.memory_bytes += function_metrics.memory_bytes
+            metrics = list(by_tag.values())
+        return sorted((function_metrics.to_dict() for function_metrics in metrics), key=lambda dct: -dct['total_seconds'])
+
+    def to_json(self, indent=2):
+        return json.dumps({'functions': self.summary('function'), 'tags': self.summary('tag')}, ensure_ascii=False, indent=indent)
+
+    def to_prometheus(self, prefix='shining_pebbles'):
+        """
+        Returns the metrics in the Prometheus text exposition format, as one latency histogram per function and tag.
+
+        Args:
+            prefix (str): The metric name prefix.
+
+        Returns:
+            str: The exposition text.
+        """
+        metric = f'{prefix}_call_duration_seconds'
+        lines = [f'# HELP {metric} Call latency of instrumented functions.', f'# TYPE {metric} histogram']
+        with self._lock:
+            metrics = sorted(self.metrics.values(), key=lambda function_metrics: (function_metrics.name, function_metrics.tag or ''))
+        for function_metrics in metrics:
+            labels = f'function="{function_metrics.name}",tag="{function_metrics.tag or ""}"'
+            cumulative = 0
+            for bucket, count in zip([str(bucket) for bucket in HISTOGRAM_BUCKETS] + ['+Inf'], function_metrics.buckets):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{labels},le="{bucket}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{{labels}}} {function_metrics.total_ns / 1e9}')
+            lines.append(f'{metric}_count{{{labels}}} {function_metrics.count}')
+        lines.append(f'# TYPE {prefix}_call_errors_total counter')
+        for function_metrics in metrics:
+            lines.append(f'{prefix}_call_errors_total{{function="{function_metrics.name}",tag="{function_metrics.tag or ""}"}} {function_metrics.errors}')
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = MetricsRegistry()
+
+
+def enable_metrics(track_memory=False):
+    """
+    Switches metrics recording on.
+
+    Args:
+        track_memory (bool): Whether to also record memory deltas with tracemalloc (slows down traced code).
+    """
+    METRICS.enabled = True
+    METRICS.track_memory = track_memory
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable_metrics():
+    """
+    Switches metrics recording off. Recorded metrics are kept until reset_metrics().
+    """
+    METRICS.enabled = False
+    METRICS.track_memory = False
+
+
+def reset_metrics():
+    """
+    Drops every recorded metric.
+    """
+    METRICS.reset()
+
+
+def get_metrics(by='function'):
+    """
+    Returns the recorded metrics (see MetricsRegistry.summary).
+
+    Args:
+        by (str): 'function' or 'tag'.
+
+    Returns:
+        list: One dict per function or tag.
+    """
+    return METRICS.summary(by)
+
+
+def export_metrics(file_path=None, form='json'):
+    """
+    Exports the recorded metrics as JSON or Prometheus text.
+
+    Args:
+        file_path (str, optional): The file to write. Defaults to only returning the text.
+        form (str): 'json' or 'prometheus'.
+
+    Returns:
+        str: The exported text.
+    """
+    text = METRICS.to_prometheus() if form == 'prometheus' else METRICS.to_json()
+    if file_path is not None:
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(text)
+    return text
+
+
+@contextmanager
+def measure_block(name, tag=None):
+    """
+    Records the duration of a block of code as a metric, when metrics are enabled.
+
+    Args:
+        name (str): The block name.
+        tag (str, optional): The tag.
+    """
+    if not METRICS.enabled:
+        yield
+        return
+    memory_start = tracemalloc.get_traced_memory()[0] if METRICS.track_memory else None
+    error = False
+    start_ns = time.perf_counter_ns()
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        duration_ns = time.perf_counter_ns() - start_ns
+        memory_bytes = tracemalloc.get_traced_memory()[0] - memory_start if memory_start is not None else None
+        METRICS.record(name, duration_ns, tag, error, memory_bytes)
+
+
+def instrument(tag=None, name=None):
+    """
+    A decorator that records the calls of a function as metrics, when metrics are enabled.
+
+    While metrics are disabled, the only overhead is one attribute check per call.
+
+    Args:
+        tag (str, optional): The tag, e.g. 'scan', 'load', 'save' or 'merge'.
+        name (str, optional): The metric name. Defaults to the qualified name of the function.
+
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(func):
+        metric_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+            with measure_block(metric_name, tag):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+from .file_control_utils import convert_to_unit, format_number
+
+UNITS_BY_LANGUAGE = {
+    'KR': [
+        (10**12, '조'),
+        (10**8, '억'),
+        (10**4, '만'),
+        (1, ''),
+    ],
+    'EN': [
+        (10**12, 'T'),
+        (10**9, 'B'),
+        (10**6, 'M'),
+        (10**3, 'K'),
+        (1, ''),
+    ],
+}
+
+_MAX_EXACT_FLOAT_INTEGER = 2**53
+
+_GROUP_LABELS = np.arange(1000).astype('<U3')
+
+_GROUP_LABELS_PADDED = np.char.zfill(_GROUP_LABELS, 3)
+
+_format_number_ufunc = np.frompyfunc(format_number, 1, 1)
+
+
+def _wrap_like(values, numbers):
+    if isinstance(numbers, pd.Series):
+        return pd.Series(values, index=numbers.index, name=numbers.name)
+    return values
+
+
+def _get_count_labels(counts, unit_name, max_table_size=100000):
+    max_count = counts.max(initial=0)
+    digits = f'<U{len(str(max_count))}'
+    if max_count < max_table_size:
+        labels = np.char.add(np.arange(max_count + 1).astype(digits), unit_name)
+        labels[0] = ''
+        return labels[counts]
+    return np.where(counts > 0, np.char.add(counts.astype(digits), unit_name), '')
+
+
+def convert_to_unit_vectorized(numbers, language='KR', level=None):
+    """
+    Converts numbers to unit strings such as '1조 2345억' or '1T 234B' in bulk.
+
+    The unit decomposition is done with NumPy integer arithmetic and the result is identical
+    to applying convert_to_unit element by element.
+
+    Args:
+        numbers (pd.Series, np.ndarray or list): The numbers or number strings with thousands separators.
+        language (str): 'KR' for 조/억/만 units, anything else for T/B/M/K units.
+        level (int, optional): The number of leading units to use. Defaults to all units.
+
+    Returns:
+        pd.Series or np.ndarray: The unit strings, with NaN inputs passed through unchanged.
+    """
+    series = numbers if isinstance(numbers, pd.Series) else pd.Series(np.asarray(numbers, dtype=object))
+    raw = series.to_numpy(dtype=object)
+    if pd.api.types.is_numeric_dtype(series):
+        is_na = series.isna().to_numpy()
+        values = series.astype(float).to_numpy()
+    else:
+        is_na = (series.isna() | series.eq('NaN')).to_numpy()
+        values = series.where(~is_na).astype(str).str.replace(',', '', regex=False).astype(float).to_numpy()
+    values = np.abs(np.where(is_na, 0.0, values))
+
+    units = UNITS_BY_LANGUAGE['KR' if language.upper() == 'KR' else 'EN']
+    units = units[:len(units) if level is None else level]
+
+    is_exact = values < _MAX_EXACT_FLOAT_INTEGER
+    remainders = np.floor(np.where(is_exact, values, 0.0)).astype(np.int64)
+    result = np.zeros(len(values), dtype='<U1')
+    for unit_value, unit_name in units:
+        counts, remainders = np.divmod(remainders, unit_value)
+        result = np.where((counts > 0) & (result != ''), np.char.add(result, ' '), result)
+        result = np.char.add(result, _get_count_labels(counts, unit_name))
+    result = np.where(result == '', '0', result).astype(object)
+
+    is_fallback = ~is_exact & ~is_na
+    if is_fallback.any():
+        result[is_fallback] = [convert_to_unit(number, language=language, level=level) for number in raw[is_fallback]]
+    result[is_na] = raw[is_na]
+    return _wrap_like(result, numbers)
+
+
+def _format_integers_with_commas(magnitudes, is_negative):
+    magnitudes = magnitudes.astype(np.uint64)
+    groups, rest = np.divmod(magnitudes, np.uint64(1000))
+    result = np.where(groups > 0, _GROUP_LABELS_PADDED[rest], _GROUP_LABELS[rest])
+    while (groups > 0).any():
+        has_group = groups > 0
+        groups, rest = np.divmod(groups, np.uint64(1000))
+        labels = np.char.add(np.where(groups > 0, _GROUP_LABELS_PADDED[rest], _GROUP_LABELS[rest]), ',')
+        result = np.where(has_group, np.char.add(labels, result), result)
+    return np.where(is_negative, np.char.add('-', result), result)
+
+
+def format_number_vectorized(numbers):
+    """
+    Formats numbers with thousands separators in bulk, identical to applying format_number element by element.
+
+    Integer and integral float values are grouped with NumPy integer arithmetic. Other floats need
+    their shortest repr, which cannot be computed arithmetically, so they go through format_number.
+
+    Args:
+        numbers (pd.Series, np.ndarray or list): The integer or float numbers.
+
+    Returns:
+        pd.Series or np.ndarray: The formatted number strings.
+    """
+    series = numbers if isinstance(numbers, pd.Series) else pd.Series(np.asarray(numbers))
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        raise ValueError("Input numbers must be of an integer or float dtype.")
+    values = series.to_numpy()
+    if pd.api.types.is_integer_dtype(values.dtype):
+        if pd.api.types.is_unsigned_integer_dtype(values.dtype):
+            result = _format_integers_with_commas(values, np.zeros(len(values), dtype=bool))
+        else:
+            result = _format_integers_with_commas(np.where(values < 0, -values, values), values < 0)
+        return _wrap_like(result.astype(object), numbers)
+
+    values = values.astype(float)
+    with np.errstate(invalid='ignore'):
+        magnitudes = np.abs(values)
+        is_integral = (magnitudes < _MAX_EXACT_FLOAT_INTEGER) & (np.trunc(magnitudes) == magnitudes)
+    integer_parts = np.where(is_integral, magnitudes, 0.0)
+    result = np.char.add(_format_integers_with_commas(integer_parts, np.signbit(values)), '.0').astype(object)
+    if not is_integral.all():
+        result[~is_integral] = _format_number_ufunc(values[~is_integral])
+    return _wrap_like(result, numbers)
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+NUMERIC_UNIT_MULTIPLIERS = {
+    '조': 1e12,
+    '억': 1e8,
+    '만': 1e4,
+    '천': 1e3,
+}
+
+NUMERIC_NA_TOKENS = ['', '-', 'nan', 'NaN', 'None', 'N/A', 'n/a']
+
+NEGATIVE_MARKERS = ['-', '△', '▲']
+
+_REGEX_PLAIN_NUMBER = r'(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+_REGEX_UNIT_NUMBER = r'(?:\d+(?:\.\d+)?[조억만천])+(?:\d+(?:\.\d+)?)?'
+_REGEX_UNIT_PART = r'(\d+(?:\.\d+)?)([조억만천]?)'
+
+
+def parse_numeric_series(series, percent_as_ratio=False):
+    """
+    Parses a Series of Korean financial number strings into floats without element-wise Python calls.
+
+    Handles thousands separators, '-' and blank as NaN, parenthesized negatives, the negative markers
+    '△' and '▲', a trailing '%' and unit suffixes such as '억' and '만' (e.g. '1조 2,345억').
+
+    Args:
+        series (pd.Series): The Series to parse.
+        percent_as_ratio (bool): Whether to divide values with a trailing '%' by 100.
+
+    Returns:
+        tuple: The parsed float Series and a Series of the raw values that failed to parse.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float), series.iloc[:0]
+
+    raw = series.reset_index(drop=True)
+    text = raw.astype(str).str.replace(',', '', regex=False).str.strip()
+    is_na = raw.isna() | text.isin(NUMERIC_NA_TOKENS)
+    text = text.mask(is_na, 'nan')
+    try:
+        values = text.astype(float)
+    except ValueError:
+        values = pd.to_numeric(text, errors='coerce').astype(float)
+
+    is_rest = values.isna() & ~is_na
+    is_failed = pd.Series(False, index=raw.index)
+    if is_rest.any():
+        values[is_rest], is_failed[is_rest] = _parse_formatted_numeric_text(text[is_rest], percent_as_ratio)
+    values.index = series.index
+    return values.rename(series.name), series[is_failed.to_numpy()]
+
+
+def _parse_formatted_numeric_text(text, percent_as_ratio=False):
+    text = text.str.replace(r'\s', '', regex=True)
+    is_paren = text.str.startswith('(') & text.str.endswith(')')
+    text = text.where(~is_paren, text.str.slice(1, -1))
+    is_negative = text.str.slice(0, 1).isin(NEGATIVE_MARKERS)
+    text = text.where(~(is_negative | text.str.startswith('+')), text.str.slice(1))
+    is_percent = text.str.endswith('%')
+    text = text.where(~is_percent, text.str.slice(0, -1))
+
+    is_plain = text.str.fullmatch(_REGEX_PLAIN_NUMBER)
+    is_unit = text.str.fullmatch(_REGEX_UNIT_NUMBER)
+
+    values = pd.Series(np.nan, index=text.index, dtype=float)
+    values[is_plain] = text[is_plain].astype(float)
+    if is_unit.any():
+        parts = text[is_unit].str.extractall(_REGEX_UNIT_PART)
+        multipliers = parts[1].map(NUMERIC_UNIT_MULTIPLIERS).fillna(1.0)
+        amounts = (parts[0].astype(float) * multipliers).groupby(level=0).sum()
+        values[amounts.index] = amounts
+
+    values = values.where(~(is_negative ^ is_paren), -values)
+    if percent_as_ratio:
+        values = values.where(~is_percent, values / 100)
+    return values, ~is_plain & ~is_unit
+
+
+def parse_numeric_columns(df, columns=None, percent_as_ratio=False):
+    """
+    Parses the given columns of a DataFrame into floats and reports the values that failed to parse.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to parse.
+        columns (list, optional): The columns to parse. Defaults to all object or string columns.
+        percent_as_ratio (bool): Whether to divide values with a trailing '%' by 100.
+
+    Returns:
+        tuple: The DataFrame with parsed columns and a dictionary mapping each column
+               with failures to a Series of its unparsable raw values.
+    """
+    if columns is None:
+        columns = [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col])]
+    parsed = {}
+    failures = {}
+    for col in columns:
+        parsed[col], failed = parse_numeric_series(df[col], percent_as_ratio=percent_as_ratio)
+        if not failed.empty:
+            failures[col] = failed
+    df = df.copy()
+    for col, values in parsed.items():
+        df[col] = values
+    return df, failures
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+from shining_pebbles.date_utils.date_array_utils import to_datetime64_array, get_month_end_date_array
+from shining_pebbles.date_utils.business_calendar_utils import get_business_day_calendar
+
+
+def build_price_panel(price_dfs, date_col='date', price_col='price'):
+    """
+    Builds a price panel (dates x funds) from per-fund price time series.
+
+    Args:
+        price_dfs (dict): The price DataFrames keyed by fund code, e.g. from preprocess_menu2160_in_batch.
+        date_col (str): The date column name.
+        price_col (str): The price column name.
+
+    Returns:
+        pd.DataFrame: The panel with a sorted DatetimeIndex and one column per fund.
+    """
+    fund_codes = list(price_dfs.keys())
+    if not fund_codes:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name=date_col))
+    lengths = [len(price_dfs[fund_code]) for fund_code in fund_codes]
+    dates = to_datetime64_array(np.concatenate([np.asarray(price_dfs[fund_code][date_col]) for fund_code in fund_codes]))
+    prices = np.concatenate([price_dfs[fund_code][price_col].to_numpy(dtype=float) for fund_code in fund_codes])
+    columns = np.repeat(np.arange(len(fund_codes)), lengths)
+    unique_dates, rows = np.unique(dates, return_inverse=True)
+    values = np.full((len(unique_dates), len(fund_codes)), np.nan)
+    values[rows, columns] = prices
+    return pd.DataFrame(values, index=pd.DatetimeIndex(unique_dates, name=date_col), columns=fund_codes)
+
+
+def _get_period_bounds(boundaries):
+    boundaries = list(boundaries)
+    if boundaries and isinstance(boundaries[0], (tuple, list)):
+        starts, ends = zip(*boundaries)
+        return to_datetime64_array(list(starts)), to_datetime64_array(list(ends))
+    dates = to_datetime64_array(boundaries)
+    return dates[:-1], dates[1:]
+
+
+def _take_as_of(values, dates, targets):
+    positions = np.searchsorted(dates, targets, side='right') - 1
+    prices = values[np.maximum(positions, 0)]
+    prices[positions < 0] = np.nan
+    return prices
+
+
+def compute_period_returns(price_panel, boundaries, snap_to_business_days=False):
+    """
+    Computes the returns of every fund over every period in one vectorized pass.
+
+    Each boundary is aligned as-of: the last available price on or before the boundary date is used.
+
+    Args:
+        price_panel (pd.DataFrame): The price panel (dates x funds), e.g. from build_price_panel.
+        boundaries (list): The period boundaries, either consecutive dates (e.g. month ends)
+                           or (start_date, end_date) pairs (e.g. from get_end_date_pairs).
+        snap_to_business_days (bool): Whether to roll the boundaries back to business days of the KRX calendar first.
+                                      Boundaries outside the years of the holiday file raise a ValueError.
+
+    Returns:
+        pd.DataFrame: The returns (funds x periods), with (start_date, end_date) column labels.
+                      NaN where a fund has no price on or before a boundary.
+    """
+    starts, ends = _get_period_bounds(boundaries)
+    if snap_to_business_days and len(starts):
+        calendar = get_business_day_calendar()
+        starts, ends = calendar.snap(starts), calendar.snap(ends)
+    panel = price_panel.sort_index()
+    dates = panel.index.to_numpy().astype('datetime64[D]')
+    values = panel.ffill().to_numpy(dtype=float)
+    start_prices = _take_as_of(values, dates, starts)
+    end_prices = _take_as_of(values, dates, ends)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = end_prices / start_prices - 1
+    columns = pd.MultiIndex.from_arrays([pd.DatetimeIndex(starts), pd.DatetimeIndex(ends)], names=['start_date', 'end_date'])
+    return pd.DataFrame(returns.T, index=panel.columns, columns=columns)
+
+
+def compute_monthly_returns(price_panel, start_year_month, end_year_month, snap_to_business_days=False):
+    """
+    Computes the monthly returns of every fund between two year-months.
+
+    Args:
+        price_panel (pd.DataFrame): The price panel (dates x funds), e.g. from build_price_panel.
+        start_year_month (str): The start year-month in the format 'YYYYMM'. Its month end is the first boundary.
+        end_year_month (str): The end year-month in the format 'YYYYMM'.
+        snap_to_business_days (bool): Whether to roll the month ends back to business days of the KRX calendar first.
+
+    Returns:
+        pd.DataFrame: The monthly returns (funds x months), with (start_date, end_date) column labels.
+    """
+    month_ends = get_month_end_date_array(start_year_month, end_year_month)
+    return compute_period_returns(price_panel, month_ends, snap_to_business_days=snap_to_business_days)
@@ -0,0 +1,131 @@
+import logging
+import numpy as np
+import pandas as pd
+from .number_parsing_utils import parse_numeric_series
+
+logger = logging.getLogger(__name__)
+
+
+class PreprocessPipeline:
+    """
+    A declarative preprocessing pipeline that selects, drops NaN, renames and parses columns in one pass.
+
+    The steps always run in the order select -> drop NaN -> rename -> parse numerics -> parse dates -> set index,
+    and are fused so that every output column is materialized exactly once.
+
+    Args:
+        columns (dict or list): The columns to select, as a mapping of original to new names or a list of names.
+        dropna (bool): Whether to drop rows with NaN in any selected column.
+        numeric_cols (list, optional): The (new) column names to parse into floats.
+        date_cols (list, optional): The (new) column names to parse into datetimes.
+        date_format (str, optional): The format of the date columns, e.g. '%Y-%m-%d'.
+        index_col (str, optional): The (new) column name to use as the index. Defaults to a fresh RangeIndex.
+    """
+
+    def __init__(self, columns, dropna=True, numeric_cols=None, date_cols=None, date_format=None, index_col=None):
+        self.columns = dict(columns) if isinstance(columns, dict) else {col: col for col in columns}
+        self.dropna = dropna
+        self.numeric_cols = list(numeric_cols or [])
+        self.date_cols = list(date_cols or [])
+        self.date_format = date_format
+        self.index_col = index_col
+
+    def __repr__(self):
+        return (f"PreprocessPipeline(columns={self.columns}, dropna={self.dropna}, numeric_cols={self.numeric_cols}, "
+                f"date_cols={self.date_cols}, date_format={self.date_format!r}, index_col={self.index_col!r})")
+
+    def _get_mask(self, df):
+        if not self.dropna:
+            return None
+        mask = df[list(self.columns)].notna().to_numpy().all(axis=1)
+        return None if mask.all() else mask
+
+    def _build_column(self, values, col_to):
+        if col_to in self.numeric_cols:
+            values, failures = parse_numeric_series(pd.Series(values))
+            if not failures.empty:
+                logger.warning('- %d values of %s could not be parsed: %s', len(failures), col_to, failures.unique()[:5].tolist())
+            return values.to_numpy()
+        if col_to in self.date_cols:
+            return pd.to_datetime(values, format=self.date_format).to_numpy()
+        return values
+
+    def _run(self, df, mask):
+        data = {}
+        for col_from, col_to in self.columns.items():
+            values = df[col_from].to_numpy()
+            values = values[mask] if mask is not None else values.copy()
+            data[col_to] = self._build_column(values, col_to)
+        if self.index_col is None:
+            return pd.DataFrame(data, copy=False)
+        index = pd.Index(data.pop(self.index_col), name=self.index_col)
+        return pd.DataFrame(data, index=index, copy=False)
+
+    def run(self, df):
+        """
+        Applies the pipeline to a DataFrame.
+
+        Args:
+            df (pd.DataFrame): The original DataFrame.
+
+        Returns:
+            pd.DataFrame: The preprocessed DataFrame.
+        """
+        return self._run(df, self._get_mask(df))
+
+    def run_many(self, dfs):
+        """
+        Applies the pipeline to many DataFrames at once, parsing all of their rows in a single pass.
+
+        Args:
+            dfs (dict or list): The original DataFrames, e.g. keyed by fund code.
+
+        Returns:
+            dict or list: The preprocessed DataFrames, in the same container type as the input.
+        """
+        keys = list(dfs.keys()) if isinstance(dfs, dict) else list(range(len(dfs)))
+        frames = [dfs[key][list(self.columns)] for key in keys]
+        if not frames:
+            return {} if isinstance(dfs, dict) else []
+        groups = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+        df = pd.concat(frames, ignore_index=True)
+        mask = self._get_mask(df)
+        if mask is not None:
+            groups = groups[mask]
+        df = self._run(df, mask)
+        bounds = np.searchsorted(groups, np.arange(len(frames) + 1))
+        results = []
+        for i in range(len(frames)):
+            result = df.iloc[bounds[i]:bounds[i + 1]]
+            results.append(result.reset_index(drop=True) if self.index_col is None else result)
+        return dict(zip(keys, results)) if isinstance(dfs, dict) else results
+
+
+MENU2160_PRICE_PIPELINE = PreprocessPipeline(
+    columns={'일자': 'date', '수정\n기준가': 'price'},
+    numeric_cols=['price'],
+)
+
+MENU2160_ASSET_PIPELINE = PreprocessPipeline(
+    columns={'일자': 'date', '순자산총액': 'asset'},
+    numeric_cols=['asset'],
+)
+
+MENU2160_PRICE_AND_ASSET_PIPELINE = PreprocessPipeline(
+    columns={'일자': 'date', '수정\n기준가': 'price', '순자산총액': 'asset'},
+    numeric_cols=['price', 'asset'],
+)
+
+
+def preprocess_menu2160_in_batch(dfs_menu2160, pipeline=MENU2160_PRICE_AND_ASSET_PIPELINE):
+    """
+    Preprocesses many menu 2160 DataFrames in one batch call.
+
+    Args:
+        dfs_menu2160 (dict or list): The original DataFrames, e.g. keyed by fund code.
+        pipeline (PreprocessPipeline): The preset to apply. Defaults to date, price and asset columns.
+
+    Returns:
+        dict or list: The preprocessed DataFrames, in the same container type as the input.
+    """
+    return pipeline.run_many(dfs_menu2160)
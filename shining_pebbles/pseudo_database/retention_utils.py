@@ -0,0 +1,229 @@
+import os
+import logging
+import re
+import time
+import numpy as np
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from .save_version_utils import SAVE_VERSION_PATTERN, get_save_version
+from .delta_utils import get_delta_base_paths
+from .io_accounting_utils import record_io
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DATE_PATTERN = re.compile(r'-(?:at|to)(?P<date>\d{8})$')
+
+
+class RetentionPolicy:
+    """
+    A retention policy applied to every group of saved files.
+
+    Files are grouped into series by their name without the date and save parts (e.g. 'dataset-{subject}' or
+    'menu2160-code{fund_code}', so each fund is its own series), and each series into snapshots by the 'at' or 'to'
+    date in the name (or the save date if there is none). Merged '-updated' files are saves of their snapshot.
+
+    Args:
+        keep_saves (int): The number of newest saves to keep for each snapshot.
+        keep_snapshots (int, optional): The number of newest snapshots to keep for each series.
+                                        If None and no other snapshot rule is set, all snapshots are kept.
+        keep_month_ends (bool): Whether to keep the last snapshot of every month.
+        gfs (tuple, optional): Grandfather-father-son counts (days, weeks, months): the newest snapshot of each
+                               of the last `days` days, `weeks` ISO weeks and `months` months is kept.
+    """
+
+    def __init__(self, keep_saves=10, keep_snapshots=None, keep_month_ends=False, gfs=None):
+        self.keep_saves = keep_saves
+        self.keep_snapshots = keep_snapshots
+        self.keep_month_ends = keep_month_ends
+        self.gfs = gfs
+
+    def __repr__(self):
+        return (f"RetentionPolicy(keep_saves={self.keep_saves}, keep_snapshots={self.keep_snapshots}, "
+                f"keep_month_ends={self.keep_month_ends}, gfs={self.gfs})")
+
+    @property
+    def prunes_snapshots(self):
+        return self.keep_snapshots is not None or self.keep_month_ends or self.gfs is not None
+
+    def select_snapshots(self, dates, reference_date):
+        """
+        Selects the snapshots of a series to keep.
+
+        Args:
+            dates (np.ndarray): The sorted, unique snapshot dates of the series as datetime64[D].
+            reference_date (np.datetime64): The date the ages of the snapshots are measured from.
+
+        Returns:
+            np.ndarray: A boolean array, True for the snapshots to keep.
+        """
+        if not self.prunes_snapshots:
+            return np.ones(len(dates), dtype=bool)
+        keep = np.zeros(len(dates), dtype=bool)
+        if self.keep_snapshots:
+            keep[-self.keep_snapshots:] = True
+        months = dates.astype('datetime64[M]')
+        is_last_of_month = np.append(months[1:] != months[:-1], True)
+        if self.keep_month_ends:
+            keep |= is_last_of_month
+        if self.gfs is not None:
+            days, weeks, months_count = self.gfs
+            weeks_of_dates = (dates - np.datetime64('1970-01-05')).astype(np.int64) // 7
+            is_last_of_week = np.append(weeks_of_dates[1:] != weeks_of_dates[:-1], True)
+            ages = (reference_date - dates).astype(np.int64)
+            keep |= ages < days
+            keep |= is_last_of_week & (ages < 7 * weeks)
+            age_in_months = (reference_date.astype('datetime64[M]') - months).astype(np.int64)
+            keep |= is_last_of_month & (age_in_months < months_count)
+        return keep
+
+
+class RetentionPlan:
+    """
+    The files to keep and delete in a folder under a retention policy, computed without touching any file.
+
+    Args:
+        file_folder (str): The folder.
+        keep (list): The file names to keep.
+        delete (list): The file names to delete.
+        sizes (dict): The file sizes keyed by file name.
+    """
+
+    def __init__(self, file_folder, keep, delete, sizes):
+        self.file_folder = file_folder
+        self.keep = keep
+        self.delete = delete
+        self.sizes = sizes
+
+    def __repr__(self):
+        return f"RetentionPlan({self.file_folder!r}, keep={len(self.keep)}, delete={len(self.delete)}, bytes={self.bytes_to_delete})"
+
+    @property
+    def bytes_to_delete(self):
+        return sum(self.sizes[file_name] for file_name in self.delete)
+
+    def summary(self):
+        """
+        Returns a summary of the plan.
+
+        Returns:
+            dict: The numbers of files to keep and delete and the bytes to free.
+        """
+        return {'file_folder': self.file_folder, 'keep': len(self.keep), 'delete': len(self.delete), 'bytes': self.bytes_to_delete}
+
+
+def plan_retention(file_folder, policy=None, regex=None, reference_date=None):
+    """
+    Plans which saved files in a folder to delete under a retention policy, in a single scan of the folder.
+
+    Files without a save{timestamp} part are never deleted, and neither are the base files that kept
+    delta-encoded snapshots depend on.
+
+    Args:
+        file_folder (str): The folder.
+        policy (RetentionPolicy, optional): The policy. Defaults to keeping the 10 newest saves of every snapshot.
+        regex (str, optional): Only files matching this regex are considered.
+        reference_date (str or datetime, optional): The date snapshot ages are measured from. Defaults to today.
+
+    Returns:
+        RetentionPlan: The dry-run plan.
+    """
+    policy = policy or RetentionPolicy()
+    reference_date = np.datetime64(reference_date or datetime.now(), 'D')
+    pattern = re.compile(regex) if regex else None
+    series = {}
+    sizes = {}
+    dir_entries = 0
+    with os.scandir(file_folder) as files:
+        for file in files:
+            dir_entries += 1
+            if not file.is_file() or (pattern and not pattern.search(file.name)):
+                continue
+            match = SAVE_VERSION_PATTERN.match(file.name)
+            if not match:
+                continue
+            sizes[file.name] = file.stat().st_size
+            save = get_save_version(match)
+            date_match = SNAPSHOT_DATE_PATTERN.search(match.group('prefix'))
+            if date_match:
+                series_key = (match.group('prefix')[:date_match.start()], match.group('suffix'))
+                date = date_match.group('date')
+            else:
+                series_key = (match.group('prefix'), match.group('suffix'))
+                date = save[0][:8]
+            series.setdefault(series_key, {}).setdefault(date, []).append((save, file.name))
+    record_io(file_folder=file_folder, dir_entries=dir_entries)
+
+    keep, delete = [], []
+    for snapshots in series.values():
+        dates = sorted(snapshots)
+        kept_snapshots = policy.select_snapshots(np.array([f'{d[:4]}-{d[4:6]}-{d[6:]}' for d in dates], dtype='datetime64[D]'), reference_date)
+        for date, is_kept in zip(dates, kept_snapshots):
+            versions = [file_name for _, file_name in sorted(snapshots[date])]
+            if not is_kept:
+                delete.extend(versions)
+            elif policy.keep_saves and len(versions) > policy.keep_saves:
+                delete.extend(versions[:-policy.keep_saves])
+                keep.extend(versions[-policy.keep_saves:])
+            else:
+                keep.extend(versions)
+
+    protected = {os.path.basename(base_path) for base_path in get_delta_base_paths([os.path.join(file_folder, file_name) for file_name in keep])}
+    keep.extend(file_name for file_name in delete if file_name in protected)
+    delete = [file_name for file_name in delete if file_name not in protected]
+    return RetentionPlan(file_folder, sorted(keep), sorted(delete), sizes)
+
+
+def execute_retention_plan(plan, max_workers=8):
+    """
+    Deletes the files of a retention plan on a thread pool.
+
+    Args:
+        plan (RetentionPlan): The plan, e.g. from plan_retention.
+        max_workers (int): The number of threads deleting files.
+
+    Returns:
+        dict: The numbers of deleted and failed files, the freed bytes, the elapsed seconds and the errors by file name.
+    """
+    start_time = time.perf_counter()
+
+    def delete(file_name):
+        try:
+            os.remove(os.path.join(plan.file_folder, file_name))
+            record_io(file_folder=plan.file_folder, files_deleted=1)
+            return file_name, None
+        except OSError as e:
+            return file_name, str(e)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(delete, plan.delete))
+    errors = {file_name: error for file_name, error in results if error is not None}
+    summary = {
+        'deleted': len(results) - len(errors),
+        'failed': len(errors),
+        'bytes': sum(plan.sizes[file_name] for file_name, error in results if error is None),
+        'seconds': time.perf_counter() - start_time,
+        'errors': errors,
+    }
+    logger.info("- retention: %d deleted, %d failed, %d bytes freed in %s", summary['deleted'], summary['failed'], summary['bytes'], plan.file_folder)
+    return summary
+
+
+def apply_retention_policy(file_folder, policy=None, regex=None, reference_date=None, dry_run=True, max_workers=8):
+    """
+    Plans and, unless dry_run is True, executes a retention policy on a folder.
+
+    Args:
+        file_folder (str): The folder.
+        policy (RetentionPolicy, optional): The policy. Defaults to keeping the 10 newest saves of every snapshot.
+        regex (str, optional): Only files matching this regex are considered.
+        reference_date (str or datetime, optional): The date snapshot ages are measured from. Defaults to today.
+        dry_run (bool): Whether to only return the plan.
+        max_workers (int): The number of threads deleting files.
+
+    Returns:
+        RetentionPlan or dict: The plan if dry_run is True, otherwise the execution summary.
+    """
+    plan = plan_retention(file_folder, policy=policy, regex=regex, reference_date=reference_date)
+    if dry_run:
+        return plan
+    return execute_retention_plan(plan, max_workers=max_workers)
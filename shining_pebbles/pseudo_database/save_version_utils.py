@@ -0,0 +1,183 @@
+import os
+import re
+from bisect import bisect_right
+from datetime import date, datetime
+from .file_name_utils import normalize_save_timestamp
+from .bundle_utils import is_bundle_file, get_bundle_members
+from .storage_utils import is_remote_path, list_folder_names, get_folder_version
+
+SAVE_VERSION_PATTERN = re.compile(r'^(?P<prefix>.+)-save(?P<save>\d{8,14})(?P<variant>-delta|-updated)?(?P<suffix>(?:\.\w+)?)$')
+
+
+def get_save_version(match):
+    """
+    Returns the sort key of a saved file version from its SAVE_VERSION_PATTERN match.
+
+    Versions sort by normalized save timestamp; of two versions saved at the same timestamp,
+    the merged '-updated' file sorts after the downloaded one.
+
+    Args:
+        match (re.Match): The match of SAVE_VERSION_PATTERN against the file name.
+
+    Returns:
+        tuple: The normalized save timestamp and the variant rank.
+    """
+    return normalize_save_timestamp(match.group('save')), int(match.group('variant') == '-updated')
+
+
+def normalize_as_of(as_of):
+    """
+    Converts an as-of timestamp to a 14-digit 'YYYYMMDDHHMMSS' string comparable with normalized save timestamps.
+
+    A partial timestamp covers its whole period: '20240103' means the end of that day and '2024010309' the end of 9 o'clock.
+
+    Args:
+        as_of (str, date or datetime): The as-of timestamp, e.g. '2024010309', '2024-01-03 09:00' or a datetime.
+
+    Returns:
+        str: The normalized timestamp.
+    """
+    if isinstance(as_of, datetime):
+        return as_of.strftime('%Y%m%d%H%M%S')
+    if isinstance(as_of, date):
+        return as_of.strftime('%Y%m%d') + '235959'
+    digits = re.sub(r'\D', '', str(as_of))
+    return digits[:14].ljust(14, '9')
+
+
+class SaveVersionIndex:
+    """
+    A sorted in-memory index of the save{timestamp} versions of the files in a folder.
+
+    Files are grouped by their name without the save part (e.g. 'dataset-{subject}-at{YYYYMMDD}' and '.csv';
+    delta-encoded '-delta.csv' and merged '-updated.csv' files belong to the same group),
+    and each group keeps its versions sorted by normalized save timestamp, so resolving a version is a binary search.
+    Members of archive bundles are indexed like loose files.
+
+    Args:
+        file_folder (str): The folder to index.
+    """
+
+    def __init__(self, file_folder):
+        self.file_folder = file_folder
+        self.folder_version = get_folder_version(file_folder)
+        file_names = list_folder_names(file_folder)
+        bundle_names = [file_name for file_name in file_names if is_bundle_file(file_name)]
+        if bundle_names:
+            file_names = set(file_names).union(get_bundle_members(file_folder, bundle_names))
+        groups = {}
+        for file_name in file_names:
+            match = SAVE_VERSION_PATTERN.match(file_name)
+            if match:
+                key = (match.group('prefix'), match.group('suffix'))
+                groups.setdefault(key, []).append((*get_save_version(match), file_name))
+        self.versions = {key: sorted(versions) for key, versions in groups.items()}
+        self.saves = {key: [save for save, _, _ in versions] for key, versions in self.versions.items()}
+        self._regex_versions = {}
+
+    def __repr__(self):
+        return f"SaveVersionIndex({self.file_folder!r}, {len(self.versions)} files, {sum(map(len, self.versions.values()))} versions)"
+
+    def is_stale(self):
+        """
+        Checks whether the folder changed since the index was built.
+
+        Returns:
+            bool: True if the folder modification time (or, for 's3://' folders, the cached listing) differs from the indexed one.
+        """
+        return get_folder_version(self.file_folder) != self.folder_version
+
+    @staticmethod
+    def _pick(saves, versions, as_of):
+        if not versions:
+            return None
+        if as_of is None:
+            return versions[-1][-1]
+        position = bisect_right(saves, normalize_as_of(as_of))
+        return versions[position - 1][-1] if position else None
+
+    def resolve(self, prefix, suffix='.csv', as_of=None):
+        """
+        Returns the newest version of a file saved at or before a timestamp.
+
+        Args:
+            prefix (str): The file name without the save part, e.g. 'dataset-holdings-at20240103'.
+            suffix (str): The file extension, e.g. '.csv'.
+            as_of (str or datetime, optional): The as-of timestamp. Defaults to the newest version.
+
+        Returns:
+            str or None: The file name, or None if no version was saved at or before as_of.
+        """
+        key = (prefix, suffix)
+        return self._pick(self.saves.get(key, []), self.versions.get(key, []), as_of)
+
+    def resolve_regex(self, regex, as_of=None):
+        """
+        Returns the newest version, saved at or before a timestamp, of the latest file matching a regex.
+
+        Like picking the last of the matching file names, the file is the lexically latest group
+        (e.g. the latest 'at' date of a subject) that has a version saved at or before as_of;
+        the version is then resolved within that group. The matching groups of each regex are collected once per index.
+
+        Args:
+            regex (str): The regex pattern to match against file names.
+            as_of (str or datetime, optional): The as-of timestamp. Defaults to the newest version.
+
+        Returns:
+            str or None: The file name, or None if no matching version was saved at or before as_of.
+        """
+        if regex not in self._regex_versions:
+            pattern = re.compile(regex)
+            groups = []
+            for key in sorted(self.versions, reverse=True):
+                versions = [version for version in self.versions[key] if pattern.search(version[-1])]
+                if versions:
+                    groups.append(([save for save, _, _ in versions], versions))
+            self._regex_versions[regex] = groups
+        for saves, versions in self._regex_versions[regex]:
+            file_name = self._pick(saves, versions, as_of)
+            if file_name is not None:
+                return file_name
+        return None
+
+
+_SAVE_VERSION_INDEXES = {}
+
+
+def get_save_version_index(file_folder):
+    """
+    Returns the cached save-version index of a folder, rebuilding it when the folder has changed.
+
+    Args:
+        file_folder (str): The folder to index.
+
+    Returns:
+        SaveVersionIndex: The index.
+    """
+    key = file_folder.rstrip('/') if is_remote_path(file_folder) else os.path.abspath(file_folder)
+    index = _SAVE_VERSION_INDEXES.get(key)
+    if index is None or index.is_stale():
+        index = SaveVersionIndex(file_folder)
+        _SAVE_VERSION_INDEXES[key] = index
+    return index
+
+
+def resolve_file_name_as_of(file_folder, regex, as_of):
+    """
+    Returns the newest file matching a regex that was saved at or before a timestamp.
+
+    Args:
+        file_folder (str): The folder to search.
+        regex (str): The regex pattern to match against file names.
+        as_of (str or datetime): The as-of timestamp, e.g. '2024010309'.
+
+    Returns:
+        str: The file name.
+
+    Raises:
+        FileNotFoundError: If no matching file was saved at or before as_of.
+    """
+    file_name = get_save_version_index(file_folder).resolve_regex(regex, as_of)
+    if file_name is None:
+        raise FileNotFoundError(f"No file matching '{regex}' saved at or before {as_of} in {file_folder}")
+    return file_name
@@ -0,0 +1,242 @@
+import os
+import atexit
+import secrets
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+SHARED_MEMORY_ALIGNMENT = 64
+
+SHARED_FRAME_NAME_PREFIX = 'sp-frame-'
+
+
+def _is_shareable(values):
+    return isinstance(values, np.ndarray) and (values.dtype.kind in 'biufcmM')
+
+
+def _attach_block(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedFrameSpec:
+    """
+    A small, picklable description of a DataFrame published in a shared memory block.
+
+    It is what gets sent to worker processes instead of the data: the block name, and the dtype, shape and
+    offset of every column (and of the index) in the block. Columns and indexes that are not numeric or
+    datetime-like cannot be shared and are carried in the spec itself, i.e. copied into each worker.
+
+    Args:
+        block_name (str): The name of the shared memory block.
+        size (int): The size of the block in bytes.
+        columns (list): One (name, layout) pair per column; the layout is (dtype, length, offset) for shared columns
+                        and the column values for copied ones.
+        index (tuple): The index name and layout.
+    """
+
+    def __init__(self, block_name, size, columns, index):
+        self.block_name = block_name
+        self.size = size
+        self.columns = columns
+        self.index = index
+
+    def __repr__(self):
+        return f"SharedFrameSpec({self.block_name!r}, {len(self.columns)} columns, {self.size} bytes)"
+
+
+def _get_layout_view(buffer, layout):
+    if not isinstance(layout, tuple):
+        return layout
+    dtype, length, offset = layout
+    values = np.ndarray((length,), dtype=np.dtype(dtype), buffer=buffer, offset=offset)
+    values.flags.writeable = False
+    return values
+
+
+def _build_frame(buffer, spec):
+    index_name, index_layout = spec.index
+    index = pd.Index(_get_layout_view(buffer, index_layout), name=index_name, copy=False)
+    df = pd.DataFrame({position: _get_layout_view(buffer, layout) for position, (_, layout) in enumerate(spec.columns)}, index=index, copy=False)
+    df.columns = pd.Index([name for name, _ in spec.columns])
+    return df
+
+
+class SharedFrame:
+    """
+    A DataFrame published into a shared memory block by its owner process.
+
+    Numeric and datetime columns are copied once into a single block, and other processes attach read-only,
+    zero-copy views of them by name with attach_frame. The owner frees the block with close(), when leaving a
+    `with` block, or at interpreter exit.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to publish.
+        name (str, optional): The block name. Defaults to a random 'sp-frame-...' name.
+    """
+
+    def __init__(self, df, name=None):
+        layouts = []
+        size = 0
+        index = df.index if isinstance(df.index, pd.RangeIndex) else df.index.to_numpy()
+        for values in [index, *(df.iloc[:, position].to_numpy() for position in range(df.shape[1]))]:
+            if _is_shareable(values):
+                offset = -size % SHARED_MEMORY_ALIGNMENT + size
+                values = np.ascontiguousarray(values)
+                layouts.append((values, (values.dtype.str, len(values), offset)))
+                size = offset + values.nbytes
+            else:
+                layouts.append((None, values))
+        self.block = shared_memory.SharedMemory(name=name or SHARED_FRAME_NAME_PREFIX + secrets.token_hex(8), create=True, size=max(size, 1))
+        self.owner_pid = os.getpid()
+        for values, layout in layouts:
+            if values is not None:
+                _, length, offset = layout
+                np.ndarray(values.shape, dtype=values.dtype, buffer=self.block.buf, offset=offset)[:] = values
+        (_, index_layout), *column_layouts = layouts
+        self.spec = SharedFrameSpec(self.block.name, size, [(col, layout) for col, (_, layout) in zip(df.columns, column_layouts)], (df.index.name, index_layout))
+        _PUBLISHED_FRAMES[self.block.name] = self
+
+    def __repr__(self):
+        return f"SharedFrame({self.spec.block_name!r}, {len(self.spec.columns)} columns, {self.spec.size} bytes)"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def name(self):
+        return self.spec.block_name
+
+    def to_frame(self):
+        """
+        Returns a read-only, zero-copy view of the published DataFrame in the owner process.
+
+        Returns:
+            pd.DataFrame: The view.
+        """
+        return _build_frame(self.block.buf, self.spec)
+
+    def close(self):
+        """
+        Frees the shared memory block. Views attached to it must not be used afterwards.
+        """
+        if _PUBLISHED_FRAMES.pop(self.name, None) is None:
+            return
+        try:
+            self.block.close()
+        except BufferError:
+            pass
+        if os.getpid() == self.owner_pid:
+            self.block.unlink()
+
+
+_PUBLISHED_FRAMES = {}
+
+_ATTACHED_BLOCKS = {}
+
+
+@atexit.register
+def close_shared_frames():
+    """
+    Frees every block published by this process and detaches every attached block.
+    """
+    for shared_frame in list(_PUBLISHED_FRAMES.values()):
+        try:
+            shared_frame.close()
+        except (BufferError, FileNotFoundError):
+            pass
+    for block in list(_ATTACHED_BLOCKS.values()):
+        try:
+            block.close()
+        except BufferError:
+            pass
+    _ATTACHED_BLOCKS.clear()
+
+
+def publish_frame(df, name=None):
+    """
+    Publishes a DataFrame into a shared memory block (see SharedFrame).
+
+    Args:
+        df (pd.DataFrame): The DataFrame to publish.
+        name (str, optional): The block name. Defaults to a random name.
+
+    Returns:
+        SharedFrame: The published frame; send its .spec to the workers.
+    """
+    return SharedFrame(df, name=name)
+
+
+def attach_frame(spec):
+    """
+    Attaches a read-only, zero-copy view of a DataFrame published by another process.
+
+    The block stays attached until close_shared_frames() or the exit of the process.
+
+    Args:
+        spec (SharedFrameSpec): The spec of the published frame.
+
+    Returns:
+        pd.DataFrame: The view.
+    """
+    block = _ATTACHED_BLOCKS.get(spec.block_name)
+    if block is None:
+        block = _attach_block(spec.block_name)
+        _ATTACHED_BLOCKS[spec.block_name] = block
+    return _build_frame(block.buf, spec)
+
+
+_WORKER_FRAMES = {}
+
+
+def _initialize_worker(specs):
+    _WORKER_FRAMES.update({key: attach_frame(spec) for key, spec in specs.items()})
+
+
+def _call_with_frames(func, item):
+    return func(item, **_WORKER_FRAMES)
+
+
+def get_worker_frames():
+    """
+    Returns the shared frames attached by the current worker of run_with_shared_frames.
+
+    Returns:
+        dict: The attached DataFrames keyed by their names in run_with_shared_frames.
+    """
+    return _WORKER_FRAMES
+
+
+def run_with_shared_frames(func, items, frames=None, max_workers=None):
+    """
+    Runs func(item, **frames) for every item on a process pool, sharing reference tables through shared memory.
+
+    The frames are published once; each worker attaches them once at start-up instead of reloading them or
+    receiving a pickled copy with every task. The blocks are freed when all items are done.
+
+    Args:
+        func (callable): A module-level function taking an item and the frames as keyword arguments.
+        items (iterable): The items to process.
+        frames (dict, optional): The reference DataFrames keyed by keyword name, or SharedFrame objects
+                                 already published by the caller (these are not freed).
+        max_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        list: The results, in the order of items.
+    """
+    frames = frames or {}
+    owned = {key: publish_frame(df) for key, df in frames.items() if not isinstance(df, SharedFrame)}
+    specs = {key: (owned.get(key) or frames[key]).spec for key in frames}
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_initialize_worker, initargs=(specs,)) as executor:
+            items = list(items)
+            return list(executor.map(_call_with_frames, [func] * len(items), items))
+    finally:
+        for shared_frame in owned.values():
+            shared_frame.close()
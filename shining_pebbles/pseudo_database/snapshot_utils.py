@@ -0,0 +1,82 @@
+import os
+import logging
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from .file_name_utils import get_latest_snapshot_file_names
+from .delta_utils import read_dataset_csv
+from .columnar_utils import save_columnar, find_columnar_file, load_columnar, load_manifest, save_manifest
+from .metrics_utils import instrument
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DATE_COL = 'date_ref'
+
+
+def _format_date_ref(date_ref):
+    return f'{date_ref[:4]}-{date_ref[4:6]}-{date_ref[6:]}'
+
+
+def _load_snapshot(file_folder, file_name, index_col):
+    return read_dataset_csv(os.path.join(file_folder, file_name), index_col=index_col).reset_index()
+
+
+def _stack_frames(frames, date_refs, date_col):
+    columns = []
+    for frame in frames:
+        columns.extend(col for col in frame.columns if col not in columns)
+    frames = [frame.reindex(columns=columns).assign(**{date_col: _format_date_ref(date_ref)}) for frame, date_ref in zip(frames, date_refs)]
+    return pd.concat(frames, ignore_index=True)
+
+
+@instrument(tag='merge')
+def stack_snapshots(file_folder, subject, dates=None, index_col=0, date_col=SNAPSHOT_DATE_COL, cache=True, max_workers=8):
+    """
+    Stacks the 'dataset-{subject}-at{YYYYMMDD}-save{...}' snapshots into one long table with a date column.
+
+    The newest save of each 'at' date is used. The snapshots are read in parallel and aligned to the union of their
+    columns. With cache=True, the stacked table is kept in a columnar 'stack-{subject}' file next to a manifest
+    of the source files, so later calls only read the snapshots that are new or were saved again.
+
+    Args:
+        file_folder (str): The folder of the snapshot files.
+        subject (str): The subject of the dataset.
+        dates (list, optional): The 'at' dates to stack, as 'YYYY-MM-DD' or 'YYYYMMDD'. Defaults to all dates.
+        index_col (int, optional): The column of the snapshot files to use as row labels; it is kept as a column.
+        date_col (str): The name of the added date column ('YYYY-MM-DD').
+        cache (bool): Whether to read from and update the cached stacked file.
+        max_workers (int): The number of threads reading snapshot files.
+
+    Returns:
+        pd.DataFrame: The stacked snapshots, ordered by date.
+    """
+    all_file_names = get_latest_snapshot_file_names(file_folder, subject)
+    file_names = all_file_names
+    if dates is not None:
+        wanted = {date.replace('-', '') for date in dates}
+        file_names = {date_ref: file_name for date_ref, file_name in all_file_names.items() if date_ref in wanted}
+
+    stack_path_base = os.path.join(file_folder, f'stack-{subject}')
+    manifest_path = f'{stack_path_base}-manifest.json'
+    stack_path = find_columnar_file(stack_path_base) if cache else None
+    manifest = load_manifest(manifest_path) if stack_path else {}
+    valid_dates = {date_ref for date_ref, file_name in manifest.items() if all_file_names.get(date_ref) == file_name}
+    new_dates = [date_ref for date_ref in file_names if date_ref not in valid_dates]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        new_frames = list(executor.map(lambda date_ref: _load_snapshot(file_folder, file_names[date_ref], index_col), new_dates))
+    frames = [_stack_frames(new_frames, new_dates, date_col)] if new_frames else []
+    if valid_dates:
+        cached = load_columnar(stack_path)
+        frames.insert(0, cached[cached[date_col].isin([_format_date_ref(date_ref) for date_ref in valid_dates])])
+    if not frames:
+        return pd.DataFrame(columns=[date_col])
+    stacked = pd.concat(frames, ignore_index=True).sort_values(date_col, kind='stable', ignore_index=True)
+
+    if cache and (new_dates or len(valid_dates) < len(manifest)):
+        save_columnar(stacked, stack_path_base)
+        manifest = {date_ref: all_file_names[date_ref] for date_ref in sorted(valid_dates.union(new_dates))}
+        save_manifest(manifest, manifest_path)
+        logger.info('- stack update: %d new snapshots of %s -> %s', len(new_dates), subject, stack_path_base)
+    if dates is None:
+        return stacked
+    return stacked[stacked[date_col].isin([_format_date_ref(date_ref) for date_ref in file_names])].reset_index(drop=True)
@@ -0,0 +1,412 @@
+import os
+import time
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .io_accounting_utils import record_io
+
+S3_SCHEME = 's3://'
+
+S3_ENDPOINT_URL_ENV = 'SHINING_PEBBLES_S3_ENDPOINT_URL'
+
+STORAGE_CACHE_FOLDER = os.environ.get('SHINING_PEBBLES_CACHE_FOLDER', os.path.join(os.path.expanduser('~'), '.cache', 'shining_pebbles'))
+
+STORAGE_CACHE_MAX_BYTES = int(os.environ.get('SHINING_PEBBLES_CACHE_MAX_BYTES', 2 * 1024 ** 3))
+
+LISTING_CACHE_TTL = float(os.environ.get('SHINING_PEBBLES_LISTING_CACHE_TTL', 60))
+
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def is_remote_path(path):
+    """
+    Checks whether a path is an 's3://bucket/key' object-store path.
+
+    Args:
+        path (str): The path.
+
+    Returns:
+        bool: True for object-store paths.
+    """
+    return str(path).startswith(S3_SCHEME)
+
+
+def split_s3_path(path):
+    """
+    Splits an 's3://bucket/key' path into its bucket and key.
+
+    Args:
+        path (str): The object-store path.
+
+    Returns:
+        tuple: The bucket and the key.
+    """
+    bucket, _, key = path[len(S3_SCHEME):].partition('/')
+    return bucket, key
+
+
+class ReadThroughCache:
+    """
+    A size-bounded local disk cache of downloaded objects, evicting the least recently used files first.
+
+    Entries are keyed by path and object signature (size and modification time), so a changed object
+    is downloaded again while unchanged saved files are read from disk.
+
+    Args:
+        cache_folder (str, optional): The cache folder. Defaults to $SHINING_PEBBLES_CACHE_FOLDER or ~/.cache/shining_pebbles.
+        max_bytes (int, optional): The size bound. Defaults to $SHINING_PEBBLES_CACHE_MAX_BYTES or 2 GiB.
+    """
+
+    def __init__(self, cache_folder=None, max_bytes=None):
+        self.cache_folder = cache_folder or STORAGE_CACHE_FOLDER
+        self.max_bytes = STORAGE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"ReadThroughCache({self.cache_folder!r}, max_bytes={self.max_bytes})"
+
+    def get_cache_path(self, path, signature):
+        digest = hashlib.sha256(f'{path}\n{signature}'.encode('utf-8')).hexdigest()[:40]
+        return os.path.join(self.cache_folder, f'{digest}{os.path.splitext(path)[1]}')
+
+    def fetch(self, path, signature, download):
+        """
+        Returns the local copy of an object, downloading it on a miss.
+
+        Args:
+            path (str): The object path.
+            signature (str): The object signature; a different signature is a different entry.
+            download (callable): Called with a local file path to download the object to.
+
+        Returns:
+            str: The path of the local copy.
+        """
+        cache_path = self.get_cache_path(path, signature)
+        try:
+            os.utime(cache_path)
+            return cache_path
+        except FileNotFoundError:
+            pass
+        os.makedirs(self.cache_folder, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(prefix='.download-', dir=self.cache_folder)
+        os.close(file_descriptor)
+        try:
+            download(temp_path)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict()
+        return cache_path
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            int: The number of removed entries.
+        """
+        with self._lock:
+            with os.scandir(self.cache_folder) as files:
+                entries = sorted((file.stat().st_mtime_ns, file.stat().st_size, file.path) for file in files
+                                 if file.is_file() and not file.name.startswith('.download-'))
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, cache_path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(cache_path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            return removed
+
+    def clear(self):
+        """
+        Removes every entry of the cache.
+        """
+        if os.path.isdir(self.cache_folder):
+            with os.scandir(self.cache_folder) as files:
+                for file in files:
+                    if file.is_file():
+                        os.remove(file.path)
+
+
+class LocalBackend:
+    """
+    The storage backend of local file system paths.
+    """
+
+    def __repr__(self):
+        return 'LocalBackend()'
+
+    def list_names(self, file_folder):
+        with os.scandir(file_folder) as files:
+            names = [file.name for file in files]
+        record_io(file_folder=file_folder, dir_entries=len(names))
+        return names
+
+    def get_folder_version(self, file_folder):
+        return os.stat(file_folder).st_mtime_ns
+
+    def stat(self, file_path):
+        stat = os.stat(file_path)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def exists(self, file_path):
+        return os.path.exists(file_path)
+
+    def read_bytes(self, file_path):
+        with open(file_path, 'rb') as file:
+            data = file.read()
+        record_io(file_path, files_opened=1, bytes_read=len(data))
+        return data
+
+    def get_local_path(self, file_path):
+        return file_path
+
+    def upload_file(self, local_path, file_path):
+        os.replace(local_path, file_path)
+
+    def make_folder(self, file_folder):
+        os.makedirs(file_folder, exist_ok=True)
+
+    def remove(self, file_path):
+        os.remove(file_path)
+        record_io(file_path, files_deleted=1)
+
+
+class S3Backend:
+    """
+    The storage backend of 's3://bucket/key' paths on S3 or any S3-compatible object store.
+
+    Folder listings are cached for listing_ttl seconds, and dropped whenever this backend writes or removes an object
+    of the folder, so files written through the backend are listed (and picked up by SaveVersionIndex) at once;
+    only objects written by other processes can stay hidden for up to listing_ttl seconds.
+    Reads go through a local ReadThroughCache, and large objects are transferred in parallel multipart chunks.
+
+    Args:
+        endpoint_url (str, optional): The endpoint of an S3-compatible store, e.g. 'http://localhost:9000'.
+                                      Defaults to $SHINING_PEBBLES_S3_ENDPOINT_URL, then to AWS.
+        cache (ReadThroughCache, optional): The read-through cache. Defaults to a cache with default settings.
+        listing_ttl (float): The seconds a folder listing is reused.
+        max_workers (int): The number of threads of a multipart transfer.
+        chunk_size (int): The multipart threshold and part size in bytes.
+        client (optional): A boto3 S3 client to use instead of creating one.
+    """
+
+    def __init__(self, endpoint_url=None, cache=None, listing_ttl=LISTING_CACHE_TTL, max_workers=8, chunk_size=MULTIPART_CHUNK_SIZE, client=None):
+        self.endpoint_url = endpoint_url or os.environ.get(S3_ENDPOINT_URL_ENV)
+        self.cache = cache or ReadThroughCache()
+        self.listing_ttl = listing_ttl
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._client = client
+        self._transfer_config = None
+        self._listings = {}
+        self._invalidations = 0
+        self._listing_count = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"S3Backend(endpoint_url={self.endpoint_url!r}, cache={self.cache!r})"
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+            self._client = boto3.client('s3', endpoint_url=self.endpoint_url)
+        return self._client
+
+    @property
+    def transfer_config(self):
+        if self._transfer_config is None:
+            from boto3.s3.transfer import TransferConfig
+            self._transfer_config = TransferConfig(multipart_threshold=self.chunk_size, multipart_chunksize=self.chunk_size,
+                                                   max_concurrency=self.max_workers, use_threads=True)
+        return self._transfer_config
+
+    def _get_listing(self, file_folder):
+        file_folder = file_folder.rstrip('/')
+        with self._lock:
+            listing = self._listings.get(file_folder)
+            if listing is not None and time.monotonic() - listing['time'] < self.listing_ttl:
+                return listing
+            invalidations = self._invalidations
+        bucket, prefix = split_s3_path(file_folder)
+        prefix = f'{prefix}/' if prefix else ''
+        objects = {}
+        for page in self.client.get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=prefix, Delimiter='/'):
+            for content in page.get('Contents', []):
+                name = content['Key'][len(prefix):]
+                if name:
+                    objects[name] = {
+                        'size': content['Size'],
+                        'mtime_ns': int(content['LastModified'].timestamp() * 1e9),
+                        'etag': content['ETag'].strip('"'),
+                    }
+        with self._lock:
+            self._listing_count += 1
+            record_io(file_folder=file_folder, dir_entries=len(objects))
+            listing = {'time': time.monotonic(), 'version': self._listing_count, 'objects': objects}
+            if self._invalidations == invalidations:
+                self._listings[file_folder] = listing
+        return listing
+
+    def invalidate_listing(self, file_folder=None):
+        """
+        Drops the cached listing of a folder, or of every folder. Listings still in flight are not cached.
+
+        Args:
+            file_folder (str, optional): The folder. Defaults to every folder.
+        """
+        with self._lock:
+            self._invalidations += 1
+            if file_folder is None:
+                self._listings.clear()
+            else:
+                self._listings.pop(file_folder.rstrip('/'), None)
+
+    def list_names(self, file_folder):
+        return list(self._get_listing(file_folder)['objects'])
+
+    def get_folder_version(self, file_folder):
+        return self._get_listing(file_folder)['version']
+
+    def _get_object(self, file_path):
+        file_folder, file_name = file_path.rsplit('/', 1)
+        obj = self._get_listing(file_folder)['objects'].get(file_name)
+        if obj is None:
+            raise FileNotFoundError(f"No such object: {file_path}")
+        return obj
+
+    def stat(self, file_path):
+        obj = self._get_object(file_path)
+        return {'size': obj['size'], 'mtime_ns': obj['mtime_ns']}
+
+    def exists(self, file_path):
+        try:
+            self._get_object(file_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def get_local_path(self, file_path):
+        obj = self._get_object(file_path)
+        bucket, key = split_s3_path(file_path)
+        return self.cache.fetch(file_path, f"{obj['size']}-{obj['etag']}",
+                                lambda local_path: self.client.download_file(bucket, key, local_path, Config=self.transfer_config))
+
+    def read_bytes(self, file_path):
+        with open(self.get_local_path(file_path), 'rb') as file:
+            data = file.read()
+        record_io(file_path, files_opened=1, bytes_read=len(data))
+        return data
+
+    def upload_file(self, local_path, file_path):
+        bucket, key = split_s3_path(file_path)
+        self.client.upload_file(local_path, bucket, key, Config=self.transfer_config)
+        os.remove(local_path)
+        self.invalidate_listing(file_path.rsplit('/', 1)[0])
+
+    def make_folder(self, file_folder):
+        pass
+
+    def remove(self, file_path):
+        bucket, key = split_s3_path(file_path)
+        self.client.delete_object(Bucket=bucket, Key=key)
+        record_io(file_path, files_deleted=1)
+        self.invalidate_listing(file_path.rsplit('/', 1)[0])
+
+
+_STORAGE_BACKENDS = {'local': LocalBackend()}
+
+
+def set_storage_backend(scheme, backend):
+    """
+    Sets the backend used for a path scheme, e.g. an S3Backend with a custom endpoint or cache.
+
+    Args:
+        scheme (str): 's3' or 'local'.
+        backend: The backend.
+
+    Returns:
+        The backend.
+    """
+    _STORAGE_BACKENDS[scheme] = backend
+    return backend
+
+
+def get_storage_backend(path):
+    """
+    Returns the storage backend of a path: S3Backend for 's3://' paths and LocalBackend otherwise.
+
+    Args:
+        path (str): The file or folder path.
+
+    Returns:
+        The backend.
+    """
+    if is_remote_path(path):
+        if 's3' not in _STORAGE_BACKENDS:
+            _STORAGE_BACKENDS['s3'] = S3Backend()
+        return _STORAGE_BACKENDS['s3']
+    return _STORAGE_BACKENDS['local']
+
+
+def list_folder_names(file_folder):
+    """
+    Lists the entry names of a local folder or the object names under an 's3://' prefix.
+
+    Args:
+        file_folder (str): The folder.
+
+    Returns:
+        list: The names.
+    """
+    return get_storage_backend(file_folder).list_names(file_folder)
+
+
+def get_folder_version(file_folder):
+    """
+    Returns a token that changes when a folder changes: its modification time, or the generation of its cached listing.
+
+    Args:
+        file_folder (str): The folder.
+
+    Returns:
+        int: The token.
+    """
+    return get_storage_backend(file_folder).get_folder_version(file_folder)
+
+
+def get_local_path(file_path):
+    """
+    Returns a local path of a file, downloading 's3://' objects through the read-through cache.
+
+    Args:
+        file_path (str): The file path.
+
+    Returns:
+        str: The local path.
+    """
+    return get_storage_backend(file_path).get_local_path(file_path)
+
+
+def prefetch_files(file_paths, max_workers=8):
+    """
+    Downloads many 's3://' objects into the read-through cache in parallel. Local paths are left as they are.
+
+    Args:
+        file_paths (list): The file paths.
+        max_workers (int): The number of threads downloading objects.
+
+    Returns:
+        list: The local paths, in the order of file_paths.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(get_local_path, file_paths))
@@ -0,0 +1,161 @@
+import os
+import logging
+import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from .file_scan_utils import scan_files_including_regex
+from .lock_utils import atomic_write_path
+from .delta_utils import is_delta_file, get_delta_base_paths
+from .io_accounting_utils import record_io
+
+logger = logging.getLogger(__name__)
+
+TRANSFER_OPTIONS = ('copy', 'move', 'link')
+
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def _copy_file_contents(file_path_from, file_path_to, size):
+    with open(file_path_from, 'rb') as source, open(file_path_to, 'wb') as destination:
+        for copy in (getattr(os, 'copy_file_range', None), getattr(os, 'sendfile', None)):
+            if copy is None:
+                continue
+            try:
+                offset = 0
+                while offset < size:
+                    if copy is os.sendfile:
+                        copied = copy(destination.fileno(), source.fileno(), offset, min(COPY_CHUNK_SIZE, size - offset))
+                    else:
+                        copied = copy(source.fileno(), destination.fileno(), min(COPY_CHUNK_SIZE, size - offset), offset, offset)
+                    if copied == 0:
+                        break
+                    offset += copied
+                if offset == size:
+                    return
+            except OSError:
+                pass
+            destination.seek(0)
+            destination.truncate()
+        source.seek(0)
+        shutil.copyfileobj(source, destination, COPY_CHUNK_SIZE)
+
+
+def _has_same_content(file_path_from, file_path_to):
+    with open(file_path_from, 'rb') as file_from, open(file_path_to, 'rb') as file_to:
+        while True:
+            chunk = file_from.read(COPY_CHUNK_SIZE)
+            if chunk != file_to.read(COPY_CHUNK_SIZE):
+                return False
+            if not chunk:
+                return True
+
+
+def _is_identical(stat_from, file_path_from, file_path_to):
+    try:
+        stat_to = os.stat(file_path_to)
+    except FileNotFoundError:
+        return False
+    return stat_to.st_size == stat_from.st_size and _has_same_content(file_path_from, file_path_to)
+
+
+def _copy_file(file_path_from, file_path_to, stat_from, preserve_mtime):
+    with atomic_write_path(file_path_to) as temp_path:
+        _copy_file_contents(file_path_from, temp_path, stat_from.st_size)
+        record_io(file_path_from, files_opened=1, bytes_read=stat_from.st_size)
+        os.chmod(temp_path, stat_from.st_mode & 0o7777)
+        if preserve_mtime:
+            os.utime(temp_path, ns=(stat_from.st_atime_ns, stat_from.st_mtime_ns))
+
+
+def _transfer_file(file_path_from, file_path_to, option, same_device, preserve_mtime, skip_identical):
+    stat_from = os.stat(file_path_from)
+    if skip_identical and option != 'move' and _is_identical(stat_from, file_path_from, file_path_to):
+        return 'skipped', 0
+    if option == 'move' and same_device:
+        os.replace(file_path_from, file_path_to)
+        record_io(file_path_to, files_moved=1)
+        return 'renamed', stat_from.st_size
+    if option == 'link' and same_device:
+        if os.path.lexists(file_path_to):
+            os.remove(file_path_to)
+        os.link(file_path_from, file_path_to)
+        record_io(file_path_to, files_moved=1)
+        return 'linked', stat_from.st_size
+    _copy_file(file_path_from, file_path_to, stat_from, preserve_mtime)
+    if option == 'move':
+        os.remove(file_path_from)
+        record_io(file_path_from, files_deleted=1)
+        record_io(file_path_to, files_moved=1)
+    return 'copied', stat_from.st_size
+
+
+def transfer_files(folder_from, folder_to, regex=None, file_names=None, option='copy', max_workers=8, preserve_mtime=True, skip_identical=True):
+    """
+    Copies, moves or hard-links many files from one folder to another on a thread pool.
+
+    On the same device, moves are renames and links are hard links. Other copies go through the kernel
+    (os.copy_file_range, then os.sendfile) and fall back to a buffered copy. Copies are written to a temporary
+    file first and renamed into place.
+
+    Delta-encoded snapshots stay readable on both sides: the bases they depend on are transferred with them,
+    and a base that deltas left in folder_from still depend on is copied instead of moved.
+
+    Args:
+        folder_from (str): The source folder.
+        folder_to (str): The destination folder.
+        regex (str, optional): The regex pattern of the files to transfer.
+        file_names (list, optional): The names of the files to transfer, instead of a regex.
+        option (str): 'copy', 'move' or 'link' (hard link, copying across devices).
+        max_workers (int): The number of threads transferring files.
+        preserve_mtime (bool): Whether copies keep the modification time of their source.
+        skip_identical (bool): Whether to skip files whose destination already has the same content, compared
+                               byte by byte. Moves are never skipped.
+
+    Returns:
+        dict: The numbers of transferred, skipped and failed files, the bytes transferred, the elapsed seconds,
+              the throughput in MB/s, the counts by method and the errors by file name.
+    """
+    if option not in TRANSFER_OPTIONS:
+        raise ValueError(f"Invalid option. Please choose one of {TRANSFER_OPTIONS}.")
+    if file_names is None:
+        file_names = scan_files_including_regex(file_folder=folder_from, regex=regex or '', include_bundles=False)
+    options = dict.fromkeys(file_names, option)
+    for base_path in get_delta_base_paths([os.path.join(folder_from, file_name) for file_name in file_names]):
+        if os.path.basename(base_path) not in options and os.path.exists(base_path):
+            options[os.path.basename(base_path)] = 'copy' if option == 'move' else option
+    if option == 'move':
+        remaining_deltas = [os.path.join(folder_from, file_name) for file_name in os.listdir(folder_from)
+                            if is_delta_file(file_name) and file_name not in options]
+        for base_path in get_delta_base_paths(remaining_deltas):
+            if options.get(os.path.basename(base_path)) == 'move':
+                options[os.path.basename(base_path)] = 'copy'
+    os.makedirs(folder_to, exist_ok=True)
+    same_device = os.stat(folder_from).st_dev == os.stat(folder_to).st_dev
+    start_time = time.perf_counter()
+
+    def transfer(file_name):
+        try:
+            return file_name, *_transfer_file(os.path.join(folder_from, file_name), os.path.join(folder_to, file_name),
+                                              options[file_name], same_device, preserve_mtime, skip_identical), None
+        except OSError as e:
+            return file_name, 'failed', 0, str(e)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(transfer, options))
+    seconds = time.perf_counter() - start_time
+    methods = {}
+    for _, method, _, _ in results:
+        methods[method] = methods.get(method, 0) + 1
+    summary = {
+        'transferred': len(results) - methods.get('skipped', 0) - methods.get('failed', 0),
+        'skipped': methods.get('skipped', 0),
+        'failed': methods.get('failed', 0),
+        'bytes': sum(size for _, _, size, _ in results),
+        'seconds': seconds,
+        'methods': methods,
+        'errors': {file_name: error for file_name, _, _, error in results if error is not None},
+    }
+    summary['throughput_mb_per_s'] = summary['bytes'] / 1e6 / seconds if seconds > 0 else 0.0
+    logger.info("- %s: %d files (%d bytes, %.1f MB/s), %d skipped, %d failed: [%s] -> [%s]", option, summary['transferred'], summary['bytes'],
+                summary['throughput_mb_per_s'], summary['skipped'], summary['failed'], folder_from, folder_to)
+    return summary
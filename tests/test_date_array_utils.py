@@ -0,0 +1,92 @@
+"""
+Property tests of the vectorized month arithmetic against the scalar date helpers it replaces.
+
+Dates and offsets are drawn at random (seeded), and the month ends, Feb 29 and negative offsets are always included.
+"""
+from datetime import datetime
+import numpy as np
+import pytest
+from dateutil.relativedelta import relativedelta
+from shining_pebbles.date_utils.date_array_utils import shift_month_array, get_date_n_month_ago_array, calculate_prior_date_array, format_date_array, to_datetime64_array
+from shining_pebbles.date_utils.date_general_utils import get_date_n_month_ago, calculate_prior_date_extended
+
+SEEDS = range(5)
+
+EDGE_DATES = [
+    '2024-02-29', '2020-02-29', '2000-02-29', '2023-02-28', '2024-02-28', '2024-01-31', '2024-03-31',
+    '2024-04-30', '2023-12-31', '2024-12-31', '2024-05-30', '2024-01-29', '2024-01-30', '1999-12-31',
+]
+
+EDGE_OFFSETS = [0, 1, -1, 2, -2, 11, -11, 12, -12, 13, -13, 48, -48]
+
+
+def draw_dates(seed, size=300):
+    rng = np.random.default_rng(seed)
+    dates = np.datetime64('1990-01-01') + rng.integers(0, 365 * 50, size).astype('timedelta64[D]')
+    month_ends = (dates.astype('datetime64[M]') + 1).astype('datetime64[D]') - np.timedelta64(1, 'D')
+    return np.concatenate([dates, month_ends, np.array(EDGE_DATES, dtype='datetime64[D]')])
+
+
+def draw_offsets(seed, size, low=-60, high=61):
+    rng = np.random.default_rng(seed + 1000)
+    return rng.integers(low, high, size)
+
+
+def to_strings(dates):
+    return format_date_array(dates, '%Y-%m-%d').tolist()
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_shift_month_array_matches_relativedelta(seed):
+    dates = draw_dates(seed)
+    offsets = draw_offsets(seed, len(dates))
+    expected = [(datetime.strptime(date, '%Y-%m-%d') + relativedelta(months=int(n))).strftime('%Y-%m-%d') for date, n in zip(to_strings(dates), offsets)]
+    assert to_strings(shift_month_array(dates, offsets)) == expected
+
+
+@pytest.mark.parametrize('n', EDGE_OFFSETS)
+def test_shift_month_array_with_scalar_offset(n):
+    dates = draw_dates(0, size=50)
+    expected = [(datetime.strptime(date, '%Y-%m-%d') + relativedelta(months=n)).strftime('%Y-%m-%d') for date in to_strings(dates)]
+    assert to_strings(shift_month_array(dates, n)) == expected
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_get_date_n_month_ago_array_matches_scalar(seed):
+    dates = draw_dates(seed)
+    offsets = draw_offsets(seed, len(dates))
+    expected = [get_date_n_month_ago(date, int(n)) for date, n in zip(to_strings(dates), offsets)]
+    assert get_date_n_month_ago_array(dates, offsets, form='%Y-%m-%d').tolist() == expected
+
+
+@pytest.mark.parametrize('n', EDGE_OFFSETS)
+def test_get_date_n_month_ago_array_keeps_month_ends(n):
+    dates = np.array(EDGE_DATES, dtype='datetime64[D]')
+    expected = [get_date_n_month_ago(date, n) for date in EDGE_DATES]
+    assert get_date_n_month_ago_array(dates, n, form='%Y-%m-%d').tolist() == expected
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_calculate_prior_date_array_matches_scalar(seed):
+    dates = draw_dates(seed)
+    days = draw_offsets(seed + 1, len(dates), -400, 401)
+    months = draw_offsets(seed + 2, len(dates), -30, 31)
+    years = draw_offsets(seed + 3, len(dates), -5, 6)
+    expected = [calculate_prior_date_extended(date, days=int(d), months=int(m), years=int(y)) for date, d, m, y in zip(to_strings(dates), days, months, years)]
+    assert calculate_prior_date_array(dates, days=days, months=months, years=years, form='%Y-%m-%d').tolist() == expected
+
+
+def test_calculate_prior_date_array_accepts_strings():
+    expected = [calculate_prior_date_extended(date, days=1, months=1, years=1) for date in EDGE_DATES]
+    assert calculate_prior_date_array(EDGE_DATES, days=1, months=1, years=1, form='%Y-%m-%d').tolist() == expected
+
+
+def test_to_datetime64_array_parses_compact_strings():
+    dates = np.array(['20240229', '19991231', '20240101'])
+    assert to_strings(to_datetime64_array(dates)) == ['2024-02-29', '1999-12-31', '2024-01-01']
+
+
+@pytest.mark.parametrize('date', ['20240231', '20230229', '20241301', '20240001', '20240100', '2024011'])
+def test_to_datetime64_array_rejects_invalid_compact_strings(date):
+    with pytest.raises(ValueError):
+        to_datetime64_array(np.array(['20240102', date]))
@@ -0,0 +1,106 @@
+"""
+Tests of the S3 storage backend against moto's in-process S3 stand-in.
+"""
+import os
+import pytest
+
+boto3 = pytest.importorskip('boto3')
+moto = pytest.importorskip('moto')
+
+import pandas as pd
+from shining_pebbles.pseudo_database import storage_utils, save_version_utils, bundle_utils
+from shining_pebbles.pseudo_database.storage_utils import S3Backend, ReadThroughCache
+from shining_pebbles.pseudo_database.lock_utils import write_csv_atomically
+from shining_pebbles.pseudo_database.save_version_utils import get_save_version_index
+from shining_pebbles.pseudo_database.delta_utils import read_dataset_csv
+from shining_pebbles.pseudo_database.snapshot_utils import stack_snapshots
+from shining_pebbles.pseudo_database.fund_panel_utils import consolidate_menu2160_panel, load_fund_panel
+
+BUCKET = 'shining-pebbles-test'
+
+FOLDER = f's3://{BUCKET}/dataset-test'
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    with moto.mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket=BUCKET)
+        s3_backend = S3Backend(cache=ReadThroughCache(str(tmp_path / 'cache'), max_bytes=10 ** 6), listing_ttl=3600, client=client)
+        monkeypatch.setitem(storage_utils._STORAGE_BACKENDS, 's3', s3_backend)
+        monkeypatch.setattr(save_version_utils, '_SAVE_VERSION_INDEXES', {})
+        monkeypatch.setattr(bundle_utils, '_BUNDLE_MEMBER_INDEXES', {})
+        yield s3_backend
+
+
+def test_write_list_stat_and_read(backend):
+    df = pd.DataFrame({'value': [1, 2, 3]})
+    file_path = f'{FOLDER}/dataset-foo-at20240102-save2024010218.csv'
+    write_csv_atomically(df, file_path)
+    assert backend.list_names(FOLDER) == ['dataset-foo-at20240102-save2024010218.csv']
+    assert backend.exists(file_path)
+    assert backend.stat(file_path)['size'] == len(df.to_csv().encode('utf-8'))
+    assert backend.read_bytes(file_path) == df.to_csv().encode('utf-8')
+    pd.testing.assert_frame_equal(read_dataset_csv(file_path), df)
+    backend.remove(file_path)
+    assert backend.list_names(FOLDER) == []
+    with pytest.raises(FileNotFoundError):
+        backend.stat(file_path)
+
+
+def test_read_through_cache_reuses_unchanged_objects(backend):
+    file_path = f'{FOLDER}/dataset-foo-at20240102-save2024010218.csv'
+    write_csv_atomically(pd.DataFrame({'value': [1]}), file_path)
+    local_path = backend.get_local_path(file_path)
+    assert local_path.startswith(backend.cache.cache_folder)
+    assert backend.get_local_path(file_path) == local_path
+    write_csv_atomically(pd.DataFrame({'value': [1, 2]}), file_path)
+    changed_path = backend.get_local_path(file_path)
+    assert changed_path != local_path
+    assert pd.read_csv(changed_path, index_col=0)['value'].tolist() == [1, 2]
+
+
+def test_read_through_cache_evicts_least_recently_used(backend):
+    local_paths = []
+    for n in range(3):
+        file_path = f'{FOLDER}/dataset-foo-at2024010{n + 1}-save2024010{n + 1}18.csv'
+        write_csv_atomically(pd.DataFrame({'value': [n]}), file_path)
+        backend.cache.max_bytes = 2 * backend.stat(file_path)['size']
+        local_paths.append(backend.get_local_path(file_path))
+    assert sorted(os.listdir(backend.cache.cache_folder)) == sorted(os.path.basename(local_path) for local_path in local_paths[1:])
+
+
+def test_writes_refresh_the_listing_and_the_save_version_index(backend):
+    write_csv_atomically(pd.DataFrame({'value': [1]}), f'{FOLDER}/dataset-foo-at20240102-save2024010218.csv')
+    assert get_save_version_index(FOLDER).resolve('dataset-foo-at20240102') == 'dataset-foo-at20240102-save2024010218.csv'
+    write_csv_atomically(pd.DataFrame({'value': [2]}), f'{FOLDER}/dataset-foo-at20240102-save2024010219.csv')
+    assert get_save_version_index(FOLDER).resolve('dataset-foo-at20240102') == 'dataset-foo-at20240102-save2024010219.csv'
+
+
+def test_listing_is_cached_within_ttl(backend):
+    write_csv_atomically(pd.DataFrame({'value': [1]}), f'{FOLDER}/dataset-foo-at20240102-save2024010218.csv')
+    version = backend.get_folder_version(FOLDER)
+    backend.client.put_object(Bucket=BUCKET, Key='dataset-test/written-elsewhere.csv', Body=b'a\n')
+    assert backend.get_folder_version(FOLDER) == version
+    backend.invalidate_listing(FOLDER)
+    assert 'written-elsewhere.csv' in backend.list_names(FOLDER)
+
+
+def test_stacked_snapshots_are_cached_on_s3(backend):
+    for date in ['20240102', '20240103']:
+        write_csv_atomically(pd.DataFrame({'value': [int(date)]}), f'{FOLDER}/dataset-foo-at{date}-save{date}18.csv')
+    stacked = stack_snapshots(FOLDER, 'foo')
+    assert 'stack-foo-manifest.json' in backend.list_names(FOLDER)
+    pd.testing.assert_frame_equal(stack_snapshots(FOLDER, 'foo'), stacked)
+    assert stacked['value'].tolist() == [20240102, 20240103]
+
+
+def test_fund_panel_is_consolidated_and_loaded_on_s3(backend):
+    df = pd.DataFrame({'일자': ['2024-01-02', '2024-01-03'], '수정\n기준가': ['1,000.00', '1,010.00'], '순자산총액': ['100', '110']})
+    write_csv_atomically(df, f'{FOLDER}/menu2160-code100001-to20240103-save20240103.csv', index=False)
+    assert consolidate_menu2160_panel(FOLDER)['rebuilt'] == ['100001']
+    assert consolidate_menu2160_panel(FOLDER)['kept'] == ['100001']
+    assert load_fund_panel(FOLDER)['price'].tolist() == [1000.0, 1010.0]